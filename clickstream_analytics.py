@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Columnar analytics over voidchain clickstreams
+
+Blocks (``block``/``event``/``os``/``timestamp``, as in
+orbital_clickstream.json) are loaded into columns instead of being kept
+as dicts: typed ``array`` columns for the chain, block number, event and
+OS, with timestamps as int64 epoch milliseconds and the string columns
+dictionary-encoded (each distinct string stored once, rows hold codes).
+
+Aggregates then run over whole columns with C-level iteration (``map``,
+``zip``, ``Counter``) and per-distinct-value work, never a Python loop
+over record dicts:
+
+    os_counts()        visitors per OS (the OS is logged on block 1)
+    events_per_hour()  events per UTC hour
+    funnel()           visitors reaching "visitor arrived" ->
+                       "initiate void entry" -> "requested: ..."
+
+Usage:
+    python3 clickstream_analytics.py orbital_clickstream.json spool/
+    python3 clickstream_analytics.py --log chainlog
+"""
+
+import argparse
+import json
+import operator
+import sys
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from itertools import compress, repeat
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from voidchain_store import chain_id_from_path, find_chain_files, iter_records, read_chain
+
+FUNNEL_STAGES = ('visitor arrived', 'initiate void entry', 'requested:')
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MILLISECOND = timedelta(milliseconds=1)
+_HOUR_MS = 3_600_000
+
+# Rows with no timestamp (or OS) hold these
+MISSING_TIMESTAMP = -(2 ** 63)
+MISSING = 0
+
+# Largest value an array('I') column is guaranteed to hold
+_MAX_CODE = 2 ** 32 - 1
+
+
+class MalformedValue(ValueError):
+    """A block field that cannot be parsed or stored in its column"""
+
+    def __init__(self, field: str, value):
+        super().__init__(f'invalid {field} {value!r}')
+
+
+def parse_timestamp(value: str) -> int:
+    """ISO-8601 timestamp (``2025-06-15T23:15:01.391Z``) -> epoch milliseconds"""
+    if not isinstance(value, str):
+        raise MalformedValue('timestamp', value)
+    try:
+        parsed = datetime.fromisoformat(value[:-1] + '+00:00' if value.endswith('Z') else value)
+    except ValueError:
+        raise MalformedValue('timestamp', value) from None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (parsed - _EPOCH) // _MILLISECOND
+
+
+def format_timestamp(epoch_ms: int) -> str:
+    moment = _EPOCH + timedelta(milliseconds=epoch_ms)
+    return moment.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def funnel_stage(event: str) -> int:
+    """1-based funnel stage of an event, 0 when it is not a funnel step
+
+    A stage ending in ``:`` matches any event with that prefix.
+    """
+    for stage, name in enumerate(FUNNEL_STAGES, 1):
+        if event == name or (name.endswith(':') and event.startswith(name)):
+            return stage
+    return 0
+
+
+class Dictionary:
+    """Dictionary encoding for one string column; code 0 means missing"""
+
+    def __init__(self):
+        self.values: List[Optional[str]] = [None]
+        self._codes: Dict[str, int] = {}
+
+    def encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return MISSING
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class ClickstreamColumns:
+    """Column store of clickstream blocks"""
+
+    def __init__(self):
+        self.chains = Dictionary()
+        self.events = Dictionary()
+        self.oses = Dictionary()
+        self.chain = array('I')
+        self.block = array('I')
+        self.event = array('I')
+        self.os = array('I')
+        self.timestamp = array('q')
+
+    def __len__(self) -> int:
+        return len(self.chain)
+
+    def append(self, chain_id: str, block: Dict[str, Any]) -> None:
+        """Add one block; raises MalformedValue (and adds nothing) for a malformed one
+
+        The chain id must be a string; ``block`` an int that fits the
+        column, ``event`` and ``os`` strings and ``timestamp`` an ISO-8601
+        string, each of them optional.
+        """
+        if not isinstance(chain_id, str):
+            raise MalformedValue('chain', chain_id)
+        number = block.get('block')
+        if number is None:
+            number = 0
+        elif isinstance(number, bool) or not isinstance(number, int) or not 0 <= number <= _MAX_CODE:
+            raise MalformedValue('block', number)
+        event = block.get('event')
+        if event is not None and not isinstance(event, str):
+            raise MalformedValue('event', event)
+        os_name = block.get('os')
+        if os_name is not None and not isinstance(os_name, str):
+            raise MalformedValue('os', os_name)
+        timestamp = block.get('timestamp')
+        timestamp = MISSING_TIMESTAMP if timestamp is None else parse_timestamp(timestamp)
+
+        # Every field checked: no column is touched until the block is known good
+        self.chain.append(self.chains.encode(chain_id))
+        self.block.append(number)
+        self.event.append(self.events.encode(event))
+        self.os.append(self.oses.encode(os_name))
+        self.timestamp.append(timestamp)
+
+    def extend_chain(self, chain_id: str, blocks: Iterable[Dict[str, Any]]) -> None:
+        for block in blocks:
+            self.append(chain_id, block)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> 'ClickstreamColumns':
+        """Columns from records tagged with ``chain``, as in a segment log"""
+        columns = cls()
+        for record in records:
+            columns.append(record.get('chain'), record)
+        return columns
+
+    @classmethod
+    def from_chain_files(cls, paths: Iterable[Union[str, Path]]) -> 'ClickstreamColumns':
+        columns = cls()
+        for path in paths:
+            columns.extend_chain(chain_id_from_path(path), read_chain(Path(path)))
+        return columns
+
+    @classmethod
+    def from_segment_log(cls, directory: Union[str, Path]) -> 'ClickstreamColumns':
+        return cls.from_records(iter_records(directory))
+
+    # Aggregates
+
+    def os_counts(self) -> Dict[str, int]:
+        """Visitors per OS, counting each chain's reported OS once"""
+        pairs = set(zip(self.chain, self.os, strict=True))
+        counts = Counter(os_code for _, os_code in pairs if os_code != MISSING)
+        return {self.oses.values[code]: n for code, n in counts.most_common()}
+
+    def events_per_hour(self) -> Dict[str, int]:
+        """Events per UTC hour, keyed by the hour's ISO start time"""
+        timestamps = self.timestamp
+        present = map(operator.ne, timestamps, repeat(MISSING_TIMESTAMP))
+        hours = Counter(map(operator.floordiv, compress(timestamps, present), repeat(_HOUR_MS)))
+        return {format_timestamp(hour * _HOUR_MS): hours[hour] for hour in sorted(hours)}
+
+    def event_counts(self) -> Dict[str, int]:
+        counts = Counter(self.event)
+        counts.pop(MISSING, None)
+        return {self.events.values[code]: n for code, n in counts.most_common()}
+
+    def funnel(self) -> List[Tuple[str, int]]:
+        """Visitors reaching each funnel stage having reached all earlier ones"""
+        # Stage per distinct event, then per row through the code column
+        stage_of = array('B', [0] + [funnel_stage(e) for e in self.events.values[1:]])
+        stages = map(stage_of.__getitem__, self.event)
+        reached: Dict[int, set] = {stage: set() for stage in range(1, len(FUNNEL_STAGES) + 1)}
+        for chain_code, stage in set(zip(self.chain, stages, strict=True)):
+            if stage:
+                reached[stage].add(chain_code)
+
+        report = []
+        visitors = None
+        for stage, name in enumerate(FUNNEL_STAGES, 1):
+            visitors = reached[stage] if visitors is None else visitors & reached[stage]
+            report.append((name, len(visitors)))
+        return report
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'visitors': len(self.chains) - 1,
+            'events': len(self),
+            'os_counts': self.os_counts(),
+            'events_per_hour': self.events_per_hour(),
+            'funnel': [{'stage': name, 'visitors': n} for name, n in self.funnel()],
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Aggregate voidchain clickstreams.')
+    parser.add_argument('paths', nargs='*', help='chain files, globs or directories')
+    parser.add_argument('--log', help='segment log directory written by voidchain_store.py')
+    args = parser.parse_args(argv)
+    if not args.paths and not args.log:
+        parser.error('give chain files or --log')
+
+    columns = ClickstreamColumns()
+    try:
+        if args.log:
+            for record in iter_records(args.log):
+                columns.append(record.get('chain'), record)
+        for path in find_chain_files(args.paths):
+            columns.extend_chain(chain_id_from_path(path), read_chain(path))
+    except (OSError, ValueError) as e:
+        print(f'error: {e}', file=sys.stderr)
+        return 1
+    json.dump(columns.summary(), sys.stdout, indent=2, ensure_ascii=False)
+    print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
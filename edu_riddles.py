@@ -0,0 +1,600 @@
+"""
+Parser for EDU-RIDDLES.md style riddle decks
+
+A deck is a markdown document where each riddle starts with a
+``## N) Category — "Name"`` header followed by the labelled fields
+Riddle / Answer / Learning goal / Where to use / Teacher note.
+
+The tokenizer is single-pass and streaming: it consumes any iterable of
+lines (a file object, a generator, a list) and yields riddle records as
+soon as the next header closes them, so memory stays flat regardless of
+deck size.
+
+``load_document`` adds two cache layers on top: an in-process cache keyed
+on path + mtime + size, so every caller in a process shares one parse, and
+an on-disk cache of the parsed riddle records keyed on the content hash, so
+repeated runs over an unchanged deck skip parsing entirely. The disk cache
+keeps only the ``CACHE_MAX_ENTRIES`` most recently used entries.
+
+``RiddleValidator.from_file(path, use_mmap=True)`` maps the file instead of
+reading it: the deck is scanned as bytes, only extracted fields are decoded,
+and lines are exposed as lazy views, so archives larger than RAM can be
+validated.
+"""
+
+import hashlib
+import io
+import json
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# One compiled dispatch pattern for every line that means something to the
+# parser: riddle headers, labelled fields and horizontal rules. Everything
+# else is plain text (riddle body lines when inside a ``Riddle:`` section).
+_TOKEN_RE = re.compile(
+    r'## (?P<number>\d+)\) (?P<title>.+)$'
+    r'|(?P<field>Riddle|Answer|Learning goal|Where to use|Teacher note):'
+    r'|(?P<rule>---)'
+)
+
+# Riddle headers alone, for splitting a document into per-riddle sections
+_HEADER_RE = re.compile(r'^## \d+\) .+$', re.MULTILINE)
+
+# The same pattern for scanning memory-mapped decks as bytes
+_TOKEN_RE_BYTES = re.compile(_TOKEN_RE.pattern.encode('ascii'))
+# Lines of ASCII whitespace and non-ASCII bytes only; such a line is blank
+# if its decoded text strips to nothing, as ``str.strip`` decides in text mode
+_MAYBE_BLANK_RE_BYTES = re.compile(rb'[\t-\r\x1c-\x20\x80-\xff]*$')
+_CR = ord('\r')
+
+# Field label -> record attribute for the single-line fields
+_FIELD_KEYS = {
+    'Answer': 'answer',
+    'Learning goal': 'learning_goal',
+    'Where to use': 'where_to_use',
+    'Teacher note': 'teacher_note',
+}
+
+RIDDLE_FIELDS = (
+    'number', 'title', 'line_number', 'riddle_text',
+    'answer', 'learning_goal', 'where_to_use', 'teacher_note',
+)
+
+
+class FrozenRiddleError(AttributeError):
+    """Raised on any attempt to change a ``Riddle``"""
+
+    def __init__(self, action: str, name: str):
+        super().__init__(f"Riddle is immutable; cannot {action} {name!r}")
+
+
+class Riddle:
+    """One parsed riddle
+
+    Records are slotted and immutable. ``riddle_text`` is not stored as
+    strings: the record keeps a reference to the source buffer plus flat
+    (start, end) offsets and slices the lines out on access. Subscripting
+    with a field name (``riddle['answer']``) works like the old dict
+    records did.
+    """
+
+    # In field order, not sorted
+    __slots__ = (  # noqa: RUF023
+        'number', 'title', 'line_number', 'answer', 'learning_goal',
+        'where_to_use', 'teacher_note', '_source', '_text_spans',
+    )
+
+    def __init__(self, number: int, title: str, line_number: int,
+                 answer: Optional[str] = None,
+                 learning_goal: Optional[str] = None,
+                 where_to_use: Optional[str] = None,
+                 teacher_note: Optional[str] = None,
+                 source: str = '', text_spans: Tuple[int, ...] = ()):
+        init = object.__setattr__
+        init(self, 'number', number)
+        init(self, 'title', title)
+        init(self, 'line_number', line_number)
+        init(self, 'answer', answer)
+        init(self, 'learning_goal', learning_goal)
+        init(self, 'where_to_use', where_to_use)
+        init(self, 'teacher_note', teacher_note)
+        init(self, '_source', source)
+        init(self, '_text_spans', tuple(text_spans))
+
+    @classmethod
+    def from_lines(cls, riddle_text: Iterable[str], **fields) -> 'Riddle':
+        """Build a record whose riddle text is backed by its own buffer"""
+        riddle_text = list(riddle_text)
+        spans = []
+        pos = 0
+        for line in riddle_text:
+            spans.extend((pos, pos + len(line)))
+            pos += len(line) + 1
+        return cls(source='\n'.join(riddle_text), text_spans=spans, **fields)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Riddle':
+        fields = {key: data.get(key) for key in RIDDLE_FIELDS}
+        return cls.from_lines(fields.pop('riddle_text') or [], **fields)
+
+    @property
+    def riddle_text(self) -> List[str]:
+        source = self._source
+        spans = self._text_spans
+        lines = [source[spans[i]:spans[i + 1]] for i in range(0, len(spans), 2)]
+        if isinstance(source, str):
+            return lines
+        # Records parsed from a mapped deck decode their text on access
+        return [line.decode('utf-8') for line in lines]
+
+    def __getitem__(self, key: str):
+        if key not in RIDDLE_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setattr__(self, name, value):
+        raise FrozenRiddleError('set', name)
+
+    def __delattr__(self, name):
+        raise FrozenRiddleError('delete', name)
+
+    def __reduce__(self):
+        return (Riddle, (
+            self.number, self.title, self.line_number, self.answer,
+            self.learning_goal, self.where_to_use, self.teacher_note,
+            self._source, self._text_spans,
+        ))
+
+    def _key(self) -> Tuple:
+        return tuple(
+            tuple(self.riddle_text) if key == 'riddle_text' else getattr(self, key)
+            for key in RIDDLE_FIELDS
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, Riddle):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f'Riddle(number={self.number!r}, title={self.title!r})'
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in RIDDLE_FIELDS}
+
+
+def _tokenize(lines: Iterable[str], source: Optional[str] = None) -> Iterator[Riddle]:
+    """Single-pass tokenizer behind every text riddle parse
+
+    When ``source`` is given, ``lines`` must be its newline-terminated
+    lines in order, and riddle text is recorded as offsets into it.
+    Otherwise each riddle gets a small buffer of its own text lines.
+    """
+    match_token = _TOKEN_RE.match
+    pending = None
+    text = []
+    in_riddle_text = False
+    pos = 0
+
+    for i, line in enumerate(lines, 1):
+        start = pos
+        pos += len(line)
+        if line.endswith('\n'):
+            line = line[:-1]
+        token = match_token(line)
+
+        if token is not None and token.lastgroup == 'title':
+            if pending is not None:
+                yield _close(pending, text, source)
+            pending = {
+                'number': int(token.group('number')),
+                'title': token.group('title'),
+                'line_number': i,
+            }
+            text = []
+            in_riddle_text = False
+            continue
+
+        if pending is None or not line.strip():
+            continue
+
+        if token is None:
+            if in_riddle_text:
+                if source is None:
+                    text.append(line)
+                else:
+                    text.extend((start, start + len(line)))
+        elif token.lastgroup == 'field':
+            label = token.group('field')
+            if label == 'Riddle':
+                in_riddle_text = True
+            else:
+                pending[_FIELD_KEYS[label]] = line[token.end():].strip()
+                in_riddle_text = False
+        # Horizontal rules are never part of the riddle text
+
+    if pending is not None:
+        yield _close(pending, text, source)
+
+
+def _close(pending: Dict[str, Any], text: List, source: Optional[str]) -> Riddle:
+    if source is None:
+        return Riddle.from_lines(text, **pending)
+    return Riddle(source=source, text_spans=text, **pending)
+
+
+def iter_riddles(lines: Iterable[str]) -> Iterator[Riddle]:
+    """Yield riddles one at a time from an iterable of lines
+
+    Lines may carry their trailing newline (as when iterating a file
+    object) or not (as with ``str.split``).
+    """
+    return _tokenize(lines)
+
+
+def _iter_line_spans(buf) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) of each line in a bytes-like buffer, sans newline
+
+    A ``\\r`` before the newline is left out too, as text mode's universal
+    newlines do, so CRLF decks parse the same either way.
+    """
+    find = buf.find
+    size = len(buf)
+    pos = 0
+    while pos < size:
+        end = find(b'\n', pos)
+        if end == -1:
+            next_pos = end = size
+        else:
+            next_pos = end + 1
+        if end > pos and buf[end - 1] == _CR:
+            end -= 1
+        yield pos, end
+        pos = next_pos
+    # Match str.split('\n'): content ending in a newline has a final empty line
+    if size == 0 or buf[size - 1:size] == b'\n':
+        yield size, size
+
+
+def _is_blank(buf, start: int, end: int) -> bool:
+    return (_MAYBE_BLANK_RE_BYTES.match(buf, start, end) is not None
+            and not buf[start:end].decode('utf-8').strip())
+
+
+def _tokenize_bytes(buf) -> Iterator[Riddle]:
+    """Tokenizer for bytes-like buffers, including mmap objects
+
+    Mirrors ``_tokenize`` but matches in place on the buffer. Only the
+    header title and single-line field values are decoded; riddle text is
+    recorded as byte offsets and decoded when a record's text is read.
+    """
+    match_token = _TOKEN_RE_BYTES.match
+    is_blank = _is_blank
+    pending = None
+    text = []
+    in_riddle_text = False
+
+    for i, (start, end) in enumerate(_iter_line_spans(buf), 1):
+        token = match_token(buf, start, end)
+
+        if token is not None and token.lastgroup == 'title':
+            if pending is not None:
+                yield Riddle(source=buf, text_spans=text, **pending)
+            pending = {
+                'number': int(token.group('number')),
+                'title': token.group('title').decode('utf-8'),
+                'line_number': i,
+            }
+            text = []
+            in_riddle_text = False
+            continue
+
+        if pending is None or is_blank(buf, start, end):
+            continue
+
+        if token is None:
+            if in_riddle_text:
+                text.extend((start, end))
+        elif token.lastgroup == 'field':
+            label = token.group('field').decode('ascii')
+            if label == 'Riddle':
+                in_riddle_text = True
+            else:
+                value = buf[token.end():end].decode('utf-8').strip()
+                pending[_FIELD_KEYS[label]] = value
+                in_riddle_text = False
+
+    if pending is not None:
+        yield Riddle(source=buf, text_spans=text, **pending)
+
+
+def iter_sections(content: str) -> Iterator[Tuple[int, int, int]]:
+    """Yield (start, end, line_number) for each riddle section of a document
+
+    A section runs from a ``## N)`` header up to the next header (or the
+    end of the document). Parsing a section on its own gives exactly the
+    riddle a full parse gives, since the tokenizer resets at every header.
+    """
+    headers = [match.start() for match in _HEADER_RE.finditer(content)]
+    line_number = 1
+    previous = 0
+    for i, start in enumerate(headers):
+        line_number += content.count('\n', previous, start)
+        previous = start
+        end = headers[i + 1] if i + 1 < len(headers) else len(content)
+        yield start, end, line_number
+
+
+def _iter_lines(source: Union[str, Iterable[str]]) -> Iterable[str]:
+    if isinstance(source, str):
+        return io.StringIO(source)
+    return source
+
+
+class RiddleValidator:
+    """Helper class to parse and validate riddle structure
+
+    ``content`` is normally the document text. It may also be a bytes-like
+    buffer of UTF-8 (``bytes`` or an ``mmap``), in which case the document
+    is scanned in place and decoded only where a value is extracted.
+    """
+
+    def __init__(self, content: Union[str, bytes, mmap.mmap]):
+        self.content = content
+        self._mapping = None
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], use_mmap: bool = False) -> 'RiddleValidator':
+        """Load a deck from disk, optionally memory-mapping it
+
+        A mapped validator should be closed (or used as a context manager)
+        once its riddles are no longer needed; riddle text from a closed
+        mapping can no longer be read.
+        """
+        if not use_mmap:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls(f.read())
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return cls(b'')
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        validator = cls(mapping)
+        validator._mapping = mapping
+        return validator
+
+    def close(self) -> None:
+        """Release the memory mapping, if any"""
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def lines(self) -> List[str]:
+        """Document lines, split on demand rather than held on the instance
+
+        This materializes every line; prefer ``iter_lines`` on large decks.
+        """
+        if isinstance(self.content, str):
+            return self.content.split('\n')
+        return list(self.iter_lines())
+
+    def iter_lines(self) -> Iterator[str]:
+        """Lazily yield decoded document lines without their newline"""
+        if isinstance(self.content, str):
+            for line in io.StringIO(self.content):
+                yield line[:-1] if line.endswith('\n') else line
+            if not self.content or self.content.endswith('\n'):
+                yield ''
+            return
+        buf = self.content
+        for start, end in _iter_line_spans(buf):
+            yield buf[start:end].decode('utf-8')
+
+    def iter_line_views(self) -> Iterator[memoryview]:
+        """Yield zero-copy views of each line of a bytes-backed document
+
+        Views must be released before the validator is closed.
+        """
+        if isinstance(self.content, str):
+            raise TypeError('line views need a bytes-backed document')  # noqa: TRY003
+        view = memoryview(self.content)
+        try:
+            for start, end in _iter_line_spans(self.content):
+                yield view[start:end]
+        finally:
+            view.release()
+
+    def iter_riddles(self) -> Iterator[Riddle]:
+        """Stream riddles from the document without materializing all lines
+
+        Riddle text is kept as offsets into ``self.content``.
+        """
+        if isinstance(self.content, str):
+            return _tokenize(_iter_lines(self.content), self.content)
+        return _tokenize_bytes(self.content)
+
+    def get_riddles(self) -> List[Riddle]:
+        """Extract all riddles from the document"""
+        return list(self.iter_riddles())
+
+    def get_main_sections(self) -> List[str]:
+        """Extract main document sections (# headers)"""
+        if isinstance(self.content, str):
+            return [
+                line[2:].strip() for line in _iter_lines(self.content)
+                if line.startswith('# ')
+            ]
+        buf = self.content
+        return [
+            buf[start + 2:end].decode('utf-8').strip()
+            for start, end in _iter_line_spans(buf)
+            if buf[start:start + 2] == b'# '
+        ]
+
+
+# Bump when the shape of the parsed records changes so stale on-disk
+# entries are ignored instead of misread.
+CACHE_FORMAT_VERSION = 2
+
+# Entries kept on disk. Every edit of a deck adds one, so writing an entry
+# removes the least recently used beyond this, and any of another version.
+CACHE_MAX_ENTRIES = 16
+
+# Resolved path -> ((mtime_ns, size), document)
+_documents: Dict[str, Tuple[Tuple[int, int], 'RiddleDocument']] = {}
+
+
+class RiddleDocument:
+    """A loaded deck: its content, validator and parsed riddles"""
+
+    def __init__(self, path: Path, content: str, riddles: List[Riddle]):
+        self.path = path
+        self.content = content
+        self.validator = RiddleValidator(content)
+        self.riddles = riddles
+
+    @property
+    def lines(self) -> List[str]:
+        return self.content.split('\n')
+
+
+def default_cache_dir() -> Optional[Path]:
+    """Directory for the on-disk riddle cache, or None when disabled
+
+    ``EDU_RIDDLES_CACHE_DIR`` overrides the location; setting it to an
+    empty string turns the disk cache off.
+    """
+    override = os.environ.get('EDU_RIDDLES_CACHE_DIR')
+    if override is not None:
+        return Path(override) if override else None
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'edu_riddles'
+
+
+def _cache_entry(cache_dir: Path, content: str) -> Path:
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+    return cache_dir / f'v{CACHE_FORMAT_VERSION}-{digest}.json'
+
+
+# On-disk records are positional lists, with riddle text stored as the
+# same offsets into the content that the in-memory records use.
+_CACHED_FIELDS = (
+    'number', 'title', 'line_number', 'answer',
+    'learning_goal', 'where_to_use', 'teacher_note',
+)
+
+
+def _read_cached_riddles(entry: Path, content: str) -> Optional[List[Riddle]]:
+    try:
+        with open(entry, 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+        riddles = [
+            Riddle(*row[:-1], source=content, text_spans=row[-1])
+            for row in rows
+        ]
+    except (OSError, ValueError, TypeError):
+        return None
+    try:
+        # A hit makes the entry the most recently used one
+        os.utime(entry)
+    except OSError:
+        pass
+    return riddles
+
+
+def _write_cached_riddles(entry: Path, riddles: List[Riddle]) -> None:
+    rows = [
+        [getattr(riddle, key) for key in _CACHED_FIELDS] + [riddle._text_spans]
+        for riddle in riddles
+    ]
+    tmp = entry.with_name(f'{entry.name}.{os.getpid()}.tmp')
+    try:
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False)
+        os.replace(tmp, entry)
+    except OSError:
+        # The cache is an optimization; a read-only or full disk is not an error
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return
+    _prune_cache(entry)
+
+
+def _prune_cache(keep: Path) -> None:
+    """Remove entries of other versions and all but the newest few of this one"""
+    prefix = f'v{CACHE_FORMAT_VERSION}-'
+    entries = []
+    for entry in keep.parent.glob('v*-*.json'):
+        if entry == keep:
+            continue
+        try:
+            if entry.name.startswith(prefix):
+                entries.append((entry.stat().st_mtime_ns, entry))
+            else:
+                entry.unlink()
+        except OSError:
+            pass
+    entries.sort(reverse=True)
+    for _, entry in entries[CACHE_MAX_ENTRIES - 1:]:
+        try:
+            entry.unlink()
+        except OSError:
+            pass
+
+
+def parse_cached(content: str, cache_dir: Optional[Path] = None) -> List[Riddle]:
+    """Parse riddles from content, reusing the on-disk cache when possible"""
+    if cache_dir is None:
+        return RiddleValidator(content).get_riddles()
+    entry = _cache_entry(cache_dir, content)
+    riddles = _read_cached_riddles(entry, content)
+    if riddles is None:
+        riddles = RiddleValidator(content).get_riddles()
+        _write_cached_riddles(entry, riddles)
+    return riddles
+
+
+_DEFAULT = object()
+
+
+def load_document(path: Union[str, Path], cache_dir=_DEFAULT) -> RiddleDocument:
+    """Load and parse a deck once per process
+
+    The result is shared until the file's mtime or size changes. Pass
+    ``cache_dir=None`` to bypass the on-disk cache.
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _documents.get(str(path))
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    if cache_dir is _DEFAULT:
+        cache_dir = default_cache_dir()
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    document = RiddleDocument(path, content, parse_cached(content, cache_dir))
+    _documents[str(path)] = (key, document)
+    return document
+
+
+def clear_document_cache() -> None:
+    """Drop every in-process parsed document"""
+    _documents.clear()
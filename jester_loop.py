@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Buffered, rate-limited port of jesterLoop.js
+
+``startVoidDance`` in jesterLoop.js prints the jester's thoughts forever,
+one ``console.log`` (one write) per line, until a 1-in-10,000 chance throws
+"The jester has left the terminal." This port writes through a
+``BufferedEmitter`` instead:
+
+- Lines are collected and written in large batches (``buffer_chars`` of
+  text per write, or whatever is pending once ``flush_interval`` seconds
+  have passed since the last write) rather than one write per line.
+- An optional token bucket caps output at ``lines_per_second``. When it
+  runs dry the loop sleeps until the next token instead of spinning; the
+  line that found it dry is dropped and counted, or with ``block=True``
+  written after the sleep.
+
+When the jester leaves, the loop flushes, reports the counts and exits 0
+rather than dying on an uncaught error.
+
+Usage:
+    python3 jester_loop.py --rate 200 > jester.log
+    python3 jester_loop.py --rate 50 --block --seed 7
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+
+# jesterLoop.js
+JESTER_THOUGHTS = [
+    "Why does 0 == '0', but 0 !== '0'?",
+    "I declared a var and it declared me back.",
+    "Sometimes I console.log just to feel seen.",
+    "This loop has no purpose, and that's the point.",
+]
+
+EXIT_MESSAGE = "The jester has left the terminal."
+EXIT_CHANCE = 0.9999
+
+
+class BufferedEmitter:
+    """Batches lines into large writes, optionally rate limited
+
+    ``emit`` returns True when the line was accepted and False when the
+    rate limit dropped it. ``emitted``, ``dropped`` and ``writes`` count
+    what happened.
+    """
+
+    def __init__(self, stream: BinaryIO, buffer_chars: int = 64 * 1024,
+                 lines_per_second: Optional[float] = None, block: bool = False,
+                 flush_interval: float = 0.5,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        if lines_per_second is not None and lines_per_second <= 0:
+            raise ValueError('lines_per_second must be positive')  # noqa: TRY003
+        self.stream = stream
+        self.buffer_chars = buffer_chars
+        self.rate = lines_per_second
+        self.block = block
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self.sleep = sleep
+        self.emitted = 0
+        self.dropped = 0
+        self.writes = 0
+        self._pending: List[str] = []
+        self._pending_chars = 0
+        # Token bucket holding at most one second of lines
+        self._tokens = lines_per_second or 0.0
+        self._refilled = clock()
+        self._deadline = self._refilled + flush_interval
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self._tokens = min(self.rate, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+
+    def emit(self, line: str) -> bool:
+        if self.rate is not None:
+            # The bucket is only refilled once it runs dry
+            if self._tokens < 1:
+                self._refill()
+                if self._tokens < 1:
+                    self.flush()
+                    self.sleep((1 - self._tokens) / self.rate)
+                    self._refill()
+                    # Slept long enough for one line; don't lose it to rounding
+                    self._tokens = max(self._tokens, 1.0)
+                    if not self.block:
+                        self.dropped += 1
+                        return False
+            self._tokens -= 1
+        self._pending.append(line)
+        self._pending_chars += len(line) + 1
+        self.emitted += 1
+        if self._pending_chars >= self.buffer_chars or self.clock() >= self._deadline:
+            self.flush()
+        return True
+
+    def flush(self) -> None:
+        if self._pending:
+            self._pending.append('')
+            self.stream.write('\n'.join(self._pending).encode('utf-8'))
+            self.writes += 1
+            self._pending = []
+            self._pending_chars = 0
+        self.stream.flush()
+        self._deadline = self.clock() + self.flush_interval
+
+    def stats(self) -> Dict[str, int]:
+        return {'emitted': self.emitted, 'dropped': self.dropped, 'writes': self.writes}
+
+
+def start_void_dance(emitter: BufferedEmitter, rng: random.Random = random,
+                     max_thoughts: Optional[int] = None,
+                     thoughts: List[str] = JESTER_THOUGHTS) -> Dict[str, Any]:
+    """jesterLoop.js ``startVoidDance``: think until the jester leaves
+
+    Stops after ``max_thoughts`` if given. Returns the emitter's counts
+    plus ``thoughts`` (lines generated) and ``jester_left``.
+    """
+    emit = emitter.emit
+    chance = rng.random
+    count = len(thoughts)
+    i = 0
+    left = False
+    try:
+        while max_thoughts is None or i < max_thoughts:
+            emit(thoughts[i % count])
+            i += 1
+            if chance() > EXIT_CHANCE:
+                left = True
+                break
+    finally:
+        emitter.flush()
+    return dict(emitter.stats(), thoughts=i, jester_left=left)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Print the jester's thoughts until the jester leaves.")
+    parser.add_argument('--rate', type=float, help='maximum lines per second (default: unlimited)')
+    parser.add_argument('--block', action='store_true',
+                        help='sleep at the rate limit instead of dropping lines')
+    parser.add_argument('--buffer', type=int, default=64 * 1024,
+                        help='characters per write (default: 65536)')
+    parser.add_argument('--max-thoughts', type=int, help='stop after this many thoughts')
+    parser.add_argument('--seed', type=int, help='seed for the exit roll')
+    args = parser.parse_args(argv)
+
+    emitter = BufferedEmitter(sys.stdout.buffer, args.buffer, args.rate, args.block)
+    stats = None
+    try:
+        # The exit roll is a game of chance, not a secret
+        stats = start_void_dance(emitter, random.Random(args.seed), args.max_thoughts)  # noqa: S311
+    except KeyboardInterrupt:
+        pass
+    except BrokenPipeError:
+        # Reader went away (e.g. piped into head); nothing left to write to
+        sys.stdout = None
+    if stats is None:
+        stats = dict(emitter.stats(), jester_left=False)
+    elif stats['jester_left']:
+        print(EXIT_MESSAGE, file=sys.stderr)
+    print(json.dumps(stats), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Keyword router for oracle responses
+
+``respondToUser`` in voidchain-prototype.js lowercases the input and tries
+``includes`` checks one rule at a time, so its cost grows with the number
+of rules. ``KeywordRouter`` compiles every keyword into one Aho-Corasick
+automaton instead: a query walks the automaton once, character by
+character, so routing costs time proportional to the input, however many
+rules there are.
+
+Rules are checked in priority order, like the prototype's if/else chain:
+when several keywords occur in a query, the rule with the lowest priority
+number wins, ties going to the rule listed first. A rule's priority
+defaults to its position in the list. Matching is case-insensitive and
+keywords match anywhere, including inside longer words (as ``includes``
+does).
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# (keyword, response) or (keyword, response, priority)
+RuleSpec = Tuple
+
+_UNSEEN = object()
+
+
+class EmptyKeywordError(ValueError):
+    """A rule whose keyword is empty, which would match every query"""
+
+    def __init__(self, position: int):
+        super().__init__(f'rule {position} has an empty keyword')
+
+
+class KeywordRouter:
+    """Routes a query to the response of its best-priority matching keyword"""
+
+    def __init__(self, rules: Iterable[RuleSpec], default: Optional[str] = None):
+        self.default = default
+        self.responses: List[str] = []
+        # Per rule: (priority, position) so ties go to the rule listed first
+        self._ranks: List[Tuple[float, int]] = []
+        keywords = []
+        for position, rule in enumerate(rules):
+            keyword, response = rule[0], rule[1]
+            priority = rule[2] if len(rule) > 2 else position
+            if not keyword:
+                raise EmptyKeywordError(position)
+            keywords.append(keyword.lower())
+            self.responses.append(response)
+            self._ranks.append((priority, position))
+        self._build(keywords)
+
+    def _build(self, keywords: Sequence[str]) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        # Best rule ending exactly at each state, or -1
+        best: List[int] = [-1]
+        ranks = self._ranks
+
+        for rule, keyword in enumerate(keywords):
+            state = 0
+            for char in keyword:
+                following = goto[state].get(char)
+                if following is None:
+                    following = len(goto)
+                    goto[state][char] = following
+                    goto.append({})
+                    best.append(-1)
+                state = following
+            if best[state] == -1 or ranks[rule] < ranks[best[state]]:
+                best[state] = rule
+
+        # Breadth-first failure links; each state's best rule also covers
+        # every keyword that is a suffix of it (reachable through its links)
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for char, following in goto[state].items():
+                queue.append(following)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(char, 0)
+                fail[following] = target if target != following else 0
+                inherited = best[fail[following]]
+                if inherited != -1 and (best[following] == -1 or ranks[inherited] < ranks[best[following]]):
+                    best[following] = inherited
+
+        self._goto = goto
+        self._fail = fail
+        self._best = best
+        # A match this good cannot be beaten, so routing can stop early
+        self._top = min(range(len(ranks)), key=ranks.__getitem__) if ranks else -1
+
+    def __len__(self) -> int:
+        return len(self.responses)
+
+    def match(self, text: str) -> Optional[int]:
+        """Index of the winning rule for ``text``, or None"""
+        goto, fail, best, ranks = self._goto, self._fail, self._best, self._ranks
+        top = self._top
+        state = 0
+        winner = -1
+        for char in text.lower():
+            while True:
+                following = goto[state].get(char)
+                if following is not None:
+                    state = following
+                    break
+                if state == 0:
+                    break
+                state = fail[state]
+            found = best[state]
+            if found != -1 and (winner == -1 or ranks[found] < ranks[winner]):
+                winner = found
+                if winner == top:
+                    break
+        return None if winner == -1 else winner
+
+    def route(self, text: str) -> Optional[str]:
+        """Response for ``text``: its winning rule's, else the default"""
+        rule = self.match(text)
+        return self.default if rule is None else self.responses[rule]
+
+    def route_batch(self, texts: Iterable[str]) -> List[Optional[str]]:
+        """Route many queries; repeated queries are only walked once"""
+        seen: Dict[str, Optional[str]] = {}
+        results = []
+        for text in texts:
+            response = seen.get(text, _UNSEEN)
+            if response is _UNSEEN:
+                response = seen[text] = self.route(text)
+            results.append(response)
+        return results
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Asyncio oracle server for many concurrent void visitors
+
+jesterOracle.js and voidchain-prototype.js each serve one user through a
+blocking ``readline.question`` and exit. This server speaks the same
+dialogue to any number of users at once over a line-based TCP protocol:
+
+1. On connect the visitor gets the voidchain intro and the
+   "Trykk Enter..." prompt. Block 1 ("visitor arrived") is logged.
+2. Their first line logs "initiate void entry". A first line of
+   ``os=<platform>`` (linux, win32, darwin...) also records their OS,
+   which the prototype read from ``os.platform()``.
+3. Every further line is a question. It is logged as
+   "requested: <question>" and answered with the voidchain response
+   (the "lys" / "kaffe" routing of ``respondToUser``) plus a line from
+   the jester's ``responses`` table. Then the question prompt repeats.
+
+When a visitor disconnects their chain goes to a ``ChainWriter``, which
+appends finished chains to a voidchain_store segment log in batches: one
+write and one fsync per batch instead of one file per visitor.
+
+Usage:
+    python3 oracle_server.py --port 7777 --log-dir voidchain_log
+"""
+
+import argparse
+import asyncio
+import random
+import string
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from keyword_router import KeywordRouter
+from voidchain_store import SegmentLog
+
+# jesterOracle.js
+RESPONSES = [
+    "Hmm... sounds like a race condition in your soul.",
+    "Try rebooting your sense of identity.",
+    "That’s not a bug, it’s a metaphor.",  # noqa: RUF001 - as in jesterOracle.js
+    "404: Motivation not found.",
+    "Ah yes, classic user error... also known as life.",
+]
+
+ENTER_PROMPT = "Trykk Enter for å fortsette inn i tomrommet... "
+QUESTION_PROMPT = "Hva ønsker du i dag fra voiden? "
+LINE_TOO_LONG = "⚠️ Voiden hørte ikke slutten på det. Spør kortere."
+
+_OS_GREETINGS = {
+    'linux': "Du har nøkkelen til shell. Tomrommet åpner seg med respekt.",
+    'win32': "Windows-vandrer, speilet flimrer... voiden tilpasser seg.",
+    'darwin': "Elegant Mac-vesen... du glir inn som en skyggestrek.",
+}
+_UNKNOWN_OS_GREETING = "Ukjent operativsystem, voiden nøler men slipper deg inn."
+
+_ID_ALPHABET = string.ascii_lowercase + string.digits
+
+
+def generate_id(rng: random.Random = random) -> str:
+    """Eight base-36 characters, like the prototype's generateId()"""
+    return ''.join(rng.choices(_ID_ALPHABET, k=8))
+
+
+def timestamp() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+# voidchain-prototype.js ``respondToUser``, in its if/else order
+VOID_ROUTER = KeywordRouter([
+    ('lys', "✨ Voidens svar: Du ER lyset."),
+    ('kaffe', "☕ Voidens svar: Kaffen er allerede drukket. Av deg. Forrige gang."),
+], default="🌀 Voidens svar: Det du søkte, er allerede på vei mot deg.")
+
+
+def respond_to_user(text: str) -> str:
+    return VOID_ROUTER.route(text)
+
+
+def intro(os_name: str) -> List[str]:
+    return [
+        "🌀 VELKOMMEN TIL VOIDCHAIN 🌀",
+        f"Du er oppdaget som en {os_name}-bruker.",
+        _OS_GREETINGS.get(os_name, _UNKNOWN_OS_GREETING),
+    ]
+
+
+class ChainWriter:
+    """Batches finished chains into a segment log off the event loop
+
+    Chains are queued by ``submit`` and written when ``max_batch`` chains
+    are waiting or ``max_delay`` seconds after the first one arrived,
+    whichever comes first. Each batch is appended and fsynced in a worker
+    thread so sessions never wait on the disk.
+    """
+
+    def __init__(self, log_dir: Union[str, Path], max_batch: int = 1000,
+                 max_delay: float = 0.05):
+        self.log = SegmentLog(log_dir, fsync_every=10 ** 9)
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.chains_written = 0
+        self.batches_written = 0
+        self._pending: List[Tuple[str, List[Dict[str, Any]]]] = []
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def submit(self, chain_id: str, chain: List[Dict[str, Any]]) -> None:
+        self._pending.append((chain_id, chain))
+        self._wakeup.set()
+
+    def _write(self, batch) -> None:
+        for chain_id, chain in batch:
+            self.log.append_chain(chain_id, chain)
+        self.log.sync()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            if not self._closing and len(self._pending) < self.max_batch:
+                # Let more sessions finish into this batch
+                await asyncio.sleep(self.max_delay)
+            self._wakeup.clear()
+            batch, self._pending = self._pending, []
+            if batch:
+                await loop.run_in_executor(None, self._write, batch)
+                self.chains_written += len(batch)
+                self.batches_written += 1
+            if self._closing and not self._pending:
+                return
+
+    async def close(self) -> None:
+        self._closing = True
+        self._wakeup.set()
+        await self._task
+        self.log.close()
+
+
+class OracleServer:
+    """Serves the voidchain dialogue to concurrent TCP sessions"""
+
+    def __init__(self, log_dir: Union[str, Path], rng: Optional[random.Random] = None,
+                 max_batch: int = 1000, max_delay: float = 0.05):
+        self.log_dir = Path(log_dir)
+        # Picks oracle responses; nothing here needs crypto randomness
+        self.rng = rng or random.Random()  # noqa: S311
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.sessions = 0
+        self.active = 0
+        self.writer: Optional[ChainWriter] = None
+        self._server = None
+        self._handlers = set()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 7777) -> Tuple[str, int]:
+        """Start listening; returns the bound (host, port)"""
+        self.writer = ChainWriter(self.log_dir, self.max_batch, self.max_delay)
+        self._server = await asyncio.start_server(self.handle, host, port, backlog=4096)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self) -> None:
+        """Stop listening, end open sessions and write every chain"""
+        if self._server is not None:
+            self._server.close()
+        # Sessions still open are cut off (each closes its own connection);
+        # their chains are still logged. This has to happen before
+        # wait_closed(), which on Python 3.12+ waits for every connection.
+        handlers = list(self._handlers)
+        for task in handlers:
+            task.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+        if self.writer is not None:
+            await self.writer.close()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.sessions += 1
+        self.active += 1
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        chain_id = generate_id(self.rng)
+        chain = [{'block': 1, 'event': 'visitor arrived', 'os': 'unknown', 'timestamp': timestamp()}]
+
+        def log_block(event: str) -> None:
+            chain.append({'block': len(chain) + 1, 'event': event, 'timestamp': timestamp()})
+
+        def send(lines: List[str]) -> None:
+            writer.write(('\n'.join(lines) + '\n').encode('utf-8'))
+
+        async def read_line() -> Optional[bytes]:
+            """The next line, or None (after telling the visitor) when it is over the limit"""
+            try:
+                return await reader.readline()
+            except ValueError:
+                send([LINE_TOO_LONG])
+                return None
+
+        try:
+            send([*intro('unknown'), ENTER_PROMPT])
+            await writer.drain()
+            line = await read_line()
+            if line == b'':
+                return
+            first = (line or b'').decode('utf-8', 'replace').strip()
+            if first.startswith('os='):
+                chain[0]['os'] = first[3:] or 'unknown'
+                send([_OS_GREETINGS.get(chain[0]['os'], _UNKNOWN_OS_GREETING)])
+            log_block('initiate void entry')
+            send([QUESTION_PROMPT])
+            await writer.drain()
+
+            while True:
+                line = await read_line()
+                if line is None:
+                    send([QUESTION_PROMPT])
+                    await writer.drain()
+                    continue
+                if not line:
+                    break
+                answer = line.decode('utf-8', 'replace').rstrip('\r\n')
+                log_block(f'requested: {answer}')
+                send([
+                    "--- RESPONSE FRA VOIDEN ---",
+                    respond_to_user(answer),
+                    "🎭 Jester says: " + self.rng.choice(RESPONSES),
+                    QUESTION_PROMPT,
+                ])
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # close() cut the session off; finish cleaning up instead of
+            # letting the cancellation escape into the stream protocol.
+            # Abort so unsent output cannot hold the connection open.
+            writer.transport.abort()
+        finally:
+            self.active -= 1
+            self._handlers.discard(task)
+            self.writer.submit(chain_id, chain)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+async def serve(host: str, port: int, log_dir: str) -> None:
+    server = OracleServer(log_dir)
+    bound = await server.start(host, port)
+    print(f'oracle listening on {bound[0]}:{bound[1]}, chains -> {log_dir}', flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+        print(f'{server.sessions} sessions, {server.writer.chains_written} chains in '
+              f'{server.writer.batches_written} batches', file=sys.stderr)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Serve the void oracle to many users at once.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7777)
+    parser.add_argument('--log-dir', default='voidchain_log',
+                        help='segment log for session chains (default: voidchain_log)')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.log_dir))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,23 @@
+"""
+Command-line path patterns shared by the deck and chain tools
+
+validate_riddles.py, riddle_diagnostics.py, voidchain_store.py and
+voidchain_verify.py all take files and glob patterns on the command line
+and expand them the same way.
+"""
+
+import glob
+from typing import Iterable, List
+
+
+def expand_paths(patterns: Iterable[str]) -> List[str]:
+    """Expand globs (``**`` included), keeping order and dropping duplicates"""
+    seen = set()
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if path not in seen:
+                seen.add(path)
+                paths.append(path)
+    return paths
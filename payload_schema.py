@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Compiled schema validation for error_sorpe-style payloads
+
+error_sorpe.JSON shows the structured error payload the void emits:
+``status``, ``error`` (``code``, ``message``, ``mood``), ``entity``, a
+``remedy`` list and a ``fun_fact``. ``ERROR_PAYLOAD_SCHEMA`` describes
+that shape in a small JSON-Schema-like dialect, and ``compile_schema``
+turns a schema into the Python source of one specialized function (every
+type test and required key inlined, bounds and enums bound once as names
+in its namespace, no schema walked at validation time) and compiles it
+once.
+
+``validate_stream`` checks a JSON-lines stream of payloads and yields one
+finding per problem, with the line, a ``$.error.code``-style path and the
+rule that failed. ``validate_naive`` walks the schema per value instead;
+it gives the same findings and is kept as the reference the compiled
+validator is tested and benchmarked against.
+
+Schema keywords: ``type`` (object, array, string, integer, number,
+boolean, null), ``required``, ``properties``, ``additional_properties``
+(False forbids unknown keys), ``items``, ``min_items``, ``min_length``,
+``enum``, ``minimum`` and ``maximum``.
+
+Usage:
+    python3 payload_schema.py payloads.jsonl [more.jsonl ...]
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+ERROR_PAYLOAD_SCHEMA = {
+    'type': 'object',
+    'required': ['status', 'error', 'entity', 'remedy', 'fun_fact'],
+    'properties': {
+        'status': {'type': 'string', 'min_length': 1},
+        'error': {
+            'type': 'object',
+            'required': ['code', 'message', 'mood'],
+            'properties': {
+                'code': {'type': 'integer', 'minimum': 0},
+                'message': {'type': 'string', 'min_length': 1},
+                'mood': {'type': 'string', 'min_length': 1},
+            },
+        },
+        'entity': {'type': 'string', 'min_length': 1},
+        'remedy': {
+            'type': 'array',
+            'min_items': 1,
+            'items': {'type': 'string', 'min_length': 1},
+        },
+        'fun_fact': {'type': 'string'},
+    },
+}
+
+# (path, rule, message)
+Finding = Tuple[str, str, str]
+
+_TYPE_TESTS = {
+    'object': 'type({v}) is dict',
+    'array': 'type({v}) is list',
+    'string': 'type({v}) is str',
+    'integer': 'type({v}) is int',
+    'number': 'type({v}) in (int, float)',
+    'boolean': 'type({v}) is bool',
+    'null': '{v} is None',
+}
+
+_MISSING = object()
+
+
+class SchemaError(ValueError):
+    """A schema with a ``type`` this module does not know"""
+
+    def __init__(self, kind):
+        self.kind = kind
+        super().__init__(f'unknown schema type {kind!r}')
+
+
+class FunctionNameError(ValueError):
+    """A compiled function name that is not a Python identifier"""
+
+    def __init__(self, name):
+        self.name = name
+        super().__init__(f'invalid function name {name!r}')
+
+
+class _Emitter:
+    """Generates the body of a compiled check function"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.constants: Dict[str, Any] = {}
+        self._names = 0
+
+    def name(self, prefix: str) -> str:
+        self._names += 1
+        return f'{prefix}{self._names}'
+
+    def constant(self, value) -> str:
+        """Bind ``value`` to a new name in the function's namespace"""
+        name = self.name('c')
+        self.constants[name] = value
+        return name
+
+    def literal(self, value) -> str:
+        """Source for ``value``: strings inline, anything else by name"""
+        return repr(value) if type(value) is str else self.constant(value)
+
+    def line(self, depth: int, text: str) -> None:
+        self.lines.append('    ' * depth + text)
+
+    def error(self, depth: int, path: str, rule: str, message: str) -> None:
+        self.line(depth, f'append(({path}, {rule!r}, {message!r}))')
+
+    def emit(self, schema: Dict[str, Any], var: str, path: str, depth: int) -> None:
+        kind = schema.get('type')
+        if kind is not None:
+            if kind not in _TYPE_TESTS:
+                raise SchemaError(kind)
+            self.line(depth, f'if not ({_TYPE_TESTS[kind].format(v=var)}):')
+            self.error(depth + 1, path, 'type', f'expected {kind}')
+            start = len(self.lines)
+            self.line(depth, 'else:')
+            self.emit_constraints(schema, kind, var, path, depth + 1)
+            if len(self.lines) == start + 1:
+                self.lines.pop()
+        else:
+            self.emit_constraints(schema, kind, var, path, depth)
+
+    def emit_constraints(self, schema, kind, var, path, depth) -> None:
+        if kind == 'object':
+            for key in schema.get('required', ()):
+                self.line(depth, f'if {self.literal(key)} not in {var}:')
+                self.error(depth + 1, f'{path} + {self.literal("." + str(key))}', 'required',
+                           'missing required field')
+            properties = schema.get('properties', {})
+            if schema.get('additional_properties') is False:
+                key = self.name('k')
+                self.line(depth, f'for {key} in {var}:')
+                self.line(depth + 1, f'if {key} not in {self.constant(frozenset(properties))}:')
+                self.line(depth + 2, f"append(({path} + '.' + str({key}), 'additional', 'unexpected field'))")
+            for key, subschema in properties.items():
+                value = self.name('v')
+                self.line(depth, f'{value} = {var}.get({self.literal(key)}, _MISSING)')
+                self.line(depth, f'if {value} is not _MISSING:')
+                start = len(self.lines)
+                self.emit(subschema, value, f'{path} + {self.literal("." + str(key))}', depth + 1)
+                if len(self.lines) == start:
+                    self.line(depth + 1, 'pass')
+        elif kind == 'array':
+            if 'min_items' in schema:
+                self.line(depth, f'if len({var}) < {self.constant(schema["min_items"])}:')
+                self.error(depth + 1, path, 'min_items', f'expected at least {schema["min_items"]} items')
+            if 'items' in schema:
+                index, item = self.name('i'), self.name('item')
+                self.line(depth, f'for {index}, {item} in enumerate({var}):')
+                start = len(self.lines)
+                self.emit(schema['items'], item, f"{path} + '[' + str({index}) + ']'", depth + 1)
+                if len(self.lines) == start:
+                    self.line(depth + 1, 'pass')
+        elif kind == 'string':
+            if 'min_length' in schema:
+                self.line(depth, f'if len({var}) < {self.constant(schema["min_length"])}:')
+                self.error(depth + 1, path, 'min_length', f'expected at least {schema["min_length"]} characters')
+        elif kind in ('integer', 'number'):
+            if 'minimum' in schema:
+                self.line(depth, f'if {var} < {self.constant(schema["minimum"])}:')
+                self.error(depth + 1, path, 'minimum', f'expected at least {schema["minimum"]}')
+            if 'maximum' in schema:
+                self.line(depth, f'if {var} > {self.constant(schema["maximum"])}:')
+                self.error(depth + 1, path, 'maximum', f'expected at most {schema["maximum"]}')
+        if 'enum' in schema:
+            self.line(depth, f'if {var} not in {self.constant(tuple(schema["enum"]))}:')
+            self.error(depth + 1, path, 'enum', f'expected one of {list(schema["enum"])}')
+
+
+def compile_schema(schema: Dict[str, Any], name: str = 'check_payload') -> Callable[[Any], List[Finding]]:
+    """Compile ``schema`` into a function returning a payload's findings
+
+    The generated source is kept on the function as ``__source__``.
+    """
+    if not name.isidentifier():
+        raise FunctionNameError(name)
+    emitter = _Emitter()
+    emitter.emit(schema, 'value', "'$'", 1)
+    source = '\n'.join([
+        f'def {name}(value):',
+        '    errors = []',
+        '    append = errors.append',
+        *emitter.lines,
+        '    return errors',
+    ])
+    namespace = {'_MISSING': _MISSING, **emitter.constants}
+    # Schema values reach the source only as string literals or as names bound
+    # in the namespace, and the name is checked above, so a schema cannot
+    # inject code (and bounds such as float('inf') need no literal form)
+    exec(compile(source, f'<schema {name}>', 'exec'), namespace)  # noqa: S102
+    check = namespace[name]
+    check.__source__ = source
+    return check
+
+
+_TYPE_CHECKS = {
+    'object': lambda v: type(v) is dict,
+    'array': lambda v: type(v) is list,
+    'string': lambda v: type(v) is str,
+    'integer': lambda v: type(v) is int,
+    'number': lambda v: type(v) in (int, float),
+    'boolean': lambda v: type(v) is bool,
+    'null': lambda v: v is None,
+}
+
+
+def validate_naive(schema: Dict[str, Any], value, path: str = '$') -> List[Finding]:
+    """Reference validator: walk the schema for every value"""
+    errors = []
+    kind = schema.get('type')
+    if kind is not None and kind not in _TYPE_CHECKS:
+        raise SchemaError(kind)
+    if kind is not None and not _TYPE_CHECKS[kind](value):
+        return [(path, 'type', f'expected {kind}')]
+    if kind == 'object':
+        for key in schema.get('required', ()):
+            if key not in value:
+                errors.append((f'{path}.{key}', 'required', 'missing required field'))
+        properties = schema.get('properties', {})
+        if schema.get('additional_properties') is False:
+            for key in value:
+                if key not in properties:
+                    errors.append((f'{path}.{key}', 'additional', 'unexpected field'))
+        for key, subschema in properties.items():
+            if key in value:
+                errors.extend(validate_naive(subschema, value[key], f'{path}.{key}'))
+    elif kind == 'array':
+        if 'min_items' in schema and len(value) < schema['min_items']:
+            errors.append((path, 'min_items', f'expected at least {schema["min_items"]} items'))
+        if 'items' in schema:
+            for i, item in enumerate(value):
+                errors.extend(validate_naive(schema['items'], item, f'{path}[{i}]'))
+    elif kind == 'string':
+        if 'min_length' in schema and len(value) < schema['min_length']:
+            errors.append((path, 'min_length', f'expected at least {schema["min_length"]} characters'))
+    elif kind in ('integer', 'number'):
+        if 'minimum' in schema and value < schema['minimum']:
+            errors.append((path, 'minimum', f'expected at least {schema["minimum"]}'))
+        if 'maximum' in schema and value > schema['maximum']:
+            errors.append((path, 'maximum', f'expected at most {schema["maximum"]}'))
+    if 'enum' in schema and value not in tuple(schema['enum']):
+        errors.append((path, 'enum', f'expected one of {list(schema["enum"])}'))
+    return errors
+
+
+check_error_payload = compile_schema(ERROR_PAYLOAD_SCHEMA, 'check_error_payload')
+
+
+def validate_stream(lines: Iterable[str], check: Callable = check_error_payload,
+                    source: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Yield one finding per problem in a JSON-lines stream of payloads
+
+    Blank lines are skipped; a line that is not JSON is one ``json``
+    finding.
+    """
+    loads = json.loads
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            payload = loads(line)
+        except ValueError as e:
+            yield {'source': source, 'line': number, 'path': '$', 'check': 'json', 'message': str(e)}
+            continue
+        for path, rule, message in check(payload):
+            yield {'source': source, 'line': number, 'path': path, 'check': rule, 'message': message}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Validate JSON-lines error payloads.')
+    parser.add_argument('paths', nargs='+', help="JSON-lines files ('-' for stdin)")
+    args = parser.parse_args(argv)
+
+    findings = 0
+    for path in args.paths:
+        try:
+            stream = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')
+            try:
+                for finding in validate_stream(stream, source=path):
+                    findings += 1
+                    sys.stdout.write(json.dumps(finding, ensure_ascii=False) + '\n')
+            finally:
+                if stream is not sys.stdin:
+                    stream.close()
+        except (OSError, UnicodeDecodeError) as e:
+            print(f'{path}: {e}', file=sys.stderr)
+            return 1
+    print(f'{findings} problems found', file=sys.stderr)
+    return 1 if findings else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Phrase corpora from voidlang_sources/
+
+Each ``*.txt`` file in voidlang_sources/ (absurd_errors, fraggle_quotes,
+hatter_phrases, riddles, void_thoughts) holds one phrase per line.
+``PhraseCorpus`` finds the files up front but reads each one only when it
+is first needed. Loading strips and deduplicates the lines, interns every
+phrase (so a phrase shared by several files is one string in memory) and
+records the byte offset of each phrase's line in its file.
+
+``PhraseSampler`` draws phrases in O(1) per draw: uniformly over the
+pooled phrases, or weighted by per-file or per-phrase weights through an
+alias table. ``sample_batch(n)`` draws many at once for generators that
+need millions of lines without touching the files again.
+
+Usage:
+    corpus = PhraseCorpus()
+    corpus.phrases('hatter_phrases')
+    sampler = corpus.sampler(weights={'void_thoughts': 3, 'absurd_errors': 1}, seed=7)
+    sampler.sample_batch(1000)
+"""
+
+import random
+import sys
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+DEFAULT_SOURCES = Path(__file__).parent / 'voidlang_sources'
+
+
+class PhraseFile:
+    """The unique phrases of one corpus file, loaded on first access"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.name = path.stem
+        self._phrases: Optional[Tuple[str, ...]] = None
+        self._offsets: Optional[array] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._phrases is not None
+
+    def load(self) -> None:
+        phrases = {}
+        offsets = array('Q')
+        pos = 0
+        with open(self.path, 'rb') as f:
+            for raw in f:
+                phrase = raw.decode('utf-8').strip()
+                if phrase and phrase not in phrases:
+                    phrases[phrase] = None
+                    offsets.append(pos)
+                pos += len(raw)
+        self._phrases = tuple(sys.intern(phrase) for phrase in phrases)
+        self._offsets = offsets
+
+    @property
+    def phrases(self) -> Tuple[str, ...]:
+        """Unique phrases in file order"""
+        if self._phrases is None:
+            self.load()
+        return self._phrases
+
+    @property
+    def offsets(self) -> array:
+        """Byte offset in the file of each phrase's (first) line"""
+        if self._offsets is None:
+            self.load()
+        return self._offsets
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+
+class PhraseCorpus:
+    """Every phrase file in a directory, each loaded lazily"""
+
+    def __init__(self, directory: Union[str, Path] = DEFAULT_SOURCES, pattern: str = '*.txt'):
+        self.directory = Path(directory)
+        self.files: Dict[str, PhraseFile] = {
+            path.stem: PhraseFile(path) for path in sorted(self.directory.glob(pattern))
+        }
+
+    def names(self) -> List[str]:
+        return list(self.files)
+
+    def phrases(self, name: str) -> Tuple[str, ...]:
+        """Unique phrases of one file (``KeyError`` for an unknown name)"""
+        return self.files[name].phrases
+
+    def __len__(self) -> int:
+        return sum(len(f) for f in self.files.values())
+
+    def sampler(self, names: Optional[Iterable[str]] = None,
+                weights: Optional[Dict[str, float]] = None,
+                phrase_weight: Optional[Callable[[str], float]] = None,
+                seed=None) -> 'PhraseSampler':
+        """A sampler over some or all files
+
+        Phrases found in several files are pooled once, under the first
+        file. ``weights`` maps file name to the relative weight of each of
+        its phrases (files not named get 1); ``phrase_weight`` weights
+        phrases individually and multiplies with the file weight.
+        """
+        names = self.names() if names is None else list(names)
+        pool: Dict[str, float] = {}
+        for name in names:
+            file_weight = 1.0 if weights is None else weights.get(name, 1.0)
+            for phrase in self.files[name].phrases:
+                if phrase not in pool:
+                    pool[phrase] = file_weight
+        phrases = list(pool)
+        if weights is None and phrase_weight is None:
+            return PhraseSampler(phrases, seed=seed)
+        phrase_weights = [
+            pool[phrase] * (1.0 if phrase_weight is None else phrase_weight(phrase))
+            for phrase in phrases
+        ]
+        return PhraseSampler(phrases, phrase_weights, seed=seed)
+
+
+def _alias_table(weights: Sequence[float]) -> Tuple[List[float], List[int]]:
+    """Vose's alias method: (probability, alias) columns for O(1) draws"""
+    count = len(weights)
+    total = float(sum(weights))
+    if count == 0 or total <= 0 or any(w < 0 for w in weights):
+        raise ValueError('weights must be non-negative with a positive sum')  # noqa: TRY003
+    scaled = [w * count / total for w in weights]
+    probability = [1.0] * count
+    alias = list(range(count))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        probability[less] = scaled[less]
+        alias[less] = more
+        scaled[more] -= 1.0 - scaled[less]
+        (small if scaled[more] < 1.0 else large).append(more)
+    # Whatever is left is 1.0 up to rounding
+    return probability, alias
+
+
+class PhraseSampler:
+    """O(1) uniform or weighted draws from a fixed list of phrases"""
+
+    def __init__(self, phrases: Sequence[str], weights: Optional[Sequence[float]] = None,
+                 seed=None):
+        self.phrases = tuple(phrases)
+        # Seeded for reproducible draws, not for secrets
+        self.rng = random.Random(seed)  # noqa: S311
+        self._table = None
+        if weights is not None:
+            if len(weights) != len(self.phrases):
+                raise ValueError('one weight per phrase is required')  # noqa: TRY003
+            self._table = _alias_table(weights)
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    def sample(self) -> str:
+        if not self.phrases:
+            raise IndexError('cannot sample from an empty corpus')  # noqa: TRY003
+        draw = self.rng.random
+        index = int(draw() * len(self.phrases))
+        if self._table is not None:
+            probability, alias = self._table
+            if draw() >= probability[index]:
+                index = alias[index]
+        return self.phrases[index]
+
+    def sample_batch(self, count: int) -> List[str]:
+        """Draw ``count`` phrases (with replacement)"""
+        phrases = self.phrases
+        if not phrases:
+            raise IndexError('cannot sample from an empty corpus')  # noqa: TRY003
+        if self._table is None:
+            return self.rng.choices(phrases, k=count)
+        probability, alias = self._table
+        draw = self.rng.random
+        size = len(phrases)
+        result = []
+        append = result.append
+        for _ in range(count):
+            index = int(draw() * size)
+            append(phrases[index if draw() < probability[index] else alias[index]])
+        return result
@@ -0,0 +1,311 @@
+"""
+Reusable checks for riddle decks
+
+The same rules the EDU-RIDDLES.md test suite asserts, as plain functions
+that can run over any deck. Riddle checks take one ``Riddle`` and return a
+failure message, or None when the riddle passes. Deck checks take a
+``RiddleValidator`` plus its parsed riddles and return a list of failure
+messages.
+
+Checks that only make sense for EDU-RIDDLES.md itself (exactly ten
+riddles, its title and section names) stay in the test suite.
+"""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from edu_riddles import Riddle, RiddleValidator
+from riddle_lint import lint_failures
+
+# Vocabularies of the keyword checks (see KEYWORD_CHECKS)
+RELEVANT_TERMS = [
+    'void', 'wimp', 'interpreter', 'language',
+    'compiler', 'docs', 'manual', 'roff'
+]
+
+ACTIONABLE_VERBS = [
+    'introduce', 'teach', 'encourage', 'show', 'explain',
+    'help', 'demonstrate', 'guide', 'create', 'make',
+    'provide', 'give', 'frame', 'present'
+]
+
+GUIDANCE_INDICATORS = [
+    'provide', 'include', 'add', 'show', 'give',
+    'follow', 'link', 'append', 'keep', 'ensure'
+]
+
+LOCATION_PATTERNS = [
+    r'readme', r'issue', r'pr', r'contributing',
+    r'workshop', r'demo', r'tweet', r'discussion',
+    r'doc', r'header', r'template', r'slide'
+]
+
+RiddleCheck = Callable[[Riddle], Optional[str]]
+DeckCheck = Callable[[RiddleValidator, List[Riddle]], List[str]]
+
+# Check id -> check, in the order the test suite runs them
+RIDDLE_CHECKS: Dict[str, RiddleCheck] = {}
+DECK_CHECKS: Dict[str, DeckCheck] = {}
+
+
+def riddle_check(check_id: str):
+    """Register a per-riddle check under ``check_id``"""
+    def register(func: RiddleCheck) -> RiddleCheck:
+        RIDDLE_CHECKS[check_id] = func
+        return func
+    return register
+
+
+def deck_check(check_id: str):
+    """Register a whole-deck check under ``check_id``"""
+    def register(func: DeckCheck) -> DeckCheck:
+        DECK_CHECKS[check_id] = func
+        return func
+    return register
+
+
+# Completeness
+
+@riddle_check('title')
+def check_title(riddle: Riddle) -> Optional[str]:
+    if riddle.title is None:
+        return f"Riddle {riddle.number} should have a title"
+    if len(riddle.title) <= 5:
+        return f"Riddle {riddle.number} title should be descriptive"
+    return None
+
+
+@riddle_check('riddle-text')
+def check_riddle_text(riddle: Riddle) -> Optional[str]:
+    riddle_text = riddle.riddle_text
+    if not riddle_text:
+        return f"Riddle {riddle.number} should have riddle text"
+    if '"' not in '\n'.join(riddle_text):
+        return f"Riddle {riddle.number} text should be in quotes"
+    return None
+
+
+def _field_check(field: str, label: str, min_length: int, adjective: str) -> RiddleCheck:
+    def check(riddle: Riddle) -> Optional[str]:
+        value = riddle[field]
+        if value is None:
+            return f"Riddle {riddle.number} should have {label}"
+        if len(value) <= min_length:
+            return f"Riddle {riddle.number} {adjective}"
+        return None
+    check.__name__ = f'check_{field}'
+    return check
+
+
+riddle_check('answer')(_field_check(
+    'answer', 'an answer', 3, 'answer should be substantive'))
+riddle_check('learning-goal')(_field_check(
+    'learning_goal', 'a learning goal', 10, 'learning goal should be descriptive'))
+riddle_check('where-to-use')(_field_check(
+    'where_to_use', 'usage context', 5, 'usage context should be specific'))
+riddle_check('teacher-note')(_field_check(
+    'teacher_note', 'teacher notes', 10, 'teacher note should be helpful'))
+
+
+# Content quality
+
+@riddle_check('title-format')
+def check_title_format(riddle: Riddle) -> Optional[str]:
+    title = riddle.title or ''
+    # Em dash, en dash or a spaced hyphen
+    if not ('—' in title or '–' in title or ' - ' in title):  # noqa: RUF001
+        return f"Riddle {riddle.number} title should contain a separator"
+    if '"' not in title:
+        return f"Riddle {riddle.number} title should have a quoted name"
+    return None
+
+
+class KeywordMatcher:
+    """Find whether any of a vocabulary's terms occurs in a text
+
+    The terms are compiled once into a single alternation, so a text is
+    scanned once no matter how large the vocabulary is. Matching is
+    case-insensitive (the text is lowercased, as the checks always did)
+    and terms match anywhere, including inside longer words.
+    """
+
+    def __init__(self, terms: Iterable[str], regex: bool = False):
+        self.terms = list(terms)
+        alternatives = self.terms if regex else [re.escape(term) for term in self.terms]
+        self._search = re.compile('|'.join(f'(?:{a})' for a in alternatives)).search
+
+    def search(self, text: str) -> bool:
+        return self._search(text.lower()) is not None
+
+    def search_batch(self, texts: Iterable[str]) -> List[bool]:
+        """Classify many texts in one call
+
+        One compiled search per text. Scanning a separator-joined batch
+        instead was measured slower: when most texts match, mapping every
+        hit back to its text costs more than the calls it saves.
+        """
+        search = self._search
+        return [search(text.lower()) is not None for text in texts]
+
+
+def _project_text(riddle: Riddle) -> str:
+    return (
+        riddle.title + ' ' +
+        '\n'.join(riddle.riddle_text) + ' ' +
+        (riddle.answer or '') + ' ' +
+        (riddle.learning_goal or '')
+    )
+
+
+# Check id -> (matcher, text of the riddle it scans, failure message)
+KEYWORD_CHECKS: Dict[str, Tuple[KeywordMatcher, Callable[[Riddle], str], str]] = {
+    'project-reference': (
+        KeywordMatcher(RELEVANT_TERMS),
+        _project_text,
+        "should reference project concepts",
+    ),
+    'actionable-learning-goal': (
+        KeywordMatcher(ACTIONABLE_VERBS),
+        lambda riddle: riddle.learning_goal or '',
+        "learning goal should use actionable verbs",
+    ),
+    'teacher-guidance': (
+        KeywordMatcher(GUIDANCE_INDICATORS),
+        lambda riddle: riddle.teacher_note or '',
+        "teacher note should provide guidance",
+    ),
+    'concrete-location': (
+        KeywordMatcher(LOCATION_PATTERNS, regex=True),
+        lambda riddle: riddle.where_to_use or '',
+        "should specify concrete usage locations",
+    ),
+}
+
+
+def classify_riddles(riddles: Iterable[Riddle]) -> List[Dict[str, bool]]:
+    """Run every keyword check over a batch of riddles at once
+
+    Returns, per riddle, a dict mapping each keyword check id to whether
+    the riddle passes it.
+    """
+    riddles = list(riddles)
+    results = [{} for _ in riddles]
+    for check_id, (matcher, text_of, _) in KEYWORD_CHECKS.items():
+        hits = matcher.search_batch([text_of(riddle) for riddle in riddles])
+        for result, hit in zip(results, hits, strict=True):
+            result[check_id] = hit
+    return results
+
+
+def _keyword_check(check_id: str) -> RiddleCheck:
+    matcher, text_of, message = KEYWORD_CHECKS[check_id]
+
+    def check(riddle: Riddle) -> Optional[str]:
+        if not matcher.search(text_of(riddle)):
+            return f"Riddle {riddle.number} {message}"
+        return None
+    check.__name__ = 'check_' + check_id.replace('-', '_')
+    return check
+
+
+for _check_id in KEYWORD_CHECKS:
+    riddle_check(_check_id)(_keyword_check(_check_id))
+
+
+# Robustness
+
+@riddle_check('not-empty')
+def check_not_empty(riddle: Riddle) -> Optional[str]:
+    total_content = (
+        len(riddle.riddle_text) +
+        len(riddle.answer or '') +
+        len(riddle.learning_goal or '') +
+        len(riddle.where_to_use or '') +
+        len(riddle.teacher_note or '')
+    )
+    if total_content <= 50:
+        return f"Riddle {riddle.number} should have substantial content"
+    return None
+
+
+@riddle_check('riddle-length')
+def check_riddle_length(riddle: Riddle) -> Optional[str]:
+    char_count = len('\n'.join(riddle.riddle_text))
+    if char_count <= 20:
+        return f"Riddle {riddle.number} text seems too short"
+    if char_count >= 500:
+        return f"Riddle {riddle.number} text seems too long"
+    return None
+
+
+@riddle_check('self-contained')
+def check_self_contained(riddle: Riddle) -> Optional[str]:
+    answer = (riddle.answer or '').lower()
+    riddle_text = '\n'.join(riddle.riddle_text).lower()
+    answer_words = set(re.findall(r'\b[a-z]{4,}\b', answer))
+    riddle_words = set(re.findall(r'\b[a-z]{4,}\b', riddle_text))
+    if not (answer_words & riddle_words or len(answer) > 10):
+        return f"Riddle {riddle.number} answer should relate to riddle text"
+    return None
+
+
+# Deck structure
+
+@deck_check('sequential-numbering')
+def check_sequential_numbering(_validator: RiddleValidator, riddles: List[Riddle]) -> List[str]:
+    actual_numbers = [riddle.number for riddle in riddles]
+    if actual_numbers != list(range(1, len(riddles) + 1)):
+        return [f"Riddles should be numbered 1-{len(riddles)} in sequential order"]
+    return []
+
+
+@deck_check('ends-with-newline')
+def check_ends_with_newline(validator: RiddleValidator, _riddles: List[Riddle]) -> List[str]:
+    content = validator.content
+    last = content[-1:]
+    if last not in ('\n', b'\n'):
+        return ["File should end with a newline character"]
+    return []
+
+
+def run_riddle_checks(riddle: Riddle, check_ids=None) -> List[Dict[str, Any]]:
+    """Run per-riddle checks and return one failure record per problem"""
+    failures = []
+    for check_id, check in RIDDLE_CHECKS.items():
+        if check_ids is not None and check_id not in check_ids:
+            continue
+        message = check(riddle)
+        if message is not None:
+            failures.append({
+                'check': check_id,
+                'riddle': riddle.number,
+                'line': riddle.line_number,
+                'message': message,
+            })
+    return failures
+
+
+def run_deck_checks(validator: RiddleValidator, riddles: List[Riddle]) -> List[Dict[str, Any]]:
+    """Run every whole-deck check and return one failure record per problem"""
+    return [
+        {'check': check_id, 'riddle': None, 'line': None, 'message': message}
+        for check_id, check in DECK_CHECKS.items()
+        for message in check(validator, riddles)
+    ]
+
+
+def all_failures(validator: RiddleValidator, riddles: Optional[List[Riddle]] = None,
+                 lint: bool = True) -> List[Dict[str, Any]]:
+    """Every failure record for a deck, in the order validate_riddles reports them
+
+    Deck checks, then lint findings (unless ``lint`` is False), then each
+    riddle's checks. ``riddles`` defaults to the validator's own parse.
+    """
+    if riddles is None:
+        riddles = validator.get_riddles()
+    failures = run_deck_checks(validator, riddles)
+    if lint:
+        failures.extend(lint_failures(validator.iter_lines()))
+    for riddle in riddles:
+        failures.extend(run_riddle_checks(riddle))
+    return failures
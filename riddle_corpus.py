@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Compiled binary riddle corpus
+
+Runtimes that load riddles at startup should not have to parse markdown.
+``write_corpus`` compiles parsed riddles into a compact binary file and
+``RiddleCorpus`` memory-maps it and fetches any riddle, or a random one,
+by reading one fixed-width index record and slicing the string table;
+nothing else in the file is touched.
+
+Layout (all integers little-endian):
+
+    header    magic ``RIDC``, format version, fields per record,
+              riddle count, offset of the string table
+    index     one fixed-width record per riddle, in deck order: number,
+              line number, then (offset, length) into the string table
+              for the title, riddle text (lines joined with ``\\n``),
+              answer, learning goal, where to use and teacher note
+    strings   UTF-8 strings, each distinct string stored once
+
+A missing field (or riddle with no text lines) has length ``0xFFFFFFFF``.
+Numbers, line numbers, offsets and lengths are 32-bit, so a string table
+or riddle numbering past 4 GiB / 2**32 cannot be written.
+
+Usage:
+    python3 riddle_corpus.py EDU-RIDDLES.md -o riddles.ridc
+"""
+
+import argparse
+import mmap
+import os
+import random
+import struct
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from edu_riddles import Riddle, RiddleValidator
+
+MAGIC = b'RIDC'
+FORMAT_VERSION = 1
+
+# String fields in record order; riddle_text is stored as one joined string
+_STRING_FIELDS = (
+    'title', 'riddle_text', 'answer',
+    'learning_goal', 'where_to_use', 'teacher_note',
+)
+
+_HEADER = struct.Struct('<4sHHII')
+_RECORD = struct.Struct('<II' + 'II' * len(_STRING_FIELDS))
+_MISSING = 0xFFFFFFFF
+
+
+class CorpusFormatError(ValueError):
+    """The file is not a riddle corpus this version can read
+
+    ``version`` is the unsupported format version, if the header has one;
+    ``truncated`` means the header promises more index than the file holds.
+    """
+
+    def __init__(self, path: Union[str, Path], version: Optional[int] = None,
+                 truncated: bool = False):
+        if truncated:
+            problem = 'truncated riddle index'
+        elif version is not None:
+            problem = f'unsupported corpus version {version}'
+        else:
+            problem = 'not a riddle corpus'
+        super().__init__(f'{path}: {problem}')
+
+
+class CorpusLimitError(ValueError):
+    """A riddle does not fit the format's 32-bit fields"""
+
+    def __init__(self, number: int):
+        super().__init__(f'riddle {number}: number, line or string table offset '
+                         f'does not fit in 32 bits (string table limit 4 GiB)')
+
+
+def _field_string(riddle: Riddle, field: str) -> Optional[str]:
+    if field == 'riddle_text':
+        lines = riddle.riddle_text
+        return '\n'.join(lines) if lines else None
+    return getattr(riddle, field)
+
+
+def write_corpus(riddles: Iterable[Riddle], path: Union[str, Path]) -> int:
+    """Compile riddles into a corpus file and return the riddle count
+
+    The file is written to a temporary name and renamed into place, so
+    readers never see a partial corpus.
+    """
+    strings = bytearray()
+    offsets: Dict[str, int] = {}
+    records = []
+    for riddle in riddles:
+        spans = []
+        for field in _STRING_FIELDS:
+            value = _field_string(riddle, field)
+            if value is None:
+                spans.extend((0, _MISSING))
+                continue
+            encoded = value.encode('utf-8')
+            if len(encoded) >= _MISSING:
+                raise CorpusLimitError(riddle.number)
+            if value not in offsets:
+                offsets[value] = len(strings)
+                strings += encoded
+            spans.extend((offsets[value], len(encoded)))
+        try:
+            records.append(_RECORD.pack(riddle.number, riddle.line_number, *spans))
+        except struct.error:
+            raise CorpusLimitError(riddle.number) from None
+
+    string_table = _HEADER.size + _RECORD.size * len(records)
+    path = Path(path)
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(_STRING_FIELDS),
+                                 len(records), string_table))
+            f.writelines(records)
+            f.write(strings)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return len(records)
+
+
+def _read_header(path: Union[str, Path], buf: mmap.mmap) -> Tuple[int, int]:
+    """(riddle count, string table offset) from a corpus header"""
+    magic, version, fields, count, string_table = _HEADER.unpack_from(buf)
+    if magic != MAGIC:
+        raise CorpusFormatError(path)
+    if version != FORMAT_VERSION or fields != len(_STRING_FIELDS):
+        raise CorpusFormatError(path, version)
+    if string_table != _HEADER.size + _RECORD.size * count or string_table > len(buf):
+        raise CorpusFormatError(path, truncated=True)
+    return count, string_table
+
+
+def compile_deck(deck: Union[str, Path], path: Union[str, Path]) -> int:
+    """Parse a markdown deck and compile it into a corpus file"""
+    with RiddleValidator.from_file(deck, use_mmap=True) as validator:
+        return write_corpus(validator.iter_riddles(), path)
+
+
+class RiddleCorpus:
+    """Read-only, memory-mapped view of a compiled corpus
+
+    Riddles returned by a corpus keep their text in the mapping (decoded
+    on access), so read them before the corpus is closed.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                raise CorpusFormatError(path)
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            count, string_table = _read_header(path, self._map)
+        except Exception:
+            self._map.close()
+            raise
+        self._count = count
+        self._strings = string_table
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> 'RiddleCorpus':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Riddle]:
+        for position in range(self._count):
+            yield self.riddle_at(position)
+
+    def _record(self, position: int):
+        return _RECORD.unpack_from(self._map, _HEADER.size + _RECORD.size * position)
+
+    def riddle_at(self, position: int) -> Riddle:
+        """The riddle at ``position`` in deck order (0-based)"""
+        if not 0 <= position < self._count:
+            raise IndexError(f'riddle position {position} out of range')  # noqa: TRY003
+        number, line_number, *spans = self._record(position)
+        buf = self._map
+        fields = {}
+        text_spans = []
+        for i, field in enumerate(_STRING_FIELDS):
+            offset, length = spans[2 * i], spans[2 * i + 1]
+            if length == _MISSING:
+                fields[field] = None
+                continue
+            start = self._strings + offset
+            end = start + length
+            if field == 'riddle_text':
+                # Line spans straight into the mapping, like a mapped parse
+                line_start = start
+                while True:
+                    newline = buf.find(b'\n', line_start, end)
+                    if newline == -1:
+                        text_spans.extend((line_start, end))
+                        break
+                    text_spans.extend((line_start, newline))
+                    line_start = newline + 1
+            else:
+                fields[field] = buf[start:end].decode('utf-8')
+        fields.pop('riddle_text', None)
+        return Riddle(number, fields.pop('title'), line_number,
+                      source=buf, text_spans=text_spans, **fields)
+
+    def get(self, number: int) -> Optional[Riddle]:
+        """The riddle numbered ``number``, or None
+
+        Decks numbered 1..N (as the checks require) resolve with one
+        record read; otherwise the number column is scanned.
+        """
+        position = number - 1
+        if 0 <= position < self._count and self._record(position)[0] == number:
+            return self.riddle_at(position)
+        for position in range(self._count):
+            if self._record(position)[0] == number:
+                return self.riddle_at(position)
+        return None
+
+    def random(self, rng: Optional[random.Random] = None) -> Riddle:
+        """A uniformly random riddle"""
+        if not self._count:
+            raise IndexError('random riddle from an empty corpus')  # noqa: TRY003
+        return self.riddle_at((rng or random).randrange(self._count))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Compile a riddle deck into a binary corpus.')
+    parser.add_argument('deck', help='markdown deck, e.g. EDU-RIDDLES.md')
+    parser.add_argument('-o', '--output', required=True, help='corpus file to write')
+    args = parser.parse_args(argv)
+
+    try:
+        count = compile_deck(args.deck, args.output)
+    except (OSError, UnicodeDecodeError, CorpusLimitError) as e:
+        print(f'{args.deck}: {e}', file=sys.stderr)
+        return 1
+    print(f'{count} riddles -> {args.output} ({os.path.getsize(args.output):,} bytes)',
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Structured diagnostics for riddle decks
+
+The test suite and validate_riddles.py report problems as message strings.
+This module runs the same checks (riddle_checks.py) and markdown rules
+(riddle_lint.py) but yields typed ``Diagnostic`` records instead: rule id,
+severity, message, file and a 1-based line/column span (end column
+exclusive) pointing at the offending text, such as the ``Answer:`` value,
+a trailing-whitespace run or an HTML entity.
+
+Diagnostics are streamed. The deck is read line by line and only the
+riddle being checked is held in memory, so memory use does not grow with
+the deck or with the number of findings. ``max_per_rule`` caps how many
+findings each rule reports; the rest are summed into one ``note``.
+
+Two lint rules compare every line with the deck's most common style
+(horizontal rules and list bullets). They count styles on the first pass
+and, only when a deck mixes styles, read it a second time to report the
+odd lines, so their findings come after the others.
+
+Usage:
+    python3 riddle_diagnostics.py EDU-RIDDLES.md 'decks/*.md' --max-per-rule 100
+    python3 riddle_diagnostics.py big-deck.md --format sarif -o findings.sarif
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+from edu_riddles import Riddle, RiddleValidator, iter_riddles
+from path_patterns import expand_paths
+from riddle_checks import DECK_CHECKS, RIDDLE_CHECKS
+from riddle_lint import RULES, HorizontalRules, LintRule, ListBullets
+
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+
+# Missing fields and broken structure; everything else is a warning
+ERROR_RULES = frozenset([
+    'title', 'riddle-text', 'answer', 'learning-goal', 'where-to-use',
+    'teacher-note', 'sequential-numbering', 'read-error',
+])
+
+
+def severity_of(rule: str) -> str:
+    return 'error' if rule in ERROR_RULES else 'warning'
+
+
+class Diagnostic(NamedTuple):
+    """One finding; columns are 1-based and ``end_column`` is exclusive"""
+    rule: str
+    severity: str
+    message: str
+    path: Optional[str] = None
+    line: Optional[int] = None
+    column: Optional[int] = None
+    end_line: Optional[int] = None
+    end_column: Optional[int] = None
+    riddle: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._asdict()
+
+
+# (line, column, end_line, end_column)
+Span = Tuple[int, int, int, int]
+
+# A ``## N) Title`` riddle header, as the parser matches it
+_HEADER_RE = re.compile(r'## \d+\) .')
+
+# Field label -> riddle field, as the parser reads them
+_FIELDS = {
+    'Riddle': 'riddle_text',
+    'Answer': 'answer',
+    'Learning goal': 'learning_goal',
+    'Where to use': 'where_to_use',
+    'Teacher note': 'teacher_note',
+}
+_LABEL_RE = re.compile(r'(Riddle|Answer|Learning goal|Where to use|Teacher note):\s*')
+
+# Riddle check id -> the field its span points at; unlisted checks span
+# the whole riddle, and a missing field falls back to the header
+_ANCHORS = {
+    'title': 'title',
+    'title-format': 'title',
+    'riddle-text': 'riddle_text',
+    'riddle-length': 'riddle_text',
+    'answer': 'answer',
+    'self-contained': 'answer',
+    'learning-goal': 'learning_goal',
+    'actionable-learning-goal': 'learning_goal',
+    'where-to-use': 'where_to_use',
+    'concrete-location': 'where_to_use',
+    'teacher-note': 'teacher_note',
+    'teacher-guidance': 'teacher_note',
+}
+
+
+def _bullet_style(line: str, stripped: str) -> Optional[str]:
+    if stripped[:1] in ('-', '*', '+'):
+        bullet = ListBullets.BULLET_RE.match(line)
+        if bullet:
+            return bullet.group(1)
+    return None
+
+
+# Lint rule id -> the style of a line it compares against the majority
+_MAJORITY_STYLES = {
+    'horizontal-rules': lambda line, stripped: line if stripped in HorizontalRules.STYLES else None,
+    'list-bullets': _bullet_style,
+}
+# Every styled line starts with one of these, so other lines skip the rules
+_STYLE_CHARS = frozenset('-*_+')
+
+# Deck checks computed while streaming instead of over a list of riddles
+_STREAMED_DECK_CHECKS = frozenset(['sequential-numbering', 'ends-with-newline'])
+
+
+def _riddle_diagnostics(section: List[str], first_line: int,
+                        path: Optional[str]) -> Tuple[Riddle, Span, List[Diagnostic]]:
+    """Check one ``## N)`` section; returns its riddle, header span and findings"""
+    riddle = next(iter_riddles(section))
+    header = section[0]
+    title_column = header.index(') ') + 3
+    spans: Dict[str, Span] = {'title': (first_line, title_column, first_line, len(header) + 1)}
+    whole_end = (first_line, len(header) + 1)
+    text_first = text_last = None
+    in_text = False
+    match_label = _LABEL_RE.match
+
+    for offset, line in enumerate(section[1:], 1):
+        number = first_line + offset
+        stripped = line.strip()
+        if not stripped or line.startswith('---'):
+            continue
+        whole_end = (number, len(line) + 1)
+        label = match_label(line)
+        if label is not None:
+            field = _FIELDS[label.group(1)]
+            in_text = field == 'riddle_text'
+            if not in_text:
+                spans[field] = (number, label.end() + 1, number, len(line) + 1)
+        elif in_text:
+            if text_first is None:
+                text_first = number
+            text_last = (number, len(line) + 1)
+    if text_first is not None:
+        spans['riddle_text'] = (text_first, 1, *text_last)
+    whole = (first_line, 1, *whole_end)
+
+    findings = []
+    for check_id, check in RIDDLE_CHECKS.items():
+        message = check(riddle)
+        if message is None:
+            continue
+        anchor = _ANCHORS.get(check_id)
+        span = whole if anchor is None else spans.get(anchor, spans['title'])
+        findings.append(Diagnostic(check_id, severity_of(check_id), message, path, *span,
+                                   riddle=riddle.number))
+    return riddle, spans['title'], findings
+
+
+def _lint_span(rule_id: str, line: str, detail, searched: Dict[str, int]) -> Tuple[int, int]:
+    if rule_id == 'trailing-whitespace':
+        return len(line.rstrip()) + 1, len(line) + 1
+    if isinstance(detail, str) and detail != line:
+        # Several identical details on one line: report each occurrence
+        start = line.find(detail, searched.get(detail, 0))
+        if start != -1:
+            searched[detail] = start + len(detail)
+            return start + 1, start + len(detail) + 1
+    return 1, len(line) + 1
+
+
+def _scan(validator: RiddleValidator, path: Optional[str]) -> Iterator[Diagnostic]:
+    rules = [cls() for rule_id, cls in RULES.items() if rule_id not in _MAJORITY_STYLES]
+    streamed = [rule for rule in rules if type(rule).finish is LintRule.finish]
+    finished = [rule for rule in rules if type(rule).finish is not LintRule.finish]
+    visitors = [rule.visit for rule in rules]
+    # Findings lists are cleared in place, so they can be held here
+    pending = [(rule, rule.findings) for rule in streamed]
+    styles = {rule_id: Counter() for rule_id in _MAJORITY_STYLES}
+    # Other deck checks need every riddle; only then are they collected
+    other_deck_checks = [c for c in DECK_CHECKS if c not in _STREAMED_DECK_CHECKS]
+    riddles = [] if other_deck_checks else None
+
+    is_header = _HEADER_RE.match
+    section: List[str] = []
+    section_start = 0
+    riddle_count = 0
+    misnumbered: Optional[Span] = None
+    last_line = (0, '')
+
+    def close_section():
+        nonlocal riddle_count, misnumbered
+        riddle, header_span, findings = _riddle_diagnostics(section, section_start, path)
+        riddle_count += 1
+        if riddle.number != riddle_count and misnumbered is None:
+            misnumbered = header_span
+        if riddles is not None:
+            riddles.append(riddle)
+        return findings
+
+    for number, line in enumerate(validator.iter_lines(), 1):
+        last_line = (number, line)
+        stripped = line.strip()
+        for visit in visitors:
+            visit(number, line, stripped)
+        for rule, findings in pending:
+            if findings:
+                searched: Dict[str, int] = {}
+                message = rule.message
+                for line_number, detail in findings:
+                    column, end_column = _lint_span(rule.rule_id, line, detail, searched)
+                    text = message if detail == line else f'{message}: {detail}'
+                    yield Diagnostic(rule.rule_id, severity_of(rule.rule_id), text, path,
+                                     line_number, column, line_number, end_column)
+                findings.clear()
+        if stripped[:1] in _STYLE_CHARS:
+            for rule_id, style_of in _MAJORITY_STYLES.items():
+                style = style_of(line, stripped)
+                if style is not None:
+                    styles[rule_id][style] += 1
+
+        if line.startswith('## ') and is_header(line):
+            if section:
+                yield from close_section()
+            section = [line]
+            section_start = number
+        elif section:
+            section.append(line)
+    if section:
+        yield from close_section()
+
+    for rule in finished:
+        rule.finish()
+        if not rule.ok:
+            for line_number, detail in rule.findings:
+                yield Diagnostic(rule.rule_id, severity_of(rule.rule_id),
+                                 f'{rule.message}: {detail!r}', path, line_number)
+
+    if misnumbered is not None:
+        yield Diagnostic('sequential-numbering', severity_of('sequential-numbering'),
+                         f"Riddles should be numbered 1-{riddle_count} in sequential order",
+                         path, *misnumbered)
+    for message in DECK_CHECKS['ends-with-newline'](validator, []):
+        number, line = last_line
+        yield Diagnostic('ends-with-newline', severity_of('ends-with-newline'), message, path,
+                         number, len(line) + 1, number, len(line) + 1)
+    for check_id in other_deck_checks:
+        for message in DECK_CHECKS[check_id](validator, riddles):
+            yield Diagnostic(check_id, severity_of(check_id), message, path)
+
+    yield from _majority_findings(validator, styles, path)
+
+
+def _majority_findings(validator: RiddleValidator, styles: Dict[str, Counter],
+                       path: Optional[str]) -> Iterator[Diagnostic]:
+    """Second pass for the majority-style rules, only when a deck mixes styles"""
+    majority = {}
+    for rule_id, counts in styles.items():
+        if len(counts) < 2:
+            continue
+        most_common, count = counts.most_common(1)[0]
+        total = sum(counts.values())
+        if rule_id == 'list-bullets' and count / total > ListBullets.MIN_CONSISTENCY:
+            continue
+        majority[rule_id] = most_common
+    if not majority:
+        return
+
+    for number, line in enumerate(validator.iter_lines(), 1):
+        stripped = line.strip()
+        for rule_id, most_common in majority.items():
+            style = _MAJORITY_STYLES[rule_id](line, stripped)
+            if style is None or style == most_common:
+                continue
+            if rule_id == 'list-bullets':
+                column = line.index(style) + 1
+                span = (number, column, number, column + 1)
+            else:
+                span = (number, 1, number, len(line) + 1)
+            yield Diagnostic(rule_id, severity_of(rule_id), RULES[rule_id].message, path, *span)
+
+
+def iter_diagnostics(validator: RiddleValidator, path: Optional[str] = None,
+                     max_per_rule: Optional[int] = None) -> Iterator[Diagnostic]:
+    """Stream every finding for a deck, at most ``max_per_rule`` per rule
+
+    Each capped rule ends the stream with one ``note`` counting the
+    findings it left out.
+    """
+    reported: Counter = Counter()
+    suppressed: Counter = Counter()
+    for diagnostic in _scan(validator, path):
+        if max_per_rule is not None and reported[diagnostic.rule] >= max_per_rule:
+            suppressed[diagnostic.rule] += 1
+            continue
+        reported[diagnostic.rule] += 1
+        yield diagnostic
+    for rule, count in suppressed.items():
+        yield Diagnostic(rule, 'note', f'{count} more findings suppressed (limit {max_per_rule} per rule)', path)
+
+
+def diagnose_files(paths: Iterable[str], max_per_rule: Optional[int] = None) -> Iterator[Diagnostic]:
+    """Stream diagnostics for each deck in turn; unreadable decks get a read-error"""
+    for path in paths:
+        try:
+            validator = RiddleValidator.from_file(path, use_mmap=True)
+        except OSError as e:
+            yield Diagnostic('read-error', 'error', str(e), path)
+            continue
+        try:
+            with validator:
+                yield from iter_diagnostics(validator, path, max_per_rule)
+        except UnicodeDecodeError as e:
+            yield Diagnostic('read-error', 'error', str(e), path)
+
+
+def write_jsonl(diagnostics: Iterable[Diagnostic], out: TextIO) -> Counter:
+    """Write one JSON object per diagnostic; returns counts by severity"""
+    counts = Counter()
+    dumps = json.dumps
+    for diagnostic in diagnostics:
+        counts[diagnostic.severity] += 1
+        out.write(dumps(diagnostic.to_dict(), ensure_ascii=False) + '\n')
+    return counts
+
+
+def _rule_descriptors() -> List[Dict[str, Any]]:
+    descriptors = []
+    for rule_id in [*RIDDLE_CHECKS, *DECK_CHECKS, *RULES, 'read-error']:
+        descriptor = {'id': rule_id, 'defaultConfiguration': {'level': severity_of(rule_id)}}
+        if rule_id in RULES:
+            descriptor['shortDescription'] = {'text': RULES[rule_id].message}
+        descriptors.append(descriptor)
+    return descriptors
+
+
+def _sarif_result(diagnostic: Diagnostic) -> Dict[str, Any]:
+    result = {
+        'ruleId': diagnostic.rule,
+        'level': diagnostic.severity,
+        'message': {'text': diagnostic.message},
+    }
+    if diagnostic.path is not None:
+        location = {'artifactLocation': {'uri': diagnostic.path}}
+        if diagnostic.line is not None:
+            region = {'startLine': diagnostic.line}
+            if diagnostic.column is not None:
+                region.update(startColumn=diagnostic.column, endLine=diagnostic.end_line,
+                              endColumn=diagnostic.end_column)
+            location['region'] = region
+        result['locations'] = [{'physicalLocation': location}]
+    return result
+
+
+def write_sarif(diagnostics: Iterable[Diagnostic], out: TextIO) -> Counter:
+    """Write a SARIF 2.1.0 log, streaming results one at a time
+
+    Returns counts by severity.
+    """
+    tool = {'driver': {'name': 'riddle_diagnostics', 'rules': _rule_descriptors()}}
+    out.write(f'{{"$schema": "{SARIF_SCHEMA}", "version": "2.1.0", "runs": [{{"tool": ')
+    out.write(json.dumps(tool, ensure_ascii=False))
+    out.write(', "results": [\n')
+    counts = Counter()
+    for diagnostic in diagnostics:
+        if counts:
+            out.write(',\n')
+        counts[diagnostic.severity] += 1
+        out.write(json.dumps(_sarif_result(diagnostic), ensure_ascii=False))
+    out.write('\n]}]}\n')
+    return counts
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Stream structured diagnostics for riddle decks.')
+    parser.add_argument('paths', nargs='+', help='deck files or glob patterns')
+    parser.add_argument('--format', choices=['jsonl', 'sarif'], default='jsonl')
+    parser.add_argument('--max-per-rule', type=int, help='report at most this many findings per rule and deck')
+    parser.add_argument('-o', '--output', default='-', help='output file (default: stdout)')
+    args = parser.parse_args(argv)
+
+    paths = expand_paths(args.paths)
+    if not paths:
+        parser.error('no decks matched')
+
+    write = write_sarif if args.format == 'sarif' else write_jsonl
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        counts = write(diagnose_files(paths, args.max_per_rule), out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"{len(paths)} decks checked: {counts['error']} errors, {counts['warning']} warnings",
+          file=sys.stderr)
+    return 1 if counts['error'] or counts['warning'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
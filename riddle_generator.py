@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Seeded riddle-deck generator for load testing
+
+Writes decks of any size in the exact format ``RiddleValidator`` parses:
+the EDU-RIDDLES.md title and opening rule, then per riddle a
+``## N) Category — "Name"`` header, the Riddle / Answer / Learning goal /
+Where to use / Teacher note fields and a ``---`` rule. The same seed
+always gives the same bytes.
+
+Riddle bodies are compiled up front: ``VARIANTS`` distinct bodies are
+drawn from the seed and rendered once, and each riddle is then just its
+header plus a body picked by index. Riddles are streamed to disk in large
+chunks, so a deck never has to fit in memory.
+
+Clean riddles pass every check in riddle_checks.py and every rule in
+riddle_lint.py. ``defects`` injects the problems those checks detect, by
+check or rule id (see ``DEFECTS``); the riddles that get one are drawn
+from the seed, and each requested defect appears at least once. The
+returned manifest lists every injected defect with its riddle and line.
+
+Usage:
+    python3 riddle_generator.py 1000000 -o big-deck.md --seed 7
+    python3 riddle_generator.py 10000 -o broken.md --defects all --defect-rate 0.01
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from io import StringIO
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Union
+
+DECK_PREAMBLE = '# Riddling Educational Hooks for Void-Language and WIMP\n\n---\n'
+
+VARIANTS = 512
+CHUNK_RIDDLES = 4096
+
+CATEGORIES = [
+    'README Icebreaker', 'Quickstart Prompt', 'Workshop Warmup', 'Issue Template Hook',
+    'PR Review Teaser', 'Docs Footer', 'Contributor Onboarding', 'Demo Opener',
+]
+NAMES = [
+    'The Tiny Interpreter', 'The Manual in the Machine', 'The Silent Compiler',
+    'The Looping Jester', 'The Empty Stack', 'The Patient Parser',
+    'The Void Between Lines', 'The Roff Whisperer',
+]
+RIDDLES = [
+    '"I read your file one token at a time and never skip a line. What am I?"',
+    '"I live between man and shell, terse and small; type for help and I answer all. Who am I?"',
+    '"I turn your words to something the machine can run, yet I never see the sun. What am I?"',
+    '"I start again each time I end, a circle with no final bend. What am I?"',
+    '"I hold the frames of every call and empty out before I fall. What am I?"',
+    '"Give me a sentence and I will find its shape, every bracket and every escape. What am I?"',
+]
+ANSWERS = [
+    'The Void-Language interpreter', "WIMP's roff man pages", "The Void compiler's parser",
+    'An infinite loop in the interpreter', 'The call stack of the Void runtime',
+    'The docs folder of the repository',
+]
+LEARNING_GOALS = [
+    'Introduce the interpreter and its run flow.',
+    'Teach where WIMP keeps its manual pages.',
+    'Explain how the Void parser reads tokens.',
+    'Show how a loop runs in Void-Language.',
+    'Help newcomers find the docs quickly.',
+    'Demonstrate how the compiler reports errors.',
+]
+WHERE_TO_USE = [
+    'README intro, workshop slides.',
+    'Issue template, CONTRIBUTING.md.',
+    'Demo page header, docs index.',
+    'PR description, discussion thread.',
+]
+TEACHER_NOTES = [
+    'Follow with a one-line example command.',
+    'Link the relevant docs page afterwards.',
+    'Give a hint if nobody answers within a minute.',
+    'Show the matching source file next.',
+    'Keep the answer hidden until the end.',
+]
+
+# (label, field) in deck order after the riddle text
+_FIELDS = [
+    ('Answer', 'answer'),
+    ('Learning goal', 'learning_goal'),
+    ('Where to use', 'where_to_use'),
+    ('Teacher note', 'teacher_note'),
+]
+
+Fields = Dict[str, Any]
+
+
+def _set(**values) -> Callable[[Fields], None]:
+    return lambda fields: fields.update(values)
+
+
+def _add_extra(text: str) -> Callable[[Fields], None]:
+    return lambda fields: fields['extra'].append(text)
+
+
+# Check or lint rule id -> edit that makes a riddle fail it
+DEFECTS: Dict[str, Callable[[Fields], None]] = {
+    # riddle_checks: completeness
+    'title': _set(title='Quiz'),
+    'riddle-text': _set(riddle=None),
+    'answer': _set(answer=None),
+    'learning-goal': _set(learning_goal=None),
+    'where-to-use': _set(where_to_use=None),
+    'teacher-note': _set(teacher_note=None),
+    # riddle_checks: content quality
+    'title-format': lambda fields: fields.update(title=fields['title'].replace(' — ', ' ')),
+    'project-reference': _set(
+        title='Warmup — "Keys"',
+        riddle='"I have keys but open no locks, and space but hold no room. What am I?"',
+        answer='A plain keyboard', learning_goal='Introduce typing to new students.'),
+    'actionable-learning-goal': _set(learning_goal='The interpreter reads files line by line.'),
+    'teacher-guidance': _set(teacher_note='This one works well with beginners.'),
+    'concrete-location': _set(where_to_use='Anywhere you like.'),
+    # riddle_checks: robustness
+    'not-empty': _set(riddle='"Void?"', answer='Yes', learning_goal='Show it.',
+                      where_to_use='Demo.', teacher_note='Add one.'),
+    'riddle-length': _set(riddle='"' + 'I echo in the void, ' * 25 + 'what am I?"'),
+    'self-contained': _set(answer='Zebra'),
+    # riddle_checks: deck structure (a number is skipped)
+    'sequential-numbering': _set(skip=1),
+    # riddle_lint
+    'trailing-whitespace': lambda fields: fields.update(answer=fields['answer'] + ' '),
+    'header-spacing': _add_extra('\n#Notes\n'),
+    'horizontal-rules': _set(rule='***'),
+    'multiple-blank-lines': _add_extra('\n\n\n\n'),
+    'html-entities': _add_extra('\nSee&nbsp;the docs.\n'),
+    'list-bullets': _add_extra('\n- one\n* two\n+ three\n'),
+}
+
+# Injected once, at the end of the deck, rather than into a riddle
+DECK_DEFECTS = frozenset(['ends-with-newline'])
+
+DEFECT_IDS = sorted(set(DEFECTS) | DECK_DEFECTS)
+
+
+class UnknownDefectError(ValueError):
+    """Defect ids that are not in ``DEFECT_IDS``"""
+
+    def __init__(self, defects: List[str]):
+        super().__init__(f'unknown defects: {", ".join(defects)}')
+
+
+def random_fields(rng: random.Random) -> Fields:
+    """A clean riddle's fields, drawn from the vocabulary pools"""
+    return {
+        'title': f'{rng.choice(CATEGORIES)} — "{rng.choice(NAMES)}"',
+        'riddle': rng.choice(RIDDLES),
+        'answer': rng.choice(ANSWERS),
+        'learning_goal': rng.choice(LEARNING_GOALS),
+        'where_to_use': rng.choice(WHERE_TO_USE),
+        'teacher_note': rng.choice(TEACHER_NOTES),
+        'extra': [],
+        'rule': '---',
+        'skip': 0,
+    }
+
+
+def render_body(fields: Fields) -> str:
+    """Everything after a riddle's ``## N) `` prefix, through its rule"""
+    parts = [fields['title'], '\nRiddle:\n']
+    if fields['riddle'] is not None:
+        parts.append(fields['riddle'] + '\n')
+    for label, field in _FIELDS:
+        value = fields[field]
+        if value is not None:
+            parts.append(f'\n{label}: {value}\n')
+    parts.extend(fields['extra'])
+    parts.append(f"\n{fields['rule']}\n")
+    return ''.join(parts)
+
+
+def _plan_defects(rng: random.Random, count: int, defects: List[str],
+                  rate: float) -> Dict[int, str]:
+    """Riddle position -> defect id, covering every requested defect"""
+    kinds = [d for d in defects if d not in DECK_DEFECTS]
+    if not kinds or not count:
+        return {}
+    wanted = min(count, max(len(kinds), round(count * rate)))
+    positions = sorted(rng.sample(range(1, count + 1), wanted))
+    return {position: kinds[i % len(kinds)] for i, position in enumerate(positions)}
+
+
+def write_deck(out: TextIO, count: int, seed: int = 0,
+               defects: Iterable[str] = (), defect_rate: float = 0.0) -> List[Dict[str, Any]]:
+    """Stream a deck of ``count`` riddles to ``out``; returns the defect manifest
+
+    Manifest entries are {'defect', 'riddle', 'line'}: the number in the
+    defective riddle's header and its line, or None for deck defects.
+    """
+    defects = list(defects)
+    unknown = [d for d in defects if d not in DEFECTS and d not in DECK_DEFECTS]
+    if unknown:
+        raise UnknownDefectError(unknown)
+
+    # Seeded for reproducible decks; nothing here needs crypto randomness
+    rng = random.Random(seed)  # noqa: S311
+    variants = [render_body(random_fields(rng)) for _ in range(VARIANTS)]
+    # Newlines per rendered riddle: the blank line, header and body
+    variant_lines = [body.count('\n') + 1 for body in variants]
+    plan = _plan_defects(rng, count, defects, defect_rate)
+
+    manifest = []
+    line = DECK_PREAMBLE.count('\n')
+    skipped = 0
+    out.write(DECK_PREAMBLE)
+    for start in range(1, count + 1, CHUNK_RIDDLES):
+        stop = min(count + 1, start + CHUNK_RIDDLES)
+        picks = rng.choices(range(VARIANTS), k=stop - start)
+        parts = []
+        for position, pick in zip(range(start, stop), picks, strict=True):
+            defect = plan.get(position)
+            if defect is None:
+                parts.append(f'\n## {position + skipped}) {variants[pick]}')
+                line += variant_lines[pick]
+                continue
+            fields = random_fields(random.Random(f'{seed}:{position}'))  # noqa: S311
+            DEFECTS[defect](fields)
+            skipped += fields['skip']
+            riddle = f'\n## {position + skipped}) {render_body(fields)}'
+            manifest.append({'defect': defect, 'riddle': position + skipped, 'line': line + 2})
+            parts.append(riddle)
+            line += riddle.count('\n')
+        chunk = ''.join(parts)
+        if stop > count and 'ends-with-newline' in defects:
+            chunk = chunk.rstrip('\n')
+        out.write(chunk)
+
+    if 'ends-with-newline' in defects:
+        if not count:
+            out.write('Trailing text')
+        manifest.append({'defect': 'ends-with-newline', 'riddle': None, 'line': None})
+    return manifest
+
+
+def deck_text(count: int, seed: int = 0, defects: Iterable[str] = (),
+              defect_rate: float = 0.0) -> str:
+    """A generated deck as one string, for tests and small benchmarks"""
+    out = StringIO()
+    write_deck(out, count, seed, defects, defect_rate)
+    return out.getvalue()
+
+
+def generate_file(path: Union[str, Path], count: int, seed: int = 0,
+                  defects: Iterable[str] = (), defect_rate: float = 0.0) -> List[Dict[str, Any]]:
+    """Write a deck to ``path`` (atomically) and return the defect manifest"""
+    path = Path(path)
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    try:
+        with open(tmp, 'w', encoding='utf-8', newline='\n', buffering=1 << 20) as f:
+            manifest = write_deck(f, count, seed, defects, defect_rate)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return manifest
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Generate a riddle deck for load testing.')
+    parser.add_argument('count', type=int, help='number of riddles')
+    parser.add_argument('-o', '--output', help='deck file (default: stdout)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--defects', default='',
+                        help=f"comma-separated defect ids, or 'all' ({', '.join(DEFECT_IDS)})")
+    parser.add_argument('--defect-rate', type=float, default=0.0,
+                        help='share of riddles given a defect (each requested one appears at least once)')
+    parser.add_argument('--manifest', help='write the injected defects here as JSON')
+    args = parser.parse_args(argv)
+
+    defects = DEFECT_IDS if args.defects == 'all' else [d for d in args.defects.split(',') if d]
+    try:
+        if args.output:
+            manifest = generate_file(args.output, args.count, args.seed, defects, args.defect_rate)
+        else:
+            manifest = write_deck(sys.stdout, args.count, args.seed, defects, args.defect_rate)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.manifest:
+        with open(args.manifest, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
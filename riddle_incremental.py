@@ -0,0 +1,83 @@
+"""
+Incremental re-validation of riddle decks
+
+A deck is split into sections at its ``## N)`` headers and every section is
+hashed. ``IncrementalValidator`` remembers the parsed riddle and the
+riddle-level check verdicts for each section hash from the previous run,
+so when one riddle is edited only that section is parsed and checked
+again; everything else is reused. Whole-deck checks are cheap and always
+run.
+
+Verdicts are stored with line numbers relative to their section, so
+sections that merely moved (because an earlier riddle grew or shrank)
+are still reused and reported at their new lines.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from edu_riddles import Riddle, RiddleValidator, iter_sections
+from riddle_checks import run_deck_checks, run_riddle_checks
+
+# Section hash -> (riddle parsed from the section alone, its failures)
+SectionVerdict = Tuple[Riddle, List[Dict[str, Any]]]
+
+
+def section_hash(text: str) -> bytes:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+class IncrementalValidator:
+    """Re-check only the riddle sections that changed since the last run"""
+
+    def __init__(self, check_ids: Optional[set] = None):
+        self.check_ids = check_ids
+        self._verdicts: Dict[bytes, SectionVerdict] = {}
+
+    def _check_section(self, text: str) -> SectionVerdict:
+        (riddle,) = RiddleValidator(text).get_riddles()
+        return riddle, run_riddle_checks(riddle, self.check_ids)
+
+    def validate(self, content: str) -> Dict[str, Any]:
+        """Validate ``content``, reusing verdicts for unchanged sections
+
+        Returns a report with the failures (line numbers absolute to the
+        document), the riddle count, the numbers of the riddles that were
+        re-checked and how many sections were reused.
+        """
+        verdicts = {}
+        riddles = []
+        failures = []
+        rechecked = []
+        reused = 0
+
+        for start, end, line_number in iter_sections(content):
+            text = content[start:end]
+            key = section_hash(text)
+            verdict = verdicts.get(key) or self._verdicts.get(key)
+            if verdict is None:
+                verdict = self._check_section(text)
+                rechecked.append(verdict[0].number)
+            else:
+                reused += 1
+            verdicts[key] = verdict
+
+            riddle, section_failures = verdict
+            riddles.append(riddle)
+            offset = line_number - riddle.line_number
+            for failure in section_failures:
+                failures.append(dict(failure, line=failure['line'] + offset))
+
+        # Forget sections that no longer exist so the cache tracks the deck
+        self._verdicts = verdicts
+        failures[:0] = run_deck_checks(RiddleValidator(content), riddles)
+        return {
+            'riddles': len(riddles),
+            'failures': failures,
+            'rechecked': rechecked,
+            'reused': reused,
+        }
+
+    def validate_file(self, path) -> Dict[str, Any]:
+        with open(path, 'r', encoding='utf-8') as f:
+            return self.validate(f.read())
@@ -0,0 +1,124 @@
+"""
+Lookup indexes over parsed riddles
+
+README generators and issue-template stampers ask for riddles by number,
+by the category in the title (``Issue-starter``, ``PR Description
+Opener``), by a ``Where to use`` location, or by words in the riddle and
+its answer. ``RiddleIndex`` builds all of those maps in one pass over a
+parsed deck so each query is a dict lookup instead of a rescan of
+``get_riddles()``.
+
+Loaded documents build their index once and keep it:
+``document_index(load_document(path))``.
+"""
+
+import bisect
+import re
+import weakref
+from typing import Dict, Iterable, List, Optional
+
+from edu_riddles import Riddle, RiddleDocument
+
+# Title separators, as accepted by the title-format check
+_CATEGORY_SPLIT_RE = re.compile(r'\s*(?:—|–| - )\s*')  # noqa: RUF001
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+def title_category(title: str) -> str:
+    """The category part of a ``Category — "Name"`` title"""
+    return _CATEGORY_SPLIT_RE.split(title, maxsplit=1)[0].strip()
+
+
+def index_words(text: str) -> List[str]:
+    """Lowercased words of ``text``, as the word and location indexes key them"""
+    return _WORD_RE.findall(text.lower())
+
+
+class RiddleIndex:
+    """Number, category, location and word indexes over one parsed deck
+
+    Every index maps a key to positions in ``riddles``, so results come
+    back in deck order. Keys are matched case-insensitively.
+    """
+
+    def __init__(self, riddles: Iterable[Riddle]):
+        self.riddles: List[Riddle] = list(riddles)
+        self._by_number: Dict[int, int] = {}
+        self._by_category: Dict[str, List[int]] = {}
+        self._by_location: Dict[str, List[int]] = {}
+        self._by_word: Dict[str, List[int]] = {}
+
+        for position, riddle in enumerate(self.riddles):
+            self._by_number.setdefault(riddle.number, position)
+            if riddle.title:
+                category = title_category(riddle.title).lower()
+                self._by_category.setdefault(category, []).append(position)
+            self._add_words(self._by_location, position, riddle.where_to_use or '')
+            text = '\n'.join(riddle.riddle_text) + '\n' + (riddle.answer or '')
+            self._add_words(self._by_word, position, text)
+
+        # Sorted category keys let a prefix query bisect to its first match
+        self._categories = sorted(self._by_category)
+
+    @staticmethod
+    def _add_words(index: Dict[str, List[int]], position: int, text: str) -> None:
+        for word in set(index_words(text)):
+            index.setdefault(word, []).append(position)
+
+    def _riddles_at(self, positions: Iterable[int]) -> List[Riddle]:
+        return [self.riddles[position] for position in positions]
+
+    def __len__(self) -> int:
+        return len(self.riddles)
+
+    def by_number(self, number: int) -> Optional[Riddle]:
+        """The riddle numbered ``number`` (the first, if repeated), or None"""
+        position = self._by_number.get(number)
+        return None if position is None else self.riddles[position]
+
+    def categories(self) -> List[str]:
+        """Every category, lowercased and sorted"""
+        return list(self._categories)
+
+    def by_category(self, prefix: str) -> List[Riddle]:
+        """Riddles whose title category starts with ``prefix``
+
+        ``by_category('issue')`` matches "Issue-starter"; a full category
+        name matches exactly that category.
+        """
+        prefix = prefix.strip().lower()
+        start = bisect.bisect_left(self._categories, prefix)
+        positions = []
+        for category in self._categories[start:]:
+            if not category.startswith(prefix):
+                break
+            positions.extend(self._by_category[category])
+        return self._riddles_at(sorted(positions))
+
+    def by_location(self, keyword: str) -> List[Riddle]:
+        """Riddles whose ``Where to use`` mentions the word ``keyword``"""
+        return self._riddles_at(self._by_location.get(keyword.lower(), ()))
+
+    def search(self, query: str) -> List[Riddle]:
+        """Riddles whose text or answer contains every word of ``query``"""
+        words = index_words(query)
+        if not words:
+            return []
+        postings = sorted((self._by_word.get(word, []) for word in set(words)), key=len)
+        matches = set(postings[0])
+        for posting in postings[1:]:
+            matches.intersection_update(posting)
+        return self._riddles_at(sorted(matches))
+
+
+# Document -> its index, dropped along with the document
+_document_indexes: 'weakref.WeakKeyDictionary[RiddleDocument, RiddleIndex]' = weakref.WeakKeyDictionary()
+
+
+def document_index(document: RiddleDocument) -> RiddleIndex:
+    """The index over a loaded document's riddles, built on first use"""
+    index = _document_indexes.get(document)
+    if index is None:
+        index = _document_indexes[document] = RiddleIndex(document.riddles)
+    return index
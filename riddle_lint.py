@@ -0,0 +1,216 @@
+"""
+Single-sweep markdown lint engine for riddle decks
+
+Each rule is a visitor: the engine walks the document once and hands every
+line to every rule, then lets each rule finish (rules such as "horizontal
+rules are consistent" can only decide once they have seen the whole
+document). Work shared by all rules, like stripping the line, is done once
+per line by the engine.
+
+Rules collect ``findings`` as (line_number, detail) pairs and count how
+many lines they ``checked``; ``ok`` says whether the document passes.
+Each rule's ``message`` is the text failures and diagnostics report.
+"""
+
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+# Rule id -> rule class, in registration order
+RULES: Dict[str, Type['LintRule']] = {}
+
+
+def lint_rule(cls: Type['LintRule']) -> Type['LintRule']:
+    """Register a rule class under its ``rule_id``"""
+    RULES[cls.rule_id] = cls
+    return cls
+
+
+class LintRule:
+    """Base class for rules evaluated in the single sweep"""
+
+    rule_id = ''
+    message = ''
+
+    def __init__(self):
+        self.findings: List[Tuple[int, Any]] = []
+        self.checked = 0
+
+    def visit(self, number: int, line: str, stripped: str) -> None:
+        """Called for every line, in order; ``number`` is 1-based"""
+
+    def finish(self) -> None:
+        """Called once after the last line"""
+
+    @property
+    def ok(self) -> bool:
+        return not self.findings
+
+
+@lint_rule
+class TrailingWhitespace(LintRule):
+    """Non-empty lines should not end in whitespace"""
+
+    rule_id = 'trailing-whitespace'
+    message = 'Non-empty lines should not end in whitespace'
+
+    def visit(self, number, line, stripped):
+        # Ignore empty lines
+        if stripped:
+            self.checked += 1
+            if line[-1:].isspace():
+                self.findings.append((number, line))
+
+
+@lint_rule
+class HeaderSpacing(LintRule):
+    """Headers need a space after the # symbols"""
+
+    rule_id = 'header-spacing'
+    message = 'Headers need a space after the # symbols'
+
+    def visit(self, number, line, _stripped):
+        if line.startswith('#'):
+            self.checked += 1
+            if not (line.startswith('# ') or line.startswith('## ')):
+                self.findings.append((number, line))
+
+
+@lint_rule
+class HorizontalRules(LintRule):
+    """Horizontal rules should all use the most common style"""
+
+    rule_id = 'horizontal-rules'
+    message = 'Horizontal rules should all use the most common style'
+    STYLES = frozenset(['---', '***', '___'])
+
+    def __init__(self):
+        super().__init__()
+        self.rules: List[Tuple[int, str]] = []
+
+    def visit(self, number, line, stripped):
+        if stripped in self.STYLES:
+            self.rules.append((number, line))
+
+    def finish(self):
+        self.checked = len(self.rules)
+        if self.rules:
+            most_common = Counter(line for _, line in self.rules).most_common(1)[0][0]
+            self.findings = [(n, line) for n, line in self.rules if line != most_common]
+
+
+@lint_rule
+class MultipleBlankLines(LintRule):
+    """No more than two consecutive blank lines"""
+
+    rule_id = 'multiple-blank-lines'
+    message = 'No more than two consecutive blank lines'
+
+    def __init__(self):
+        super().__init__()
+        self.blank_count = 0
+
+    def visit(self, number, line, stripped):
+        if stripped:
+            self.blank_count = 0
+            return
+        self.blank_count += 1
+        self.checked += 1
+        if self.blank_count > 2:
+            self.findings.append((number, line))
+
+
+@lint_rule
+class HtmlEntities(LintRule):
+    """Only the common, valid HTML entities may appear"""
+
+    rule_id = 'html-entities'
+    message = 'Only the common, valid HTML entities may appear'
+    ENTITY_RE = re.compile(r'&[a-z]+;')
+    VALID = frozenset(['&amp;', '&lt;', '&gt;', '&quot;', '&apos;'])
+
+    def visit(self, number, line, _stripped):
+        if '&' not in line:
+            return
+        for entity in self.ENTITY_RE.findall(line):
+            self.checked += 1
+            if entity not in self.VALID:
+                self.findings.append((number, entity))
+
+
+@lint_rule
+class ListBullets(LintRule):
+    """List bullets should be mostly (over 80%) the same character"""
+
+    rule_id = 'list-bullets'
+    message = 'List bullets should be mostly (over 80%) the same character'
+    BULLET_RE = re.compile(r'\s*([-*+])\s')
+    MIN_CONSISTENCY = 0.8
+
+    def __init__(self):
+        super().__init__()
+        self.items: List[Tuple[int, str, str]] = []
+
+    def visit(self, number, line, stripped):
+        if stripped[:1] in ('-', '*', '+'):
+            bullet = self.BULLET_RE.match(line)
+            if bullet:
+                self.items.append((number, line, bullet.group(1)))
+
+    def finish(self):
+        self.checked = len(self.items)
+        if self.items:
+            most_common = Counter(b for _, _, b in self.items).most_common(1)[0][0]
+            self.findings = [(n, line) for n, line, b in self.items if b != most_common]
+
+    @property
+    def consistency(self) -> float:
+        if not self.checked:
+            return 1.0
+        return 1 - len(self.findings) / self.checked
+
+    @property
+    def ok(self) -> bool:
+        return not self.items or self.consistency > self.MIN_CONSISTENCY
+
+
+def lint_lines(lines: Iterable[str], rule_ids: Optional[Iterable[str]] = None) -> Dict[str, LintRule]:
+    """Run rules over the lines in one sweep and return them by rule id
+
+    ``lines`` should not carry trailing newlines (use ``str.split('\\n')``
+    or ``RiddleValidator.iter_lines``).
+    """
+    if rule_ids is None:
+        rules = [cls() for cls in RULES.values()]
+    else:
+        rules = [RULES[rule_id]() for rule_id in rule_ids]
+    visitors = [rule.visit for rule in rules]
+
+    for number, line in enumerate(lines, 1):
+        stripped = line.strip()
+        for visit in visitors:
+            visit(number, line, stripped)
+
+    for rule in rules:
+        rule.finish()
+    return {rule.rule_id: rule for rule in rules}
+
+
+def lint_failures(lines: Iterable[str]) -> List[Dict[str, Any]]:
+    """Lint the lines and return failing rules' findings as failure records
+
+    Records have the same shape as those from riddle_checks, so lint
+    findings and riddle check failures can be reported together.
+    """
+    failures = []
+    for rule_id, rule in lint_lines(lines).items():
+        if rule.ok:
+            continue
+        for line_number, detail in rule.findings:
+            failures.append({
+                'check': rule_id,
+                'riddle': None,
+                'line': line_number,
+                'message': f"{rule.message}: {detail!r}",
+            })
+    return failures
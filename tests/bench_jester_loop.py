@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark line-at-a-time against batched writes for the jester loop
+
+Writes the jester's thoughts to a file (``/dev/null`` by default) the way
+jesterLoop.js does, one unbuffered write per line, and through
+``BufferedEmitter`` at a few buffer sizes, and reports lines per second
+and the number of writes each needed.
+
+Usage:
+    python3 tests/bench_jester_loop.py [--lines 500000] [--target /dev/null]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from jester_loop import JESTER_THOUGHTS, BufferedEmitter
+
+
+def line_at_a_time(stream, lines: int) -> int:
+    """console.log's pattern: encode and write every line on its own"""
+    thoughts = JESTER_THOUGHTS
+    for i in range(lines):
+        stream.write((thoughts[i % 4] + '\n').encode('utf-8'))
+    return lines
+
+
+def batched(stream, lines: int, buffer_chars: int) -> int:
+    emitter = BufferedEmitter(stream, buffer_chars)
+    emit = emitter.emit
+    thoughts = JESTER_THOUGHTS
+    for i in range(lines):
+        emit(thoughts[i % 4])
+    emitter.flush()
+    return emitter.writes
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark jester loop output.')
+    parser.add_argument('--lines', type=int, default=500_000)
+    parser.add_argument('--target', default=os.devnull, help='file to write to (default: os.devnull)')
+    args = parser.parse_args(argv)
+
+    runs = [('line-at-a-time', lambda f: line_at_a_time(f, args.lines))]
+    for size in (4 * 1024, 64 * 1024, 1024 * 1024):
+        runs.append((f'batched {size // 1024}K', lambda f, size=size: batched(f, args.lines, size)))
+
+    print(f'{args.lines:,} lines to {args.target}')
+    baseline = None
+    for name, run in runs:
+        # Unbuffered, so every stream.write is one write() system call
+        with open(args.target, 'wb', buffering=0) as stream:
+            started = time.perf_counter()
+            writes = run(stream)
+            seconds = time.perf_counter() - started
+        baseline = baseline or seconds
+        print(f'{name:<16} {args.lines / seconds:12,.0f} lines/s {writes:10,} writes '
+              f'{baseline / seconds:6.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
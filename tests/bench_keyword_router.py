@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark the keyword router against a linear ``includes`` scan
+
+Builds rule tables of 10, 1k and 100k synthetic keywords and routes the
+same queries through a ``KeywordRouter`` and through a scan that checks
+every rule in order, the way ``respondToUser`` does. Reports the build
+time and queries per second for both.
+
+Usage:
+    python3 tests/bench_keyword_router.py [--rules 10 1000 100000] [--queries 2000]
+"""
+
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from keyword_router import KeywordRouter
+
+WORDS = ['lys', 'kaffe', 'void', 'jester', 'kode', 'drøm', 'stjerne', 'tomrom']
+
+
+def synthetic_rules(count: int, seed: int = 0):
+    """``count`` distinct keywords, priorities shuffled, 'lys' and 'kaffe' first"""
+    rng = random.Random(seed)  # noqa: S311 - seeded benchmark data, not crypto
+    keywords = ['lys', 'kaffe']
+    seen = set(keywords)
+    while len(keywords) < count:
+        keyword = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 10)))
+        if keyword not in seen:
+            seen.add(keyword)
+            keywords.append(keyword)
+    keywords = keywords[:count]
+    priorities = list(range(count))
+    rng.shuffle(priorities)
+    return [(keyword, f'svar {i}', priorities[i]) for i, keyword in enumerate(keywords)]
+
+
+def synthetic_queries(rules, count: int, seed: int = 1):
+    """Sentences of filler words; about half contain one of the rule keywords"""
+    rng = random.Random(seed)  # noqa: S311 - seeded benchmark data, not crypto
+    queries = []
+    for _ in range(count):
+        words = rng.choices(WORDS[2:], k=rng.randint(4, 12))
+        if rng.random() < 0.5:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(rules)[0].upper())
+        queries.append(' '.join(words))
+    return queries
+
+
+class NaiveRouter:
+    """respondToUser's approach: test every rule's keyword in priority order"""
+
+    def __init__(self, rules, default=None):
+        ranked = sorted(enumerate(rules), key=lambda item: (item[1][2], item[0]))
+        self.rules = [(rule[0].lower(), rule[1]) for _, rule in ranked]
+        self.default = default
+
+    def route(self, text):
+        lower = text.lower()
+        for keyword, response in self.rules:
+            if keyword in lower:
+                return response
+        return self.default
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def route_all(router, queries):
+    return [router.route(q) for q in queries]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark keyword routing.')
+    parser.add_argument('--rules', type=int, nargs='+', default=[10, 1_000, 100_000])
+    parser.add_argument('--queries', type=int, default=2_000)
+    args = parser.parse_args(argv)
+
+    print(f'{"rules":>8} {"router":<10} {"build ms":>10} {"queries/s":>12}')
+    for count in args.rules:
+        rules = synthetic_rules(count)
+        queries = synthetic_queries(rules, args.queries)
+        automaton, automaton_build = timed(KeywordRouter, rules, default='standard')
+        naive, naive_build = timed(NaiveRouter, rules, default='standard')
+
+        routed, automaton_time = timed(route_all, automaton, queries)
+        scanned, naive_time = timed(route_all, naive, queries)
+        assert routed == scanned, 'automaton and linear scan disagree'
+
+        for name, build, seconds in (('automaton', automaton_build, automaton_time),
+                                     ('linear', naive_build, naive_time)):
+            print(f'{count:>8,} {name:<10} {build * 1000:10.1f} {len(queries) / seconds:12,.0f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Load generator for the asyncio oracle server
+
+Opens many concurrent sessions against oracle_server.py (an in-process
+server on a free port unless --port is given), has each one ask a few
+questions, and reports request latency percentiles and throughput. A
+request is one question line until the next question prompt arrives.
+
+Usage:
+    python3 tests/bench_oracle_server.py [--sessions 2000] [--questions 5]
+    python3 tests/bench_oracle_server.py --port 7777   # an already running server
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from oracle_server import ENTER_PROMPT, QUESTION_PROMPT, OracleServer
+
+QUESTIONS = ['Gi meg lys', 'kaffe, takk', 'what is the void?', 'Why 0 == "0"?']
+
+
+async def read_until(reader: asyncio.StreamReader, prompt: str) -> List[str]:
+    lines = []
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError('server closed the session')  # noqa: TRY003
+        text = line.decode('utf-8').rstrip('\n')
+        if text == prompt:
+            return lines
+        lines.append(text)
+
+
+async def session(host: str, port: int, questions: int, index: int,
+                  latencies: List[float]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        await read_until(reader, ENTER_PROMPT)
+        writer.write(b'os=linux\n')
+        await read_until(reader, QUESTION_PROMPT)
+        for q in range(questions):
+            started = time.perf_counter()
+            writer.write((QUESTIONS[(index + q) % len(QUESTIONS)] + '\n').encode('utf-8'))
+            await read_until(reader, QUESTION_PROMPT)
+            latencies.append(time.perf_counter() - started)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_load(host: str, port: int, sessions: int, questions: int,
+                   concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    limit = asyncio.Semaphore(concurrency)
+
+    async def limited(index):
+        async with limit:
+            await session(host, port, questions, index, latencies)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(limited(i) for i in range(sessions)), return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    errors = sum(isinstance(r, BaseException) for r in results)
+    return {
+        'sessions': sessions,
+        'errors': errors,
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000 if latencies else 0.0,
+        'p99_ms': percentile(latencies, 0.99) * 1000 if latencies else 0.0,
+    }
+
+
+async def bench(args) -> Dict[str, float]:
+    if args.port:
+        return await run_load(args.host, args.port, args.sessions, args.questions, args.concurrency)
+    with tempfile.TemporaryDirectory() as tmp:
+        server = OracleServer(tmp)
+        host, port = await server.start(args.host, 0)
+        try:
+            report = await run_load(host, port, args.sessions, args.questions, args.concurrency)
+        finally:
+            await server.close()
+        report['chains_written'] = server.writer.chains_written
+        report['batches'] = server.writer.batches_written
+        return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Load-test the oracle server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0, help='existing server (default: start one)')
+    parser.add_argument('--sessions', type=int, default=2000)
+    parser.add_argument('--questions', type=int, default=5, help='questions per session')
+    parser.add_argument('--concurrency', type=int, default=2000, help='sessions open at once')
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(bench(args))
+    for key, value in report.items():
+        print(f'{key:<20} {value:,.2f}' if isinstance(value, float) else f'{key:<20} {value:,}')
+    return 1 if report['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
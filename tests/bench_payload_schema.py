@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compiled error-payload validator against naive checks
+
+Builds payloads shaped like error_sorpe.JSON (a share of them broken in
+various ways) and times the compiled check function against the
+schema-walking reference validator, on parsed payloads and on a whole
+JSON-lines stream.
+
+Usage:
+    python3 tests/bench_payload_schema.py [--payloads 200000] [--invalid 0.1]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from payload_schema import (
+    ERROR_PAYLOAD_SCHEMA,
+    check_error_payload,
+    validate_naive,
+    validate_stream,
+)
+
+EXAMPLE_PATH = Path(__file__).parent.parent / 'error_sorpe.JSON'
+
+DEFECTS = [
+    lambda p: p.pop('fun_fact'),
+    lambda p: p['error'].update(code='666'),
+    lambda p: p['remedy'].append(''),
+    lambda p: p.update(remedy=[]),
+    lambda p: p['error'].pop('mood'),
+]
+
+
+def synthetic_payloads(count: int, invalid: float, seed: int = 0):
+    # Seeded for reproducible payloads
+    rng = random.Random(seed)  # noqa: S311
+    example = json.loads(EXAMPLE_PATH.read_text(encoding='utf-8'))
+    payloads = []
+    for i in range(count):
+        payload = json.loads(json.dumps(example))
+        payload['error']['code'] = i
+        if rng.random() < invalid:
+            rng.choice(DEFECTS)(payload)
+        payloads.append(payload)
+    return payloads
+
+
+def best_time(func, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark payload validation.')
+    parser.add_argument('--payloads', type=int, default=200_000)
+    parser.add_argument('--invalid', type=float, default=0.1, help='share of broken payloads')
+    args = parser.parse_args(argv)
+
+    payloads = synthetic_payloads(args.payloads, args.invalid)
+    lines = [json.dumps(p) for p in payloads]
+
+    compiled = [check_error_payload(p) for p in payloads]
+    naive = [validate_naive(ERROR_PAYLOAD_SCHEMA, p) for p in payloads]
+    assert compiled == naive, 'compiled and naive validators disagree'
+
+    timings = {
+        'naive (parsed)': best_time(lambda: [validate_naive(ERROR_PAYLOAD_SCHEMA, p) for p in payloads]),
+        'compiled (parsed)': best_time(lambda: [check_error_payload(p) for p in payloads]),
+        'compiled stream': best_time(lambda: sum(1 for _ in validate_stream(lines))),
+    }
+    print(f'{args.payloads:,} payloads, {sum(map(bool, compiled)):,} invalid')
+    for name, seconds in timings.items():
+        print(f'{name:<18} {seconds * 1000:9.1f} ms  {args.payloads / seconds:12,.0f} payloads/s')
+    print(f"speedup            {timings['naive (parsed)'] / timings['compiled (parsed)']:9.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
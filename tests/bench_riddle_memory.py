@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for parsed riddle records
+
+Builds a synthetic deck in the EDU-RIDDLES.md format and measures, with
+tracemalloc, how much memory the parsed riddles hold when stored as
+per-riddle dicts (the old layout) versus slotted ``Riddle`` records.
+
+Usage:
+    python3 tests/bench_riddle_memory.py [RIDDLE_COUNT]
+"""
+
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_riddles import synthetic_deck
+from edu_riddles import RiddleValidator
+
+
+def measure(build) -> int:
+    """Bytes still allocated by the object ``build()`` returns"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return held
+
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else 100_000
+    content = synthetic_deck(count)
+    validator = RiddleValidator(content)
+
+    records = measure(validator.get_riddles)
+    dicts = measure(lambda: [r.to_dict() for r in validator.iter_riddles()])
+
+    print(f'Riddles:          {count:,}')
+    print(f'Deck size:        {len(content) / 1e6:.1f} MB')
+    print(f'dict records:     {dicts / 1e6:.1f} MB')
+    print(f'Riddle records:   {records / 1e6:.1f} MB')
+    print(f'Reduction:        {1 - records / dicts:.0%}')
+
+
+if __name__ == '__main__':
+    main(sys.argv)
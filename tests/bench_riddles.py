@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the riddle parser and validators
+
+Generates synthetic decks in the EDU-RIDDLES.md format (10, 1k, 100k and
+1M riddles by default), times parsing, ``get_main_sections`` and the
+checks behind each test class, and records the peak RSS of each size.
+Every size runs in its own child process so peak RSS is not inherited
+from a larger deck.
+
+Results are appended to a JSON history file. Each run is compared with
+the baseline run (the latest run marked with --baseline, or the first
+run) and any timing that got slower by more than the threshold is
+flagged; the exit status is 1 when something regressed.
+
+Usage:
+    python3 tests/bench_riddles.py
+    python3 tests/bench_riddles.py --sizes 10 1000 --baseline
+    python3 tests/bench_riddles.py --history bench_history.json --threshold 0.25
+"""
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from edu_riddles import RiddleValidator
+from riddle_checks import (
+    DECK_CHECKS,
+    RIDDLE_CHECKS,
+    classify_riddles,
+)
+from riddle_generator import deck_text
+from riddle_lint import lint_lines
+
+DEFAULT_SIZES = [10, 1_000, 100_000, 1_000_000]
+DEFAULT_HISTORY = Path(__file__).parent.parent / 'bench_history.json'
+
+# Test class -> the reusable checks that implement it
+CHECK_GROUPS = {
+    'TestEduRiddlesStructure': (['sequential-numbering'], []),
+    'TestRiddleCompleteness': ([], [
+        'title', 'riddle-text', 'answer', 'learning-goal',
+        'where-to-use', 'teacher-note',
+    ]),
+    'TestRiddleContentQuality': ([], ['title-format']),
+    'TestEdgeCasesAndRobustness': (['ends-with-newline'], ['not-empty', 'riddle-length']),
+    'TestUsabilityAndAccessibility': ([], ['self-contained']),
+}
+
+
+def synthetic_deck(count: int) -> str:
+    """Build a deck with ``count`` well-formed riddles (seed 0)"""
+    return deck_text(count)
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    """Fastest of ``repeat`` runs, in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _group_runner(validator, riddles, deck_ids, riddle_ids):
+    deck_checks = [DECK_CHECKS[i] for i in deck_ids]
+    riddle_checks = [RIDDLE_CHECKS[i] for i in riddle_ids]
+
+    def run():
+        for check in deck_checks:
+            check(validator, riddles)
+        for riddle in riddles:
+            for check in riddle_checks:
+                check(riddle)
+    return run
+
+
+def bench_size(count: int) -> Dict[str, float]:
+    """Time every stage on a deck of ``count`` riddles (in this process)"""
+    repeat = 5 if count <= 10_000 else 1
+    content = synthetic_deck(count)
+    validator = RiddleValidator(content)
+    riddles = validator.get_riddles()
+
+    results = {
+        'get_riddles': best_time(validator.get_riddles, repeat),
+        'get_main_sections': best_time(validator.get_main_sections, repeat),
+    }
+    for test_class, (deck_ids, riddle_ids) in CHECK_GROUPS.items():
+        results[test_class] = best_time(
+            _group_runner(validator, riddles, deck_ids, riddle_ids), repeat
+        )
+    # Keyword checks run batched, as the test class does
+    results['TestRiddleContentQuality'] += best_time(lambda: classify_riddles(riddles), repeat)
+    lines = validator.lines
+    results['TestMarkdownFormatting'] = best_time(lambda: lint_lines(lines), repeat)
+
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results['peak_rss_mb'] = peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    return results
+
+
+def run_in_child(count: int) -> Dict[str, float]:
+    # Re-runs this script under the current interpreter
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, __file__, '--child', str(count)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def load_history(path: Path) -> List[Dict[str, Any]]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)['runs']
+    except FileNotFoundError:
+        return []
+
+
+def save_history(path: Path, runs: List[Dict[str, Any]]) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'runs': runs}, f, indent=2)
+        f.write('\n')
+
+
+def find_baseline(runs: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """The latest run marked as baseline, else the oldest run"""
+    for run in reversed(runs):
+        if run.get('baseline'):
+            return run
+    return runs[0] if runs else None
+
+
+def find_regressions(current: Dict[str, Any], baseline: Dict[str, Any],
+                     threshold: float) -> List[Dict[str, Any]]:
+    """Metrics at least ``threshold`` (a fraction) worse than the baseline"""
+    regressions = []
+    for size, metrics in current['results'].items():
+        previous = baseline['results'].get(size, {})
+        for metric, value in metrics.items():
+            before = previous.get(metric)
+            if before and value > before * (1 + threshold):
+                regressions.append({
+                    'size': size,
+                    'metric': metric,
+                    'baseline': before,
+                    'current': value,
+                    'change': value / before - 1,
+                })
+    return regressions
+
+
+def format_results(results: Dict[str, Dict[str, float]]) -> str:
+    sizes = list(results)
+    metrics = list(results[sizes[0]])
+    width = max(len(m) for m in metrics)
+    lines = [' ' * width + ''.join(f'{int(s):>14,}' for s in sizes)]
+    for metric in metrics:
+        cells = []
+        for size in sizes:
+            value = results[size][metric]
+            cells.append(f'{value:>11.1f} MB' if metric == 'peak_rss_mb' else f'{value * 1000:>11.2f} ms')
+        lines.append(metric.ljust(width) + ''.join(cells))
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the riddle parser and checks.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='riddle counts to benchmark')
+    parser.add_argument('--history', type=Path, default=DEFAULT_HISTORY,
+                        help='JSON history file (default: bench_history.json)')
+    parser.add_argument('--baseline', action='store_true',
+                        help='mark this run as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='slowdown fraction that counts as a regression (default: 0.2)')
+    parser.add_argument('--child', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child is not None:
+        print(json.dumps(bench_size(args.child)))
+        return 0
+
+    run = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'baseline': args.baseline,
+        'results': {str(size): run_in_child(size) for size in args.sizes},
+    }
+    print(format_results(run['results']))
+
+    runs = load_history(args.history)
+    baseline = None if args.baseline else find_baseline(runs)
+    runs.append(run)
+    save_history(args.history, runs)
+
+    if baseline is None:
+        print(f'\nRecorded baseline in {args.history}')
+        return 0
+    regressions = find_regressions(run, baseline, args.threshold)
+    for r in regressions:
+        print(f"REGRESSION {r['metric']} @ {int(r['size']):,} riddles: "
+              f"{r['baseline']:.4g} -> {r['current']:.4g} (+{r['change']:.0%})")
+    if not regressions:
+        print(f"\nNo regressions against baseline from {baseline['timestamp']}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the voidchain integrity verifier
+
+Writes a batch of sealed chain files shaped like the prototype's output
+to a temporary directory and times verify_files with one process and
+with a process pool, reporting chains and blocks per second.
+
+Usage:
+    python3 tests/bench_voidchain_verify.py [--chains 20000] [--blocks 3] [--jobs 1 4]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from voidchain_verify import seal_chain, verify_files
+
+
+def synthetic_chain(blocks: int, visitor: int):
+    chain = [{'block': 1, 'event': 'visitor arrived', 'os': 'linux',
+              'timestamp': '2025-06-15T23:15:01.391Z'}]
+    for n in range(2, blocks + 1):
+        chain.append({'block': n, 'event': f'requested: kaffe {visitor}',
+                      'timestamp': f'2025-06-15T23:{15 + n % 40:02d}:12.505Z'})
+    return seal_chain(chain)
+
+
+def write_chains(directory: Path, chains: int, blocks: int):
+    paths = []
+    for i in range(chains):
+        path = directory / f'voidchain_{i:08d}.json'
+        path.write_text(json.dumps(synthetic_chain(blocks, i), indent=2), encoding='utf-8')
+        paths.append(str(path))
+    return paths
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark voidchain verification.')
+    parser.add_argument('--chains', type=int, default=20_000)
+    parser.add_argument('--blocks', type=int, default=3, help='blocks per chain')
+    parser.add_argument('--jobs', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_chains(Path(tmp), args.chains, args.blocks)
+        print(f'{args.chains:,} chains x {args.blocks} blocks (cpus: {os.cpu_count()})')
+        for jobs in args.jobs:
+            started = time.perf_counter()
+            failed = sum(not report['ok'] for report in verify_files(paths, jobs, require_hashes=True))
+            elapsed = time.perf_counter() - started
+            print(f'jobs={jobs:<3} {elapsed:8.2f} s  {args.chains / elapsed:12,.0f} chains/s  '
+                  f'{args.chains * args.blocks / elapsed:12,.0f} blocks/s  failed={failed}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
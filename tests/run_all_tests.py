@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Master test runner for all test suites
+
+Runs the suites concurrently on a bounded pool of workers instead of one
+after another. Suites are started longest-first, using the durations
+recorded by previous runs (suites with no recorded duration go first),
+so total wall time approaches that of the slowest suite. Output from all
+suites is streamed as it arrives, each line prefixed with its suite's
+name, and the summary and exit status are the same as before: 0 when
+every suite passed, 1 otherwise.
+
+Usage:
+    python3 tests/run_all_tests.py [--jobs N]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).parent.parent
+DURATIONS_PATH = Path(__file__).parent / '.suite_durations.json'
+
+GREEN = '\033[0;32m'
+RED = '\033[0;31m'
+YELLOW = '\033[1;33m'
+BLUE = '\033[0;34m'
+NC = '\033[0m'
+
+# (name, command), in the order they are reported
+SUITES: List[Tuple[str, List[str]]] = [
+    # JavaScript tests
+    ('jesterLoop.js Tests', ['node', 'tests/test_jesterLoop.js']),
+    ('jesterOracle.js Tests', ['node', 'tests/test_jesterOracle.js']),
+    ('voidchain-prototype.js Tests', ['node', 'tests/test_voidchain.js']),
+    # Bash script tests
+    ('Bash Scripts Tests', ['bash', 'tests/test_bash_scripts.sh']),
+    # Python tests: every tests/test_*.py module, imported once in one process
+    ('Python Tests', [sys.executable, 'tests/run_python_tests.py']),
+]
+
+
+def load_durations(path: Path = DURATIONS_PATH) -> Dict[str, float]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_durations(durations: Dict[str, float], path: Path = DURATIONS_PATH) -> None:
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(durations, f, indent=2, sort_keys=True)
+    except OSError:
+        # Ordering hints only; a read-only checkout still runs the tests
+        pass
+
+
+def schedule(suites: List[Tuple[str, List[str]]],
+             durations: Dict[str, float]) -> List[Tuple[str, List[str]]]:
+    """Longest suites first; suites never timed before go first of all"""
+    return sorted(suites, key=lambda suite: -durations.get(suite[0], float('inf')))
+
+
+class SuiteRunner:
+    """Runs suites on a worker pool and streams their prefixed output"""
+
+    def __init__(self, suites: List[Tuple[str, List[str]]], jobs: int,
+                 cwd: Path = REPO_ROOT, out=None):
+        self.suites = suites
+        self.jobs = max(1, jobs)
+        self.cwd = cwd
+        self.out = out or sys.stdout
+        self._lock = threading.Lock()
+        self._width = max((len(name) for name, _ in suites), default=0)
+
+    def emit(self, name: Optional[str], text: str) -> None:
+        with self._lock:
+            if name is None:
+                self.out.write(text + '\n')
+            else:
+                self.out.write(f'{BLUE}[{name.ljust(self._width)}]{NC} {text}\n')
+            self.out.flush()
+
+    def run_suite(self, name: str, command: List[str]) -> Tuple[bool, float]:
+        self.emit(name, f'{YELLOW}Running: {" ".join(command)}{NC}')
+        started = time.monotonic()
+        try:
+            # Commands come from the fixed SUITES table
+            process = subprocess.Popen(  # noqa: S603
+                command, cwd=self.cwd, stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT, text=True, errors='replace',
+            )
+        except OSError as e:
+            self.emit(name, str(e))
+            passed = False
+        else:
+            for line in process.stdout:
+                self.emit(name, line.rstrip('\n'))
+            passed = process.wait() == 0
+        elapsed = time.monotonic() - started
+        if passed:
+            self.emit(name, f'{GREEN}✓ {name}: PASSED ({elapsed:.1f}s){NC}')
+        else:
+            self.emit(name, f'{RED}✗ {name}: FAILED ({elapsed:.1f}s){NC}')
+        return passed, elapsed
+
+    def run(self, durations: Dict[str, float]) -> Dict[str, Tuple[bool, float]]:
+        """Run every suite; returns name -> (passed, seconds)"""
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            futures = {
+                name: pool.submit(self.run_suite, name, command)
+                for name, command in schedule(self.suites, durations)
+            }
+            return {name: futures[name].result() for name, _ in self.suites}
+
+
+def print_summary(runner: SuiteRunner, results: Dict[str, Tuple[bool, float]],
+                  wall_time: float) -> int:
+    emit = runner.emit
+    passed = sum(1 for ok, _ in results.values() if ok)
+    failed = len(results) - passed
+
+    emit(None, '')
+    emit(None, '╔════════════════════════════════════════════════════════════╗')
+    emit(None, '║                    TEST SUITE SUMMARY                      ║')
+    emit(None, '╚════════════════════════════════════════════════════════════╝')
+    emit(None, '')
+    for name, (ok, elapsed) in results.items():
+        mark = f'{GREEN}✓' if ok else f'{RED}✗'
+        emit(None, f'{mark} {name} ({elapsed:.1f}s){NC}')
+    emit(None, '')
+    emit(None, f'Total Test Suites: {len(results)}')
+    emit(None, f'{GREEN}Passed: {passed}{NC}')
+    emit(None, f'{RED}Failed: {failed}{NC}')
+    emit(None, f'Wall time: {wall_time:.1f}s (suites total {sum(e for _, e in results.values()):.1f}s)')
+    emit(None, '')
+
+    if failed == 0:
+        emit(None, f'{GREEN}╔════════════════════════════════════════════════════════════╗{NC}')
+        emit(None, f'{GREEN}║                  ALL TESTS PASSED! 🎉                      ║{NC}')
+        emit(None, f'{GREEN}╚════════════════════════════════════════════════════════════╝{NC}')
+        return 0
+    emit(None, f'{RED}╔════════════════════════════════════════════════════════════╗{NC}')
+    emit(None, f'{RED}║              SOME TESTS FAILED - SEE ABOVE                 ║{NC}')
+    emit(None, f'{RED}╚════════════════════════════════════════════════════════════╝{NC}')
+    return 1
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Run all test suites concurrently.')
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=os.cpu_count() or 1,
+        help='suites to run at once (default: number of CPUs; 1 runs them in sequence)'
+    )
+    args = parser.parse_args(argv)
+
+    runner = SuiteRunner(SUITES, args.jobs)
+    runner.emit(None, '')
+    runner.emit(None, '╔════════════════════════════════════════════════════════════╗')
+    runner.emit(None, '║         VOID-LANGUAGE COMPREHENSIVE TEST SUITE             ║')
+    runner.emit(None, '╚════════════════════════════════════════════════════════════╝')
+    runner.emit(None, '')
+    runner.emit(None, f'Starting test execution ({runner.jobs} at a time)...')
+    runner.emit(None, '')
+
+    durations = load_durations()
+    started = time.monotonic()
+    results = runner.run(durations)
+    wall_time = time.monotonic() - started
+
+    durations.update({name: elapsed for name, (_, elapsed) in results.items()})
+    save_durations(durations)
+    return print_summary(runner, results, wall_time)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+In-process runner for all Python test modules
+
+Imports every tests/test_*.py module once into one interpreter and runs
+them as a single unittest suite, so interpreter startup and imports are
+paid once per run instead of once per module. Shared fixtures, such as
+the parsed EDU-RIDDLES.md document behind ``edu_riddles.load_document``,
+are loaded once up front and reused by every module.
+
+With ``--jobs N`` (N > 1, on platforms with fork) the test classes are
+sharded over N forked workers. The workers inherit the already imported
+modules and warm fixtures from the parent, so they start without any
+import or parse cost. Each worker records its own timings and profiles
+(see tests/suite_timing.py); the parent merges them into one report.
+
+Usage:
+    python3 tests/run_python_tests.py [-v] [--jobs N] [-k PATTERN]
+"""
+
+import argparse
+import importlib
+import io
+import multiprocessing
+import os
+import pstats
+import sys
+import tempfile
+import time
+import traceback
+import unittest
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+TESTS_DIR = Path(__file__).parent
+REPO_ROOT = TESTS_DIR.parent
+
+sys.path.insert(0, str(TESTS_DIR))
+sys.path.insert(0, str(REPO_ROOT))
+
+from edu_riddles import load_document
+from suite_timing import TIMINGS, TimingTestRunner
+
+# Keep the on-disk parse cache out of $HOME unless EDU_RIDDLES_CACHE_DIR opts in
+os.environ.setdefault('EDU_RIDDLES_CACHE_DIR', '')
+
+
+def discover_modules(pattern: str = 'test_*.py') -> List[str]:
+    return sorted(path.stem for path in TESTS_DIR.glob(pattern))
+
+
+def warm_fixtures() -> None:
+    """Load the fixtures shared across modules before any test runs"""
+    load_document(REPO_ROOT / 'EDU-RIDDLES.md')
+
+
+def failed_import(name: str, error: BaseException) -> unittest.TestCase:
+    """A test that errors with the traceback of a module that failed to import"""
+    message = f'Failed to import test module: {name}\n' + ''.join(traceback.format_exception(error))
+
+    class ModuleImportFailure(unittest.TestCase):
+        error = ImportError(message)
+
+    def test(self):
+        raise self.error
+
+    setattr(ModuleImportFailure, name, test)
+    return ModuleImportFailure(name)
+
+
+def load_suite(module_names: List[str], name_filter: Optional[str] = None) -> unittest.TestSuite:
+    """Import each module once and collect its tests
+
+    A module that fails to import, for any reason, is reported as one
+    erroring test, the way ``unittest`` reports a failed import.
+    """
+    loader = unittest.TestLoader()
+    if name_filter:
+        loader.testNamePatterns = [f'*{name_filter}*']
+    suite = unittest.TestSuite()
+    for name in module_names:
+        try:
+            module = importlib.import_module(name)
+        except Exception as e:  # noqa: BLE001 - any import failure is a test error
+            suite.addTest(failed_import(name, e))
+            continue
+        suite.addTests(loader.loadTestsFromModule(module))
+    return suite
+
+
+def iter_tests(suite: unittest.TestSuite):
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from iter_tests(test)
+        else:
+            yield test
+
+
+def shard_by_class(suite: unittest.TestSuite, shards: int) -> List[unittest.TestSuite]:
+    """Split tests into shards, keeping each test class in one shard
+
+    Keeping classes whole means each ``setUpClass`` runs once. Larger
+    classes are placed first, each onto the currently smallest shard.
+    """
+    classes: Dict[type, List[unittest.TestCase]] = {}
+    for test in iter_tests(suite):
+        classes.setdefault(type(test), []).append(test)
+
+    buckets = [[] for _ in range(shards)]
+    for tests in sorted(classes.values(), key=len, reverse=True):
+        min(buckets, key=len).extend(tests)
+    return [unittest.TestSuite(bucket) for bucket in buckets if bucket]
+
+
+# Counts summed over the workers' summaries
+_TOTALS = ('run', 'failures', 'errors', 'skipped', 'expected_failures', 'unexpected_successes')
+
+
+def _summarize(result: unittest.TestResult, output: str) -> Dict[str, Any]:
+    return {
+        'run': result.testsRun,
+        'failures': len(result.failures),
+        'errors': len(result.errors),
+        'skipped': len(result.skipped),
+        'expected_failures': len(result.expectedFailures),
+        'unexpected_successes': len(result.unexpectedSuccesses),
+        'output': output,
+    }
+
+
+def _run_shard(suite: unittest.TestSuite, verbosity: int, profile: Sequence[str],
+               profile_path: Optional[str], conn) -> None:
+    # The fork starts with a copy of the parent's timings; record this shard's alone
+    TIMINGS.reset()
+    stream = io.StringIO()
+    runner = TimingTestRunner(stream=stream, verbosity=verbosity, profile=list(profile))
+    result, profiler = runner.collect(suite)
+    if profiler is not None:
+        profiler.dump_stats(profile_path)
+    summary = _summarize(result, stream.getvalue())
+    summary['timings'] = TIMINGS.to_dict()
+    conn.send(summary)
+    conn.close()
+
+
+def run_forked(suite: unittest.TestSuite, jobs: int, verbosity: int,
+               profile: Sequence[str] = (), profile_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Run shards in forked children and collect their summaries
+
+    Each summary carries the shard's ``timings`` (``SuiteTimings.to_dict``).
+    With ``cprofile`` in ``profile``, each shard writes its stats to
+    ``profile_dir``/shard-N.prof.
+
+    Plain processes are used rather than a Pool: pool workers are
+    daemonic and could not start the processes some tests need.
+    """
+    context = multiprocessing.get_context('fork')
+    workers = []
+    for index, shard in enumerate(shard_by_class(suite, jobs)):
+        profile_path = str(Path(profile_dir, f'shard-{index}.prof')) if profile_dir else None
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=_run_shard,
+                                  args=(shard, verbosity, profile, profile_path, sender))
+        process.start()
+        sender.close()
+        workers.append((process, receiver))
+
+    summaries = []
+    for process, receiver in workers:
+        try:
+            summaries.append(receiver.recv())
+        except EOFError:
+            summaries.append({
+                'run': 0, 'failures': 0, 'errors': 1, 'skipped': 0,
+                'expected_failures': 0, 'unexpected_successes': 0,
+                'output': f'worker {process.pid} died without reporting\n',
+            })
+        process.join()
+    return summaries
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Run all Python test modules in one process.')
+    parser.add_argument('-v', '--verbose', action='store_const', const=2, default=1,
+                        dest='verbosity', help='verbose test output')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='forked workers to shard test classes over (default: 1)')
+    parser.add_argument('-k', dest='name_filter',
+                        help='only run test methods whose name contains this')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    warm_fixtures()
+    suite = load_suite(discover_modules(), args.name_filter)
+    startup = time.perf_counter() - started
+
+    runner = TimingTestRunner(verbosity=args.verbosity)
+    # An empty suite (e.g. -k matching nothing) has no shards to fork
+    if args.jobs > 1 and suite.countTestCases() and 'fork' in multiprocessing.get_all_start_methods():
+        with tempfile.TemporaryDirectory() as profile_dir:
+            summaries = run_forked(suite, args.jobs, args.verbosity, runner.profile, profile_dir)
+            for summary in summaries:
+                sys.stderr.write(summary['output'])
+                if 'timings' in summary:
+                    TIMINGS.merge(summary['timings'])
+            profiles = sorted(str(path) for path in Path(profile_dir).glob('*.prof'))
+            runner.finish(pstats.Stats(*profiles, stream=runner.stream) if profiles else None)
+        totals = {key: sum(s[key] for s in summaries) for key in _TOTALS}
+        ok = totals['failures'] == 0 and totals['errors'] == 0 and totals['unexpected_successes'] == 0
+        print(f"\nRan {totals['run']} tests in {len(summaries)} workers: "
+              f"{'OK' if ok else 'FAILED'} (failures={totals['failures']}, "
+              f"errors={totals['errors']}, skipped={totals['skipped']})", file=sys.stderr)
+    else:
+        result = runner.run(suite)
+        ok = result.wasSuccessful()
+
+    print(f'Imports and fixtures: {startup * 1000:.0f} ms, total: '
+          f'{(time.perf_counter() - started) * 1000:.0f} ms', file=sys.stderr)
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
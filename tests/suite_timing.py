@@ -0,0 +1,206 @@
+"""
+Timing and profiling instrumentation for the riddle test suite
+
+``TimingTestRunner`` is a drop-in ``unittest.TextTestRunner`` that records
+the wall time of every test and prints the slowest ones after the run.
+Work done outside test methods is attributed to named phases with
+``TIMINGS.phase(name)``: the suite times parsing EDU-RIDDLES.md as
+``parse`` and the batch checks its classes run up front as ``check``
+(test method time is added to ``check`` as well).
+
+Environment variables:
+    EDU_RIDDLES_SLOWEST=N         how many slow tests to report (default 10, 0 disables)
+    EDU_RIDDLES_TIMINGS_JSON=PATH write every timing to PATH as JSON
+    EDU_RIDDLES_PROFILE=MODES     comma-separated: ``cprofile`` profiles the
+                                  whole run (stats saved next to the JSON
+                                  export, or riddle_tests.prof), ``tracemalloc``
+                                  records each test's peak allocation
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import time
+import tracemalloc
+import unittest
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class SuiteTimings:
+    """Accumulated per-phase and per-test timings for one run"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.phases: Dict[str, float] = {}
+        self.tests: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.perf_counter() - started)
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        """Add phases and tests from another run's ``to_dict()``"""
+        for name, seconds in data['phases'].items():
+            self.add_phase(name, seconds)
+        self.tests.extend(data['tests'])
+
+    def slowest(self, count: int) -> List[Dict[str, Any]]:
+        return sorted(self.tests, key=lambda t: t['seconds'], reverse=True)[:count]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'total_seconds': sum(t['seconds'] for t in self.tests),
+            'phases': dict(self.phases),
+            'tests': list(self.tests),
+        }
+
+
+# Shared by the test modules and the runner
+TIMINGS = SuiteTimings()
+
+
+def profile_modes() -> List[str]:
+    value = os.environ.get('EDU_RIDDLES_PROFILE', '')
+    return [mode.strip().lower() for mode in value.split(',') if mode.strip()]
+
+
+class TimingTestResult(unittest.TextTestResult):
+    """Text result that also times each test (and optionally its peak memory)"""
+
+    def __init__(self, *args, timings: SuiteTimings = TIMINGS,
+                 trace_memory: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timings = timings
+        self.trace_memory = trace_memory
+        self._started = None
+        self._outcome = None
+
+    def startTest(self, test):
+        super().startTest(test)
+        self._outcome = 'passed'
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        self._started = time.perf_counter()
+
+    def stopTest(self, test):
+        seconds = time.perf_counter() - self._started
+        record = {
+            'test': test.id(),
+            'class': type(test).__name__,
+            'seconds': seconds,
+            'outcome': self._outcome,
+        }
+        if self.trace_memory:
+            record['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        self.timings.tests.append(record)
+        self.timings.add_phase('check', seconds)
+        super().stopTest(test)
+
+    def addFailure(self, test, err):
+        self._outcome = 'failed'
+        super().addFailure(test, err)
+
+    def addError(self, test, err):
+        self._outcome = 'error'
+        super().addError(test, err)
+
+    def addSubTest(self, test, subtest, err):
+        if err is not None:
+            self._outcome = 'failed'
+        super().addSubTest(test, subtest, err)
+
+    def addSkip(self, test, reason):
+        self._outcome = 'skipped'
+        super().addSkip(test, reason)
+
+
+class TimingTestRunner(unittest.TextTestRunner):
+    """TextTestRunner with timing, a slowest-N report and optional profiling"""
+
+    resultclass = TimingTestResult
+
+    def __init__(self, *args, timings: SuiteTimings = TIMINGS, slowest: Optional[int] = None,
+                 json_path: Optional[str] = None, profile: Optional[List[str]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timings = timings
+        if slowest is None:
+            slowest = int(os.environ.get('EDU_RIDDLES_SLOWEST', '10'))
+        self.slowest = slowest
+        self.json_path = json_path or os.environ.get('EDU_RIDDLES_TIMINGS_JSON')
+        self.profile = profile_modes() if profile is None else profile
+
+    def _makeResult(self):
+        return self.resultclass(
+            self.stream, self.descriptions, self.verbosity,
+            timings=self.timings, trace_memory='tracemalloc' in self.profile,
+        )
+
+    def run(self, test):
+        result, profiler = self.collect(test)
+        self.finish(pstats.Stats(profiler, stream=self.stream) if profiler else None)
+        return result
+
+    def collect(self, test) -> Tuple[unittest.TestResult, Optional[cProfile.Profile]]:
+        """Run ``test``, recording timings (and profiles) without reporting them"""
+        profiler = cProfile.Profile() if 'cprofile' in self.profile else None
+        tracing = 'tracemalloc' in self.profile and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        if profiler:
+            profiler.enable()
+        try:
+            result = super().run(test)
+        finally:
+            if profiler:
+                profiler.disable()
+            if tracing:
+                tracemalloc.stop()
+        return result, profiler
+
+    def finish(self, profile: Optional[pstats.Stats] = None) -> None:
+        """Report the collected timings and save the profile and JSON export"""
+        self.report()
+        if profile is not None:
+            self.save_profile(profile)
+        if self.json_path:
+            with open(self.json_path, 'w', encoding='utf-8') as f:
+                json.dump(self.timings.to_dict(), f, indent=2)
+                f.write('\n')
+            self.stream.writeln(f'Timings written to {self.json_path}')
+
+    def report(self) -> None:
+        phases = ', '.join(f'{name} {seconds * 1000:.1f} ms'
+                           for name, seconds in sorted(self.timings.phases.items()))
+        if phases:
+            self.stream.writeln(f'Phases: {phases}')
+        if self.slowest <= 0 or not self.timings.tests:
+            return
+        self.stream.writeln(f'Slowest {min(self.slowest, len(self.timings.tests))} tests:')
+        for record in self.timings.slowest(self.slowest):
+            line = f"  {record['seconds'] * 1000:9.2f} ms  {record['test']}"
+            if 'peak_bytes' in record:
+                line += f"  (peak {record['peak_bytes'] / 1024:.1f} KiB)"
+            self.stream.writeln(line)
+
+    def save_profile(self, stats: pstats.Stats) -> None:
+        if self.json_path:
+            path = Path(self.json_path).with_suffix('.prof')
+        else:
+            path = Path('riddle_tests.prof')
+        stats.dump_stats(path)
+        self.stream.writeln(f'cProfile stats written to {path}; top functions:')
+        stats.sort_stats('cumulative').print_stats(15)
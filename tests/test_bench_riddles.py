@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the benchmark harness in tests/bench_riddles.py
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_riddles import (
+    CHECK_GROUPS,
+    bench_size,
+    find_baseline,
+    find_regressions,
+    synthetic_deck,
+)
+from edu_riddles import RiddleValidator
+from riddle_checks import DECK_CHECKS, RIDDLE_CHECKS, all_failures
+
+
+def make_run(value, baseline=False):
+    return {'timestamp': str(value), 'baseline': baseline,
+            'results': {'10': {'get_riddles': value}}}
+
+
+class TestSyntheticDecks(unittest.TestCase):
+    """Test that generated decks are valid input for the validators"""
+    
+    def test_deck_has_requested_riddles_and_passes_checks(self):
+        content = synthetic_deck(25)
+        validator = RiddleValidator(content)
+        riddles = validator.get_riddles()
+        self.assertEqual([r.number for r in riddles], list(range(1, 26)))
+        self.assertEqual(all_failures(validator, riddles), [])
+    
+    def test_check_groups_name_real_checks(self):
+        for test_class, (deck_ids, riddle_ids) in CHECK_GROUPS.items():
+            with self.subTest(test_class=test_class):
+                self.assertTrue(set(deck_ids) <= set(DECK_CHECKS))
+                self.assertTrue(set(riddle_ids) <= set(RIDDLE_CHECKS))
+
+
+class TestBenchHistory(unittest.TestCase):
+    """Test baseline selection and regression flagging"""
+    
+    def test_bench_size_reports_every_stage(self):
+        results = bench_size(10)
+        for key in ['get_riddles', 'get_main_sections', 'TestMarkdownFormatting',
+                    'peak_rss_mb', *CHECK_GROUPS]:
+            self.assertIn(key, results)
+    
+    def test_marked_baseline_wins_over_first_run(self):
+        runs = [make_run(1.0), make_run(2.0, baseline=True), make_run(3.0)]
+        self.assertEqual(find_baseline(runs)['timestamp'], '2.0')
+        self.assertEqual(find_baseline(runs[:1])['timestamp'], '1.0')
+        self.assertIsNone(find_baseline([]))
+    
+    def test_slowdowns_over_threshold_are_flagged(self):
+        baseline = make_run(1.0)
+        self.assertEqual(find_regressions(make_run(1.1), baseline, 0.2), [])
+        (regression,) = find_regressions(make_run(1.5), baseline, 0.2)
+        self.assertEqual(regression['metric'], 'get_riddles')
+        self.assertAlmostEqual(regression['change'], 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar clickstream aggregates in clickstream_analytics.py
+"""
+
+import io
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from clickstream_analytics import (
+    ClickstreamColumns,
+    MalformedValue,
+    format_timestamp,
+    funnel_stage,
+    main,
+    parse_timestamp,
+)
+from voidchain_store import SegmentLog
+
+CLICKSTREAM_PATH = Path(__file__).parent.parent / 'orbital_clickstream.json'
+
+
+def chain(os_name, *events, hour=23):
+    blocks = []
+    for i, event in enumerate(events, 1):
+        block = {'block': i, 'event': event, 'timestamp': f'2025-06-15T{hour:02d}:0{i}:00.000Z'}
+        if i == 1:
+            block['os'] = os_name
+        blocks.append(block)
+    return blocks
+
+
+class TestClickstreamColumns(unittest.TestCase):
+    """Test column encoding and each aggregate"""
+    
+    def setUp(self):
+        self.columns = ClickstreamColumns()
+        self.columns.extend_chain('a', chain('linux', 'visitor arrived', 'initiate void entry', 'requested: kaffe'))
+        self.columns.extend_chain('b', chain('darwin', 'visitor arrived', 'initiate void entry', hour=22))
+        self.columns.extend_chain('c', chain('linux', 'visitor arrived', 'requested: lys'))
+    
+    def test_timestamps_are_epoch_milliseconds(self):
+        """Test ISO timestamps round-trip through int64 epochs"""
+        epoch = parse_timestamp('2025-06-15T23:15:01.391Z')
+        self.assertEqual(epoch, 1750029301391)
+        self.assertEqual(format_timestamp(epoch), '2025-06-15T23:15:01.391Z')
+        self.assertEqual(self.columns.timestamp.typecode, 'q')
+    
+    def test_strings_are_dictionary_encoded(self):
+        """Test that each distinct event is stored once"""
+        self.assertEqual(len(self.columns), 7)
+        self.assertEqual(len(self.columns.events.values), 5)
+        self.assertEqual(self.columns.event_counts()['visitor arrived'], 3)
+    
+    def test_os_counts_per_visitor(self):
+        """Test visitors per OS"""
+        self.assertEqual(self.columns.os_counts(), {'linux': 2, 'darwin': 1})
+    
+    def test_events_per_hour(self):
+        """Test hourly buckets"""
+        self.assertEqual(self.columns.events_per_hour(), {
+            '2025-06-15T22:00:00.000Z': 2,
+            '2025-06-15T23:00:00.000Z': 5,
+        })
+    
+    def test_funnel_requires_every_earlier_stage(self):
+        """Test that a visitor skipping a stage drops out of the funnel"""
+        self.assertEqual(funnel_stage('requested: anything'), 3)
+        self.assertEqual(funnel_stage('something else'), 0)
+        self.assertEqual(self.columns.funnel(), [
+            ('visitor arrived', 3),
+            ('initiate void entry', 2),
+            ('requested:', 1),
+        ])
+    
+    def test_loads_clickstream_files_and_segment_logs(self):
+        """Test both input shapes give the same aggregates"""
+        from_file = ClickstreamColumns.from_chain_files([CLICKSTREAM_PATH])
+        self.assertEqual(from_file.os_counts(), {'linux': 1})
+        with tempfile.TemporaryDirectory() as tmp:
+            with SegmentLog(tmp) as log:
+                log.append_chain('orbital_clickstream', [
+                    dict(block) for block in chain('linux', 'visitor arrived')
+                ])
+            from_log = ClickstreamColumns.from_segment_log(tmp)
+        self.assertEqual(from_log.funnel()[0], ('visitor arrived', 1))
+        self.assertEqual(from_file.summary()['funnel'][2], {'stage': 'requested:', 'visitors': 1})
+    
+    def test_malformed_blocks_raise_value_error(self):
+        """Test that a block with any bad field is rejected whole"""
+        before = len(self.columns)
+        for bad in ({'block': -1}, {'block': 2 ** 32}, {'block': [1]}, {'block': True},
+                    {'block': 1.9}, {'block': 1, 'event': {'x': 1}}, {'event': 7},
+                    {'os': ['linux']}, {'block': 1, 'timestamp': 1750029301391},
+                    {'block': 1, 'timestamp': 'yesterday'}):
+            with self.subTest(block=bad), self.assertRaises(MalformedValue):
+                self.columns.append('d', bad)
+        with self.assertRaises(MalformedValue):
+            self.columns.append(None, {'block': 1})
+        for column in (self.columns.chain, self.columns.block, self.columns.event,
+                       self.columns.os, self.columns.timestamp):
+            self.assertEqual(len(column), before)
+    
+    def test_cli_reports_malformed_chains(self):
+        """Test that the CLI reports a bad field instead of a traceback"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'voidchain_x.json'
+            path.write_text('[{"block": 1, "event": 7}]', encoding='utf-8')
+            stderr = io.StringIO()
+            with redirect_stderr(stderr):
+                self.assertEqual(main([str(path)]), 1)
+        self.assertIn("invalid event 7", stderr.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,88 +11,73 @@ This test suite validates:
 - Markdown syntax correctness
 """
 
+import io
+import os
+import pickle
 import re
+import sys
+import tempfile
 import unittest
 from pathlib import Path
 from typing import List, Dict, Tuple
+from unittest import mock
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
 
-class RiddleValidator:
-    """Helper class to parse and validate riddle structure"""
+from edu_riddles import (
+    RIDDLE_FIELDS,
+    CACHE_FORMAT_VERSION,
+    CACHE_MAX_ENTRIES,
+    Riddle,
+    RiddleValidator,
+    clear_document_cache,
+    iter_riddles,
+    load_document,
+)
+from riddle_checks import DECK_CHECKS, RIDDLE_CHECKS, classify_riddles
+from riddle_lint import lint_lines
+from suite_timing import TIMINGS, TimingTestRunner
+
+# Keep the on-disk parse cache out of $HOME unless EDU_RIDDLES_CACHE_DIR opts in
+os.environ.setdefault('EDU_RIDDLES_CACHE_DIR', '')
+
+RIDDLES_PATH = Path(__file__).parent.parent / 'EDU-RIDDLES.md'
+
+
+def load_riddles_document():
+    """Load EDU-RIDDLES.md (parsed once, then cached), timed as the parse phase"""
+    with TIMINGS.phase('parse'):
+        return load_document(RIDDLES_PATH)
+
+
+class RiddleCheckAssertions:
+    """Assert riddle_checks registry checks against the loaded deck"""
     
-    def __init__(self, content: str):
-        self.content = content
-        self.lines = content.split('\n')
-        
-    def get_riddles(self) -> List[Dict[str, any]]:
-        """Extract all riddles from the document"""
-        riddles = []
-        current_riddle = None
-        current_section = None
-        
-        for i, line in enumerate(self.lines, 1):
-            # Match riddle headers (## N) ...)
-            riddle_match = re.match(r'^## (\d+)\) (.+)$', line)
-            if riddle_match:
-                if current_riddle:
-                    riddles.append(current_riddle)
-                current_riddle = {
-                    'number': int(riddle_match.group(1)),
-                    'title': riddle_match.group(2),
-                    'line_number': i,
-                    'riddle_text': [],
-                    'answer': None,
-                    'learning_goal': None,
-                    'where_to_use': None,
-                    'teacher_note': None,
-                }
-                current_section = None
-                continue
-            
-            if current_riddle and line.strip():
-                # Detect sections
-                if line.startswith('Riddle:'):
-                    current_section = 'riddle_text'
-                elif line.startswith('Answer:'):
-                    current_riddle['answer'] = line.replace('Answer:', '').strip()
-                    current_section = None
-                elif line.startswith('Learning goal:'):
-                    current_riddle['learning_goal'] = line.replace('Learning goal:', '').strip()
-                    current_section = None
-                elif line.startswith('Where to use:'):
-                    current_riddle['where_to_use'] = line.replace('Where to use:', '').strip()
-                    current_section = None
-                elif line.startswith('Teacher note:'):
-                    current_riddle['teacher_note'] = line.replace('Teacher note:', '').strip()
-                    current_section = None
-                elif current_section == 'riddle_text' and not line.startswith('---'):
-                    current_riddle['riddle_text'].append(line)
-        
-        if current_riddle:
-            riddles.append(current_riddle)
-        
-        return riddles
+    def assert_riddle_check(self, check_id):
+        """Assert the riddle_checks check ``check_id`` passes for every riddle"""
+        check = RIDDLE_CHECKS[check_id]
+        for riddle in self.riddles:
+            with self.subTest(riddle_number=riddle['number']):
+                message = check(riddle)
+                self.assertIsNone(message, message)
     
-    def get_main_sections(self) -> List[str]:
-        """Extract main document sections (# headers)"""
-        sections = []
-        for line in self.lines:
-            if line.startswith('# '):
-                sections.append(line[2:].strip())
-        return sections
+    def assert_deck_check(self, check_id):
+        """Assert the riddle_checks deck check ``check_id`` passes"""
+        messages = DECK_CHECKS[check_id](self.validator, self.riddles)
+        self.assertEqual(messages, [], '\n'.join(messages))
 
 
-class TestEduRiddlesStructure(unittest.TestCase):
+class TestEduRiddlesStructure(RiddleCheckAssertions, unittest.TestCase):
     """Test the overall document structure"""
     
     @classmethod
     def setUpClass(cls):
         """Load the EDU-RIDDLES.md file once for all tests"""
-        riddles_path = Path(__file__).parent.parent / 'EDU-RIDDLES.md'
-        with open(riddles_path, 'r', encoding='utf-8') as f:
-            cls.content = f.read()
-        cls.validator = RiddleValidator(cls.content)
-        cls.riddles = cls.validator.get_riddles()
+        document = load_riddles_document()
+        cls.content = document.content
+        cls.validator = document.validator
+        cls.riddles = document.riddles
     
     def test_file_exists_and_readable(self):
         """Test that EDU-RIDDLES.md exists and is readable"""
@@ -149,13 +134,7 @@ class TestEduRiddlesStructure(unittest.TestCase):
     
     def test_riddles_are_numbered_sequentially(self):
         """Test that riddles are numbered 1-10 in order"""
-        expected_numbers = list(range(1, 11))
-        actual_numbers = [r['number'] for r in self.riddles]
-        self.assertEqual(
-            actual_numbers,
-            expected_numbers,
-            "Riddles should be numbered 1-10 in sequential order"
-        )
+        self.assert_deck_check('sequential-numbering')
     
     def test_riddles_separated_by_horizontal_rules(self):
         """Test that riddles are separated by horizontal rules (---)"""
@@ -168,225 +147,114 @@ class TestEduRiddlesStructure(unittest.TestCase):
         )
 
 
-class TestRiddleCompleteness(unittest.TestCase):
+class TestRiddleCompleteness(RiddleCheckAssertions, unittest.TestCase):
     """Test that each riddle has all required components"""
     
     @classmethod
     def setUpClass(cls):
         """Load riddles for testing"""
-        riddles_path = Path(__file__).parent.parent / 'EDU-RIDDLES.md'
-        with open(riddles_path, 'r', encoding='utf-8') as f:
-            cls.content = f.read()
-        cls.validator = RiddleValidator(cls.content)
-        cls.riddles = cls.validator.get_riddles()
+        document = load_riddles_document()
+        cls.content = document.content
+        cls.validator = document.validator
+        cls.riddles = document.riddles
     
     def test_all_riddles_have_titles(self):
         """Test that all riddles have descriptive titles"""
-        for riddle in self.riddles:
-            with self.subTest(riddle_number=riddle['number']):
-                self.assertIsNotNone(riddle['title'], 
-                    f"Riddle {riddle['number']} should have a title")
-                self.assertGreater(len(riddle['title']), 5,
-                    f"Riddle {riddle['number']} title should be descriptive")
+        self.assert_riddle_check('title')
     
     def test_all_riddles_have_riddle_text(self):
-        """Test that all riddles have riddle text"""
-        for riddle in self.riddles:
-            with self.subTest(riddle_number=riddle['number']):
-                self.assertGreater(
-                    len(riddle['riddle_text']),
-                    0,
-                    f"Riddle {riddle['number']} should have riddle text"
-                )
-                # Riddle text should be in quotes
-                riddle_full = '\n'.join(riddle['riddle_text'])
-                self.assertTrue(
-                    '"' in riddle_full,
-                    f"Riddle {riddle['number']} text should be in quotes"
-                )
+        """Test that all riddles have riddle text, in quotes"""
+        self.assert_riddle_check('riddle-text')
     
     def test_all_riddles_have_answers(self):
         """Test that all riddles have answers"""
-        for riddle in self.riddles:
-            with self.subTest(riddle_number=riddle['number']):
-                self.assertIsNotNone(
-                    riddle['answer'],
-                    f"Riddle {riddle['number']} should have an answer"
-                )
-                self.assertGreater(
-                    len(riddle['answer']),
-                    3,
-                    f"Riddle {riddle['number']} answer should be substantive"
-                )
+        self.assert_riddle_check('answer')
     
     def test_all_riddles_have_learning_goals(self):
         """Test that all riddles have learning goals"""
-        for riddle in self.riddles:
-            with self.subTest(riddle_number=riddle['number']):
-                self.assertIsNotNone(
-                    riddle['learning_goal'],
-                    f"Riddle {riddle['number']} should have a learning goal"
-                )
-                self.assertGreater(
-                    len(riddle['learning_goal']),
-                    10,
-                    f"Riddle {riddle['number']} learning goal should be descriptive"
-                )
+        self.assert_riddle_check('learning-goal')
     
     def test_all_riddles_have_usage_context(self):
         """Test that all riddles have 'Where to use' context"""
-        for riddle in self.riddles:
-            with self.subTest(riddle_number=riddle['number']):
-                self.assertIsNotNone(
-                    riddle['where_to_use'],
-                    f"Riddle {riddle['number']} should have usage context"
-                )
-                self.assertGreater(
-                    len(riddle['where_to_use']),
-                    5,
-                    f"Riddle {riddle['number']} usage context should be specific"
-                )
+        self.assert_riddle_check('where-to-use')
     
     def test_all_riddles_have_teacher_notes(self):
         """Test that all riddles have teacher notes"""
-        for riddle in self.riddles:
-            with self.subTest(riddle_number=riddle['number']):
-                self.assertIsNotNone(
-                    riddle['teacher_note'],
-                    f"Riddle {riddle['number']} should have teacher notes"
-                )
-                self.assertGreater(
-                    len(riddle['teacher_note']),
-                    10,
-                    f"Riddle {riddle['number']} teacher note should be helpful"
-                )
+        self.assert_riddle_check('teacher-note')
 
 
-class TestRiddleContentQuality(unittest.TestCase):
+class TestRiddleContentQuality(RiddleCheckAssertions, unittest.TestCase):
     """Test the quality and consistency of riddle content"""
     
     @classmethod
     def setUpClass(cls):
         """Load riddles for testing"""
-        riddles_path = Path(__file__).parent.parent / 'EDU-RIDDLES.md'
-        with open(riddles_path, 'r', encoding='utf-8') as f:
-            cls.content = f.read()
-        cls.validator = RiddleValidator(cls.content)
-        cls.riddles = cls.validator.get_riddles()
+        document = load_riddles_document()
+        cls.content = document.content
+        cls.validator = document.validator
+        cls.riddles = document.riddles
+        # All keyword checks for all riddles, in one batched call
+        with TIMINGS.phase('check'):
+            cls.keywords = classify_riddles(cls.riddles)
     
     def test_riddle_titles_follow_format(self):
         """Test that riddle titles follow the format: 'Category — "Name"'"""
-        for riddle in self.riddles:
-            with self.subTest(riddle_number=riddle['number']):
-                title = riddle['title']
-                # Should contain an em dash or regular dash
-                self.assertTrue(
-                    '—' in title or '–' in title or ' - ' in title,
-                    f"Riddle {riddle['number']} title should contain a separator"
-                )
-                # Should contain quoted name
-                self.assertIn(
-                    '"',
-                    title,
-                    f"Riddle {riddle['number']} title should have a quoted name"
-                )
+        self.assert_riddle_check('title-format')
     
     def test_riddles_reference_void_or_wimp(self):
         """Test that riddles reference Void-Language or WIMP appropriately"""
-        for riddle in self.riddles:
-            with self.subTest(riddle_number=riddle['number']):
-                full_text = (
-                    riddle['title'] + ' ' +
-                    '\n'.join(riddle['riddle_text']) + ' ' +
-                    (riddle['answer'] or '') + ' ' +
-                    (riddle['learning_goal'] or '')
-                ).lower()
-                
-                # Should mention void, wimp, or related concepts
-                relevant_terms = [
-                    'void', 'wimp', 'interpreter', 'language',
-                    'compiler', 'docs', 'manual', 'roff'
-                ]
-                has_relevant_term = any(term in full_text for term in relevant_terms)
-                self.assertTrue(
-                    has_relevant_term,
-                    f"Riddle {riddle['number']} should reference project concepts"
-                )
+        # Should mention void, wimp, or related concepts
+        self.assert_keyword_check(
+            'project-reference', "should reference project concepts"
+        )
     
     def test_learning_goals_are_actionable(self):
         """Test that learning goals use actionable verbs"""
-        actionable_verbs = [
-            'introduce', 'teach', 'encourage', 'show', 'explain',
-            'help', 'demonstrate', 'guide', 'create', 'make',
-            'provide', 'give', 'frame', 'present'
-        ]
-        
-        for riddle in self.riddles:
-            with self.subTest(riddle_number=riddle['number']):
-                learning_goal = (riddle['learning_goal'] or '').lower()
-                has_actionable_verb = any(
-                    verb in learning_goal for verb in actionable_verbs
-                )
-                self.assertTrue(
-                    has_actionable_verb,
-                    f"Riddle {riddle['number']} learning goal should use actionable verbs"
-                )
+        self.assert_keyword_check(
+            'actionable-learning-goal', "learning goal should use actionable verbs"
+        )
     
     def test_teacher_notes_provide_guidance(self):
         """Test that teacher notes provide practical guidance"""
-        guidance_indicators = [
-            'provide', 'include', 'add', 'show', 'give',
-            'follow', 'link', 'append', 'keep', 'ensure'
-        ]
-        
-        for riddle in self.riddles:
-            with self.subTest(riddle_number=riddle['number']):
-                teacher_note = (riddle['teacher_note'] or '').lower()
-                has_guidance = any(
-                    indicator in teacher_note for indicator in guidance_indicators
-                )
-                self.assertTrue(
-                    has_guidance,
-                    f"Riddle {riddle['number']} teacher note should provide guidance"
-                )
+        self.assert_keyword_check(
+            'teacher-guidance', "teacher note should provide guidance"
+        )
     
     def test_where_to_use_specifies_concrete_locations(self):
         """Test that 'Where to use' specifies concrete locations"""
-        location_patterns = [
-            r'readme', r'issue', r'pr', r'contributing',
-            r'workshop', r'demo', r'tweet', r'discussion',
-            r'doc', r'header', r'template', r'slide'
-        ]
-        
-        for riddle in self.riddles:
+        self.assert_keyword_check(
+            'concrete-location', "should specify concrete usage locations"
+        )
+    
+    def assert_keyword_check(self, check_id, message):
+        """Assert one keyword check passed for every riddle"""
+        for riddle, keywords in zip(self.riddles, self.keywords, strict=True):
             with self.subTest(riddle_number=riddle['number']):
-                where_to_use = (riddle['where_to_use'] or '').lower()
-                has_location = any(
-                    re.search(pattern, where_to_use) for pattern in location_patterns
-                )
                 self.assertTrue(
-                    has_location,
-                    f"Riddle {riddle['number']} should specify concrete usage locations"
+                    keywords[check_id],
+                    f"Riddle {riddle['number']} {message}"
                 )
 
 
 class TestMarkdownFormatting(unittest.TestCase):
-    """Test markdown formatting and syntax"""
+    """Test markdown formatting and syntax
+    
+    All rules run in a single sweep of the document (see riddle_lint.py);
+    each test reports the findings of its rule.
+    """
     
     @classmethod
     def setUpClass(cls):
-        """Load content for testing"""
-        riddles_path = Path(__file__).parent.parent / 'EDU-RIDDLES.md'
-        with open(riddles_path, 'r', encoding='utf-8') as f:
-            cls.content = f.read()
-        cls.lines = cls.content.split('\n')
+        """Load content and lint it once for all tests"""
+        document = load_riddles_document()
+        cls.content = document.content
+        cls.lines = document.lines
+        with TIMINGS.phase('check'):
+            cls.lint = lint_lines(cls.lines)
     
     def test_no_trailing_whitespace(self):
         """Test that lines don't have trailing whitespace"""
-        lines_with_trailing = [
-            (i+1, line) for i, line in enumerate(self.lines)
-            if line.rstrip() != line and line.strip()  # Ignore empty lines
-        ]
+        lines_with_trailing = self.lint['trailing-whitespace'].findings
         self.assertEqual(
             len(lines_with_trailing),
             0,
@@ -395,48 +263,25 @@ class TestMarkdownFormatting(unittest.TestCase):
     
     def test_consistent_header_spacing(self):
         """Test that headers have consistent spacing"""
-        for i, line in enumerate(self.lines):
-            if line.startswith('#'):
-                with self.subTest(line_number=i+1):
-                    # Headers should have space after #
-                    self.assertTrue(
-                        line.startswith('# ') or line.startswith('## '),
-                        f"Line {i+1}: Headers should have space after # symbol"
-                    )
+        for line_number, _line in self.lint['header-spacing'].findings:
+            with self.subTest(line_number=line_number):
+                # Headers should have space after #
+                self.fail(f"Line {line_number}: Headers should have space after # symbol")
     
     def test_horizontal_rules_are_consistent(self):
         """Test that horizontal rules use consistent format"""
-        hr_lines = [
-            (i+1, line) for i, line in enumerate(self.lines)
-            if line.strip() in ['---', '***', '___']
-        ]
-        
-        if hr_lines:
-            # Get the most common format
-            formats = [line for _, line in hr_lines]
-            most_common = max(set(formats), key=formats.count)
-            
-            # All should use the same format
-            inconsistent = [(num, line) for num, line in hr_lines if line != most_common]
-            self.assertEqual(
-                len(inconsistent),
-                0,
-                f"Horizontal rules should be consistent. Found: {inconsistent}"
-            )
+        inconsistent = self.lint['horizontal-rules'].findings
+        self.assertEqual(
+            len(inconsistent),
+            0,
+            f"Horizontal rules should be consistent. Found: {inconsistent}"
+        )
     
     def test_no_multiple_blank_lines(self):
         """Test that there are no multiple consecutive blank lines"""
-        consecutive_blanks = []
-        blank_count = 0
-        
-        for i, line in enumerate(self.lines):
-            if not line.strip():
-                blank_count += 1
-                if blank_count > 2:
-                    consecutive_blanks.append(i+1)
-            else:
-                blank_count = 0
-        
+        consecutive_blanks = [
+            line_number for line_number, _ in self.lint['multiple-blank-lines'].findings
+        ]
         self.assertEqual(
             len(consecutive_blanks),
             0,
@@ -445,103 +290,43 @@ class TestMarkdownFormatting(unittest.TestCase):
     
     def test_html_entities_are_properly_escaped(self):
         """Test that HTML entities like &amp; are properly used"""
-        # Find all HTML entities
-        html_entity_pattern = r'&[a-z]+;'
-        entities = re.findall(html_entity_pattern, self.content)
-        
-        # Common valid entities
-        valid_entities = ['&amp;', '&lt;', '&gt;', '&quot;', '&apos;']
-        
-        for entity in entities:
+        for _, entity in self.lint['html-entities'].findings:
             with self.subTest(entity=entity):
-                self.assertIn(
-                    entity,
-                    valid_entities,
-                    f"HTML entity {entity} should be valid"
-                )
+                self.fail(f"HTML entity {entity} should be valid")
     
     def test_consistent_list_formatting(self):
         """Test that lists use consistent bullet formatting"""
-        list_items = [
-            (i+1, line) for i, line in enumerate(self.lines)
-            if re.match(r'^\s*[-*+]\s', line)
-        ]
-        
-        if list_items:
-            # Extract bullet types
-            bullets = [re.match(r'^\s*([-*+])', line).group(1) 
-                      for _, line in list_items]
-            most_common = max(set(bullets), key=bullets.count)
-            
-            # Check consistency
-            inconsistent = [
-                (num, line) for (num, line), bullet in zip(list_items, bullets)
-                if bullet != most_common
-            ]
-            
-            # Allow some flexibility, but most should be consistent
-            consistency_ratio = 1 - (len(inconsistent) / len(list_items))
-            self.assertGreater(
-                consistency_ratio,
-                0.8,
-                f"List bullets should be mostly consistent. Found mixed: {inconsistent[:5]}"
-            )
+        bullets = self.lint['list-bullets']
+        # Allow some flexibility, but most should be consistent
+        self.assertTrue(
+            bullets.ok,
+            f"List bullets should be mostly consistent. Found mixed: {bullets.findings[:5]}"
+        )
 
 
-class TestEdgeCasesAndRobustness(unittest.TestCase):
+class TestEdgeCasesAndRobustness(RiddleCheckAssertions, unittest.TestCase):
     """Test edge cases and document robustness"""
     
     @classmethod
     def setUpClass(cls):
         """Load content for testing"""
-        riddles_path = Path(__file__).parent.parent / 'EDU-RIDDLES.md'
-        with open(riddles_path, 'r', encoding='utf-8') as f:
-            cls.content = f.read()
-        cls.validator = RiddleValidator(cls.content)
-        cls.riddles = cls.validator.get_riddles()
+        document = load_riddles_document()
+        cls.content = document.content
+        cls.validator = document.validator
+        cls.riddles = document.riddles
     
     def test_file_ends_with_newline(self):
         """Test that file ends with a newline character"""
-        self.assertTrue(
-            self.content.endswith('\n'),
-            "File should end with a newline character"
-        )
+        self.assert_deck_check('ends-with-newline')
     
     def test_no_riddle_is_empty(self):
         """Test that no riddle section is completely empty"""
-        for riddle in self.riddles:
-            with self.subTest(riddle_number=riddle['number']):
-                total_content = (
-                    len(riddle['riddle_text']) +
-                    len(riddle['answer'] or '') +
-                    len(riddle['learning_goal'] or '') +
-                    len(riddle['where_to_use'] or '') +
-                    len(riddle['teacher_note'] or '')
-                )
-                self.assertGreater(
-                    total_content,
-                    50,
-                    f"Riddle {riddle['number']} should have substantial content"
-                )
+        self.assert_riddle_check('not-empty')
     
     def test_riddles_have_reasonable_length(self):
         """Test that riddles are not too short or excessively long"""
-        for riddle in self.riddles:
-            with self.subTest(riddle_number=riddle['number']):
-                riddle_text = '\n'.join(riddle['riddle_text'])
-                char_count = len(riddle_text)
-                
-                # Riddle text should be between 20 and 500 characters
-                self.assertGreater(
-                    char_count,
-                    20,
-                    f"Riddle {riddle['number']} text seems too short"
-                )
-                self.assertLess(
-                    char_count,
-                    500,
-                    f"Riddle {riddle['number']} text seems too long"
-                )
+        # Riddle text should be between 20 and 500 characters
+        self.assert_riddle_check('riddle-length')
     
     def test_special_characters_are_handled(self):
         """Test that special characters in riddles are properly formatted"""
@@ -602,17 +387,16 @@ class TestEdgeCasesAndRobustness(unittest.TestCase):
                 pass  # This is a softer check
 
 
-class TestUsabilityAndAccessibility(unittest.TestCase):
+class TestUsabilityAndAccessibility(RiddleCheckAssertions, unittest.TestCase):
     """Test document usability and accessibility"""
     
     @classmethod
     def setUpClass(cls):
         """Load content for testing"""
-        riddles_path = Path(__file__).parent.parent / 'EDU-RIDDLES.md'
-        with open(riddles_path, 'r', encoding='utf-8') as f:
-            cls.content = f.read()
-        cls.validator = RiddleValidator(cls.content)
-        cls.riddles = cls.validator.get_riddles()
+        document = load_riddles_document()
+        cls.content = document.content
+        cls.validator = document.validator
+        cls.riddles = document.riddles
     
     def test_riddles_have_clear_structure(self):
         """Test that each riddle follows a predictable structure"""
@@ -651,23 +435,251 @@ class TestUsabilityAndAccessibility(unittest.TestCase):
     
     def test_riddles_are_self_contained(self):
         """Test that riddles can be understood independently"""
+        # The answer shares a term with the riddle or explains itself
+        self.assert_riddle_check('self-contained')
+
+
+class TestStreamingTokenizer(unittest.TestCase):
+    """Test the streaming riddle tokenizer"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Load content for testing"""
+        cls.content = load_riddles_document().content
+    
+    def test_file_object_matches_string_parse(self):
+        """Test that streaming a file object yields the same riddles"""
+        expected = RiddleValidator(self.content).get_riddles()
+        with open(RIDDLES_PATH, 'r', encoding='utf-8') as f:
+            streamed = list(iter_riddles(f))
+        self.assertEqual(streamed, expected)
+    
+    def test_riddles_are_yielded_incrementally(self):
+        """Test that a riddle is yielded once the next header is seen"""
+        consumed = []
+        
+        def lines():
+            for line in io.StringIO(self.content):
+                consumed.append(line)
+                yield line
+        
+        first = next(iter_riddles(lines()))
+        self.assertEqual(first['number'], 1)
+        self.assertLess(
+            len(consumed),
+            len(self.content.split('\n')) // 2,
+            "Tokenizer should not read ahead past the second riddle header"
+        )
+    
+    def test_field_values_and_riddle_text(self):
+        """Test field extraction on a minimal deck"""
+        deck = [
+            '## 3) Demo — "Tiny"',
+            'Riddle:',
+            '"What am I?"',
+            '',
+            'Answer: A test',
+            'Teacher note: Keep it short.',
+            '---',
+            'ignored trailing text',
+        ]
+        (riddle,) = iter_riddles(deck)
+        self.assertEqual(riddle['number'], 3)
+        self.assertEqual(riddle['title'], 'Demo — "Tiny"')
+        self.assertEqual(riddle['line_number'], 1)
+        self.assertEqual(riddle['riddle_text'], ['"What am I?"'])
+        self.assertEqual(riddle['answer'], 'A test')
+        self.assertEqual(riddle['teacher_note'], 'Keep it short.')
+        self.assertIsNone(riddle['learning_goal'])
+
+
+class TestDocumentCache(unittest.TestCase):
+    """Test the shared in-process and on-disk document caches"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(clear_document_cache)
+        self.cache_dir = Path(self.tmp.name) / 'cache'
+        self.deck = Path(self.tmp.name) / 'deck.md'
+        # Copied straight from disk, so the shared parse of the real deck is untouched
+        self.deck.write_text(
+            RIDDLES_PATH.read_text(encoding='utf-8'), encoding='utf-8'
+        )
+    
+    def test_document_is_parsed_once_per_process(self):
+        """Test that repeated loads share one parsed document"""
+        first = load_document(self.deck, cache_dir=self.cache_dir)
+        second = load_document(self.deck, cache_dir=self.cache_dir)
+        self.assertIs(first, second)
+    
+    def test_changed_file_is_reloaded(self):
+        """Test that a size or mtime change invalidates the shared parse"""
+        first = load_document(self.deck, cache_dir=None)
+        with open(self.deck, 'a', encoding='utf-8') as f:
+            f.write('\n## 11) Extra — "Late"\n')
+        second = load_document(self.deck, cache_dir=None)
+        self.assertIsNot(first, second)
+        self.assertEqual(len(second.riddles), len(first.riddles) + 1)
+    
+    def test_disk_cache_skips_parsing(self):
+        """Test that unchanged content is served from the on-disk cache"""
+        expected = load_document(self.deck, cache_dir=self.cache_dir).riddles
+        self.assertEqual(len(list(self.cache_dir.iterdir())), 1)
+        clear_document_cache()
+        with mock.patch('edu_riddles._tokenize', side_effect=AssertionError):
+            cached = load_document(self.deck, cache_dir=self.cache_dir).riddles
+        self.assertEqual(cached, expected)
+    
+    def test_corrupt_cache_entry_is_reparsed(self):
+        """Test that an unreadable cache entry falls back to parsing"""
+        expected = load_document(self.deck, cache_dir=self.cache_dir).riddles
+        for entry in self.cache_dir.iterdir():
+            entry.write_text('{not json', encoding='utf-8')
+        clear_document_cache()
+        self.assertEqual(
+            load_document(self.deck, cache_dir=self.cache_dir).riddles,
+            expected
+        )
+    
+    def test_stale_and_old_entries_are_removed(self):
+        """Test that a write drops other versions and the least recently used"""
+        self.cache_dir.mkdir()
+        stale = self.cache_dir / f'v{CACHE_FORMAT_VERSION - 1}-{"0" * 64}.json'
+        stale.write_text('[]', encoding='utf-8')
+        old = []
+        for i in range(CACHE_MAX_ENTRIES):
+            entry = self.cache_dir / f'v{CACHE_FORMAT_VERSION}-{i:064x}.json'
+            entry.write_text('[]', encoding='utf-8')
+            os.utime(entry, ns=(i * 10**9, i * 10**9))
+            old.append(entry)
+        load_document(self.deck, cache_dir=self.cache_dir)
+        entries = set(self.cache_dir.iterdir())
+        self.assertEqual(len(entries), CACHE_MAX_ENTRIES)
+        self.assertNotIn(stale, entries)
+        self.assertNotIn(old[0], entries)
+        self.assertTrue(set(old[1:]) <= entries)
+    
+    def test_cache_hit_marks_entry_recently_used(self):
+        """Test that reading an entry protects it from the next pruning"""
+        load_document(self.deck, cache_dir=self.cache_dir)
+        entry, = self.cache_dir.iterdir()
+        os.utime(entry, ns=(0, 0))
+        clear_document_cache()
+        load_document(self.deck, cache_dir=self.cache_dir)
+        self.assertGreater(entry.stat().st_mtime_ns, 0)
+
+
+class TestRiddleRecord(unittest.TestCase):
+    """Test the compact riddle record type"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Load riddles for testing"""
+        document = load_riddles_document()
+        cls.content = document.content
+        cls.riddles = document.riddles
+    
+    def test_records_are_slotted_riddles(self):
+        """Test that parsed riddles are Riddle records without a __dict__"""
         for riddle in self.riddles:
-            with self.subTest(riddle_number=riddle['number']):
-                # Answer should relate to riddle
-                answer = (riddle['answer'] or '').lower()
-                riddle_text = '\n'.join(riddle['riddle_text']).lower()
-                
-                # They should share some common concepts
-                # Extract key nouns/terms from answer
-                answer_words = set(re.findall(r'\b[a-z]{4,}\b', answer))
-                riddle_words = set(re.findall(r'\b[a-z]{4,}\b', riddle_text))
-                
-                # Should have some overlap or clear connection
-                overlap = answer_words & riddle_words
-                self.assertTrue(
-                    len(overlap) > 0 or len(answer) > 10,
-                    f"Riddle {riddle['number']} answer should relate to riddle text"
-                )
+            with self.subTest(riddle_number=riddle.number):
+                self.assertIsInstance(riddle, Riddle)
+                self.assertFalse(hasattr(riddle, '__dict__'))
+    
+    def test_records_are_immutable(self):
+        """Test that fields cannot be reassigned"""
+        with self.assertRaises(AttributeError):
+            self.riddles[0].answer = 'something else'
+    
+    def test_subscript_matches_attributes(self):
+        """Test that riddle['field'] reads the same value as the attribute"""
+        riddle = self.riddles[0]
+        for field in RIDDLE_FIELDS:
+            with self.subTest(field=field):
+                self.assertEqual(riddle[field], getattr(riddle, field))
+        with self.assertRaises(KeyError):
+            riddle['_source']
+    
+    def test_riddle_text_is_sliced_from_content(self):
+        """Test that riddle text lines come from offsets into the document"""
+        riddle = self.riddles[0]
+        self.assertIs(riddle._source, self.content)
+        for line in riddle.riddle_text:
+            self.assertIn(line, self.content)
+    
+    def test_dict_round_trip_and_pickle(self):
+        """Test conversion to and from dicts and pickling"""
+        for riddle in self.riddles:
+            with self.subTest(riddle_number=riddle.number):
+                self.assertEqual(Riddle.from_dict(riddle.to_dict()), riddle)
+                # Round-trips our own pickle, never untrusted data
+                self.assertEqual(pickle.loads(pickle.dumps(riddle)), riddle)  # noqa: S301
+
+
+class TestMemoryMappedLoading(unittest.TestCase):
+    """Test memory-mapped, bytes-level document loading"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Load the document both ways"""
+        cls.text_validator = RiddleValidator.from_file(RIDDLES_PATH)
+        cls.mapped_validator = RiddleValidator.from_file(RIDDLES_PATH, use_mmap=True)
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.mapped_validator.close()
+    
+    def test_mapped_riddles_match_text_riddles(self):
+        """Test that scanning the mapping as bytes yields the same riddles"""
+        self.assertEqual(
+            self.mapped_validator.get_riddles(),
+            self.text_validator.get_riddles()
+        )
+    
+    def test_mapped_lines_and_sections_match(self):
+        """Test that lazy line access agrees with the text document"""
+        self.assertEqual(
+            list(self.mapped_validator.iter_lines()),
+            self.text_validator.lines
+        )
+        self.assertEqual(
+            self.mapped_validator.get_main_sections(),
+            self.text_validator.get_main_sections()
+        )
+    
+    def test_line_views_are_zero_copy(self):
+        """Test that line views are memoryviews over the mapping"""
+        views = self.mapped_validator.iter_line_views()
+        first = next(views)
+        self.assertIsInstance(first, memoryview)
+        self.assertTrue(bytes(first).startswith(b'# Riddling'))
+        first.release()
+        views.close()
+    
+    def test_empty_file_can_be_mapped(self):
+        """Test that an empty file does not break mapped loading"""
+        with tempfile.TemporaryDirectory() as tmp:
+            empty = Path(tmp) / 'empty.md'
+            empty.write_bytes(b'')
+            with RiddleValidator.from_file(empty, use_mmap=True) as validator:
+                self.assertEqual(validator.get_riddles(), [])
+                self.assertEqual(validator.lines, [''])
+    
+    def test_crlf_deck_parses_the_same_both_ways(self):
+        """Test that CRLF newlines and Unicode-blank lines parse alike in both modes"""
+        content = RIDDLES_PATH.read_text(encoding='utf-8')
+        # A line holding only a no-break space is blank to str.strip
+        content = content.replace('Riddle:\n', 'Riddle:\n\u00a0\n', 1)
+        with tempfile.TemporaryDirectory() as tmp:
+            deck = Path(tmp) / 'crlf.md'
+            deck.write_bytes(content.replace('\n', '\r\n').encode('utf-8'))
+            text_validator = RiddleValidator.from_file(deck)
+            with RiddleValidator.from_file(deck, use_mmap=True) as validator:
+                riddles = validator.get_riddles()
+                self.assertEqual(riddles, text_validator.get_riddles())
+                self.assertEqual(riddles, RiddleValidator(content).get_riddles())
+                self.assertEqual(list(validator.iter_lines()), text_validator.lines)
 
 
 def run_tests():
@@ -683,9 +695,14 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestMarkdownFormatting))
     suite.addTests(loader.loadTestsFromTestCase(TestEdgeCasesAndRobustness))
     suite.addTests(loader.loadTestsFromTestCase(TestUsabilityAndAccessibility))
-    
-    # Run tests with verbose output
-    runner = unittest.TextTestRunner(verbosity=2)
+    suite.addTests(loader.loadTestsFromTestCase(TestStreamingTokenizer))
+    suite.addTests(loader.loadTestsFromTestCase(TestDocumentCache))
+    suite.addTests(loader.loadTestsFromTestCase(TestRiddleRecord))
+    suite.addTests(loader.loadTestsFromTestCase(TestMemoryMappedLoading))
+    
+    # Run tests with verbose output, per-test timing and the slowest-N report
+    # (see tests/suite_timing.py for the profiling environment variables)
+    runner = TimingTestRunner(verbosity=2)
     result = runner.run(suite)
     
     return result
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for the buffered, rate-limited jester loop in jester_loop.py
+"""
+
+import io
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from jester_loop import JESTER_THOUGHTS, BufferedEmitter, start_void_dance
+
+
+class FakeClock:
+    """Manual clock whose sleep just advances time"""
+    
+    def __init__(self):
+        self.now = 0.0
+        self.slept = 0.0
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.slept += seconds
+        self.now += seconds
+
+
+class ScriptedRandom(random.Random):
+    """Rolls low until roll ``leave_at``, which makes the jester leave"""
+    
+    def __init__(self, leave_at):
+        super().__init__(0)
+        self.leave_at = leave_at
+        self.rolls = 0
+    
+    def random(self):
+        self.rolls += 1
+        return 0.99999 if self.rolls == self.leave_at else 0.5
+
+
+class TestBufferedEmitter(unittest.TestCase):
+    """Test batching, flushing and the rate limit"""
+    
+    def test_lines_are_batched_into_few_writes(self):
+        stream = io.BytesIO()
+        emitter = BufferedEmitter(stream, buffer_chars=100)
+        for i in range(50):
+            emitter.emit(f'line {i:02d}')
+        emitter.flush()
+        self.assertEqual(stream.getvalue().decode('utf-8').splitlines(),
+                         [f'line {i:02d}' for i in range(50)])
+        self.assertEqual(emitter.emitted, 50)
+        self.assertLessEqual(emitter.writes, 5)
+    
+    def test_nothing_written_before_buffer_fills(self):
+        stream = io.BytesIO()
+        emitter = BufferedEmitter(stream, buffer_chars=1000)
+        emitter.emit('tomrom')
+        self.assertEqual(stream.getvalue(), b'')
+        emitter.flush()
+        self.assertEqual(stream.getvalue(), b'tomrom\n')
+    
+    def test_rate_limit_drops_and_counts(self):
+        clock = FakeClock()
+        emitter = BufferedEmitter(io.BytesIO(), lines_per_second=10,
+                                  clock=clock, sleep=clock.sleep)
+        accepted = [emitter.emit('x') for _ in range(25)]
+        self.assertEqual(accepted[:14], [True] * 10 + [False, True, False, True])
+        self.assertEqual((emitter.emitted, emitter.dropped), (17, 8))
+        # Each drop waited for the next token instead of spinning
+        self.assertAlmostEqual(clock.slept, 0.8)
+        clock.now += 0.5
+        self.assertEqual(sum(emitter.emit('x') for _ in range(5)), 5)
+    
+    def test_blocking_rate_limit_sleeps_instead_of_dropping(self):
+        clock = FakeClock()
+        stream = io.BytesIO()
+        emitter = BufferedEmitter(stream, lines_per_second=10, block=True,
+                                  clock=clock, sleep=clock.sleep)
+        for _ in range(30):
+            emitter.emit('x')
+        self.assertEqual((emitter.emitted, emitter.dropped), (30, 0))
+        self.assertAlmostEqual(clock.slept, 2.0)
+        # Pending lines are written out before each sleep
+        self.assertGreater(len(stream.getvalue()), 0)
+    
+    def test_pending_lines_flushed_after_interval(self):
+        clock = FakeClock()
+        stream = io.BytesIO()
+        emitter = BufferedEmitter(stream, flush_interval=0.5, clock=clock)
+        emitter.emit('first')
+        clock.now += 0.4
+        emitter.emit('second')
+        self.assertEqual(stream.getvalue(), b'')
+        clock.now += 0.1
+        emitter.emit('third')
+        self.assertEqual(stream.getvalue(), b'first\nsecond\nthird\n')
+    
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            BufferedEmitter(io.BytesIO(), lines_per_second=0)
+
+
+class TestVoidDance(unittest.TestCase):
+    """Test the ported loop"""
+    
+    def test_jester_leaves_cleanly(self):
+        stream = io.BytesIO()
+        stats = start_void_dance(BufferedEmitter(stream), ScriptedRandom(leave_at=6))
+        self.assertTrue(stats['jester_left'])
+        self.assertEqual(stats['thoughts'], 6)
+        lines = stream.getvalue().decode('utf-8').splitlines()
+        self.assertEqual(lines, [JESTER_THOUGHTS[i % 4] for i in range(6)])
+    
+    def test_max_thoughts_and_drop_counts(self):
+        clock = FakeClock()
+        emitter = BufferedEmitter(io.BytesIO(), lines_per_second=100,
+                                  clock=clock, sleep=clock.sleep)
+        stats = start_void_dance(emitter, ScriptedRandom(leave_at=0), max_thoughts=1000)
+        self.assertFalse(stats['jester_left'])
+        self.assertEqual(stats['thoughts'], 1000)
+        self.assertEqual((stats['emitted'], stats['dropped']), (550, 450))
+        # No faster than the limit: 100 lines of burst, then 100 per second
+        self.assertAlmostEqual(clock.now, 4.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the keyword router in keyword_router.py
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_keyword_router import NaiveRouter, synthetic_queries, synthetic_rules
+from keyword_router import KeywordRouter
+from oracle_server import respond_to_user
+
+
+class TestKeywordRouter(unittest.TestCase):
+    """Test rule priorities and matching"""
+    
+    def test_first_listed_rule_wins_by_default(self):
+        router = KeywordRouter([('lys', 'light'), ('kaffe', 'coffee')], default='void')
+        self.assertEqual(router.route('kaffe eller lys?'), 'light')
+        self.assertEqual(router.route('bare kaffe'), 'coffee')
+        self.assertEqual(router.route('ingenting'), 'void')
+    
+    def test_explicit_priorities(self):
+        router = KeywordRouter([('lys', 'light', 5), ('kaffe', 'coffee', 1)])
+        self.assertEqual(router.route('kaffe eller lys?'), 'coffee')
+    
+    def test_equal_priorities_go_to_first_listed(self):
+        router = KeywordRouter([('b', 'second', 0), ('a', 'first', 0)])
+        self.assertEqual(router.route('ab'), 'second')
+    
+    def test_overlapping_and_suffix_keywords(self):
+        router = KeywordRouter([('she', 'she'), ('he', 'he'), ('hers', 'hers', -1)])
+        self.assertEqual(router.route('ushers'), 'hers')
+        self.assertEqual(router.route('ushe'), 'she')
+        self.assertEqual(router.route('the'), 'he')
+        self.assertIsNone(router.route('hs'))
+    
+    def test_keywords_match_inside_words_case_insensitively(self):
+        router = KeywordRouter([('LYS', 'light')])
+        self.assertEqual(router.route('Stjernelyset'), 'light')
+        self.assertEqual(router.match('xLySx'), 0)
+        self.assertIsNone(router.match(''))
+    
+    def test_empty_keyword_rejected(self):
+        with self.assertRaises(ValueError):
+            KeywordRouter([('lys', 'light'), ('', 'nothing')])
+    
+    def test_route_batch(self):
+        router = KeywordRouter([('lys', 'light')], default='void')
+        self.assertEqual(router.route_batch(['lys', 'mørke', 'lys']), ['light', 'void', 'light'])
+        self.assertEqual(len(router), 1)
+    
+    def test_agrees_with_linear_scan(self):
+        rules = synthetic_rules(500)
+        queries = synthetic_queries(rules, 300)
+        router = KeywordRouter(rules, default='standard')
+        naive = NaiveRouter(rules, default='standard')
+        self.assertEqual(router.route_batch(queries), [naive.route(q) for q in queries])
+
+
+class TestOracleResponses(unittest.TestCase):
+    """Test the oracle keeps the prototype's respondToUser answers"""
+    
+    def test_prototype_routing(self):
+        self.assertIn('Du ER lyset', respond_to_user('Gi meg LYS og kaffe'))
+        self.assertIn('Kaffen er allerede drukket', respond_to_user('kaffe takk'))
+        self.assertIn('allerede på vei mot deg', respond_to_user('penger'))
+
+
+if __name__ == '__main__':
+    unittest.main()
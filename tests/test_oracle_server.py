@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio oracle server in oracle_server.py
+"""
+
+import asyncio
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_oracle_server import read_until, run_load
+from oracle_server import (
+    ENTER_PROMPT,
+    LINE_TOO_LONG,
+    QUESTION_PROMPT,
+    RESPONSES,
+    OracleServer,
+    respond_to_user,
+)
+from voidchain_store import iter_records
+
+
+class TestResponses(unittest.TestCase):
+    """Test the routing carried over from respondToUser"""
+    
+    def test_keyword_routing(self):
+        self.assertIn('Du ER lyset', respond_to_user('Gi meg LYS'))
+        self.assertIn('Kaffen er allerede drukket', respond_to_user('kaffe?'))
+        self.assertIn('allerede på vei', respond_to_user('anything'))
+        # "lys" is checked first, as in the prototype
+        self.assertIn('Du ER lyset', respond_to_user('lys og kaffe'))
+
+
+class TestOracleServer(unittest.TestCase):
+    """Test whole sessions against a server on a free port"""
+    
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.log_dir = Path(tmp.name)
+    
+    def run_with_server(self, client):
+        async def scenario():
+            server = OracleServer(self.log_dir, max_delay=0.01)
+            host, port = await server.start('127.0.0.1', 0)
+            try:
+                return await client(host, port), server
+            finally:
+                await server.close()
+        return asyncio.run(scenario())
+    
+    def test_session_dialogue_and_chain(self):
+        """Test prompts, answers and the logged chain of one visitor"""
+        async def client(host, port):
+            reader, writer = await asyncio.open_connection(host, port)
+            intro = await read_until(reader, ENTER_PROMPT)
+            writer.write(b'os=darwin\n')
+            greeting = await read_until(reader, QUESTION_PROMPT)
+            writer.write('kaffe, takk\n'.encode('utf-8'))
+            answer = await read_until(reader, QUESTION_PROMPT)
+            writer.close()
+            await writer.wait_closed()
+            return intro, greeting, answer
+        
+        (intro, greeting, answer), server = self.run_with_server(client)
+        self.assertIn('VELKOMMEN TIL VOIDCHAIN', intro[0])
+        self.assertIn('Mac-vesen', greeting[0])
+        self.assertIn('Kaffen', answer[1])
+        self.assertIn(answer[2][len('🎭 Jester says: '):], RESPONSES)
+        
+        records = list(iter_records(self.log_dir))
+        self.assertEqual([r['event'] for r in records],
+                         ['visitor arrived', 'initiate void entry', 'requested: kaffe, takk'])
+        self.assertEqual([r['block'] for r in records], [1, 2, 3])
+        self.assertEqual(records[0]['os'], 'darwin')
+        self.assertEqual(len({r['chain'] for r in records}), 1)
+        self.assertEqual(server.active, 0)
+    
+    def test_close_with_a_session_still_open(self):
+        """Test close() ends open sessions, logs their chains and returns"""
+        async def scenario():
+            server = OracleServer(self.log_dir, max_delay=0.01)
+            host, port = await server.start('127.0.0.1', 0)
+            reader, writer = await asyncio.open_connection(host, port)
+            await read_until(reader, ENTER_PROMPT)
+            writer.write(b'os=linux\n')
+            await read_until(reader, QUESTION_PROMPT)
+            await asyncio.wait_for(server.close(), timeout=5)
+            closed = await reader.read()
+            writer.close()
+            return server, closed
+        
+        with self.assertNoLogs('asyncio', level='ERROR'):
+            server, closed = asyncio.run(scenario())
+        self.assertEqual(closed, b'')
+        self.assertEqual(server.active, 0)
+        self.assertEqual([r['event'] for r in iter_records(self.log_dir)],
+                         ['visitor arrived', 'initiate void entry'])
+    
+    def test_overlong_line_gets_an_error_reply(self):
+        """Test a line over the stream limit is answered, not fatal"""
+        async def client(host, port):
+            reader, writer = await asyncio.open_connection(host, port)
+            await read_until(reader, ENTER_PROMPT)
+            writer.write(b'os=linux\n')
+            await read_until(reader, QUESTION_PROMPT)
+            writer.write(b'x' * 100_000 + b'\n')
+            refused = await read_until(reader, QUESTION_PROMPT)
+            writer.write(b'lys\n')
+            answer = await read_until(reader, QUESTION_PROMPT)
+            writer.close()
+            await writer.wait_closed()
+            return refused, answer
+        
+        (refused, answer), _ = self.run_with_server(client)
+        self.assertEqual(refused, [LINE_TOO_LONG])
+        self.assertIn('Du ER lyset', answer[1])
+    
+    def test_concurrent_sessions_are_written_in_batches(self):
+        """Test many sessions at once and batched chain writes"""
+        report, server = self.run_with_server(
+            lambda host, port: run_load(host, port, sessions=200, questions=2, concurrency=200)
+        )
+        self.assertEqual(report['errors'], 0)
+        self.assertEqual(report['requests'], 400)
+        self.assertGreater(report['p99_ms'], 0)
+        self.assertEqual(server.writer.chains_written, 200)
+        self.assertLess(server.writer.batches_written, 200)
+        self.assertEqual(len({r['chain'] for r in iter_records(self.log_dir)}), 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled error-payload schema validator in payload_schema.py
+"""
+
+import io
+import json
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_payload_schema import synthetic_payloads
+from payload_schema import (
+    ERROR_PAYLOAD_SCHEMA,
+    FunctionNameError,
+    SchemaError,
+    check_error_payload,
+    compile_schema,
+    main,
+    validate_naive,
+    validate_stream,
+)
+
+EXAMPLE_PATH = Path(__file__).parent.parent / 'error_sorpe.JSON'
+
+EXTRA_SCHEMA = {
+    'type': 'object',
+    'additional_properties': False,
+    'properties': {
+        'level': {'enum': ['low', 'high']},
+        'ratio': {'type': 'number', 'minimum': 0, 'maximum': 1},
+        'note': {'type': 'null'},
+        'flags': {'type': 'array', 'items': {'type': 'boolean'}},
+    },
+}
+
+
+class TestCompiledSchema(unittest.TestCase):
+    """Test the compiled validator against the example and the reference"""
+    
+    def setUp(self):
+        self.example = json.loads(EXAMPLE_PATH.read_text(encoding='utf-8'))
+    
+    def test_error_sorpe_example_is_valid(self):
+        """Test that the shipped example passes"""
+        self.assertEqual(check_error_payload(self.example), [])
+    
+    def test_findings_carry_path_and_rule(self):
+        """Test per-error reporting for several problems at once"""
+        self.example['error']['code'] = '666'
+        del self.example['error']['mood']
+        self.example['remedy'].append('')
+        self.example['status'] = 7
+        self.assertEqual([(path, rule) for path, rule, _ in check_error_payload(self.example)], [
+            ('$.status', 'type'),
+            ('$.error.mood', 'required'),
+            ('$.error.code', 'type'),
+            ('$.remedy[3]', 'min_length'),
+        ])
+        self.assertEqual(check_error_payload([]), [('$', 'type', 'expected object')])
+    
+    def test_compiled_matches_naive_reference(self):
+        """Test agreement on a mix of valid and broken payloads"""
+        for payload in synthetic_payloads(500, invalid=0.5, seed=3):
+            self.assertEqual(check_error_payload(payload),
+                             validate_naive(ERROR_PAYLOAD_SCHEMA, payload))
+    
+    def test_other_keywords(self):
+        """Test enum, bounds, null, booleans and unknown fields"""
+        check = compile_schema(EXTRA_SCHEMA)
+        self.assertIn('def check_payload', check.__source__)
+        good = {'level': 'low', 'ratio': 0.5, 'note': None, 'flags': [True]}
+        bad = {'level': 'mid', 'ratio': 2, 'note': '', 'flags': [1], 'extra': 1}
+        self.assertEqual(check(good), [])
+        self.assertEqual([rule for _, rule, _ in check(bad)],
+                         ['additional', 'enum', 'maximum', 'type', 'type'])
+        for payload in (good, bad):
+            self.assertEqual(check(payload), validate_naive(EXTRA_SCHEMA, payload))
+        with self.assertRaises(SchemaError):
+            compile_schema({'type': 'tuple'})
+        with self.assertRaises(SchemaError):
+            validate_naive({'type': 'tuple'}, ())
+        with self.assertRaises(FunctionNameError):
+            compile_schema({'type': 'string'}, name='check(); import os; def f')
+    
+    def test_bounds_without_a_literal_form(self):
+        """Test infinite and NaN bounds, which repr() cannot write as source"""
+        schema = {'type': 'object', 'properties': {
+            'high': {'type': 'number', 'maximum': float('inf')},
+            'low': {'type': 'number', 'minimum': float('-inf'), 'enum': [1, float('nan')]},
+        }}
+        check = compile_schema(schema)
+        for payload in ({'high': 1e308, 'low': 1}, {'high': 1, 'low': -1e308}):
+            self.assertEqual(check(payload), validate_naive(schema, payload))
+        self.assertEqual([rule for _, rule, _ in check({'high': 1, 'low': 2})], ['enum'])
+
+
+class TestValidateStream(unittest.TestCase):
+    """Test JSON-lines streams"""
+    
+    def test_stream_reports_lines(self):
+        """Test line numbers, blank lines and unparsable lines"""
+        example = EXAMPLE_PATH.read_text(encoding='utf-8')
+        valid = json.dumps(json.loads(example))
+        stream = io.StringIO('\n'.join([valid, '', '{"status": "x"', valid.replace('666', '-1')]))
+        findings = list(validate_stream(stream, source='payloads.jsonl'))
+        self.assertEqual([(f['line'], f['check']) for f in findings], [(3, 'json'), (4, 'minimum')])
+        self.assertEqual(findings[1]['path'], '$.error.code')
+        self.assertEqual(findings[1]['source'], 'payloads.jsonl')
+    
+    def test_cli_reports_unreadable_files(self):
+        """Test a missing and a non-UTF-8 file exit 1 without a traceback"""
+        with tempfile.TemporaryDirectory() as tmp:
+            latin1 = Path(tmp) / 'latin1.jsonl'
+            latin1.write_bytes('{"status": "caf\u00e9"}\n'.encode('latin-1'))
+            for path in (Path(tmp) / 'missing.jsonl', latin1):
+                stderr = io.StringIO()
+                with redirect_stderr(stderr):
+                    self.assertEqual(main([str(path)]), 1)
+                self.assertTrue(stderr.getvalue().startswith(f'{path}: '))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for the voidlang_sources phrase loader and sampler in phrase_corpus.py
+"""
+
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from phrase_corpus import PhraseCorpus, PhraseSampler
+
+SOURCES = {
+    'hatter_phrases': 'Why is a raven like a writing desk?\n\n  Tea time forever  \nWhy is a raven like a writing desk?\n',
+    'void_thoughts': 'Nothing compiles.\nTea time forever\n',
+    'empty': '\n',
+}
+
+
+class TestPhraseCorpus(unittest.TestCase):
+    """Test lazy loading, dedup, interning and the offset index"""
+    
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = Path(tmp.name)
+        for name, text in SOURCES.items():
+            (self.directory / f'{name}.txt').write_text(text, encoding='utf-8')
+        self.corpus = PhraseCorpus(self.directory)
+    
+    def test_ships_with_voidlang_sources(self):
+        """Test that the default corpus finds the repository's phrase files"""
+        names = PhraseCorpus().names()
+        for name in ['absurd_errors', 'fraggle_quotes', 'hatter_phrases', 'riddles', 'void_thoughts']:
+            self.assertIn(name, names)
+    
+    def test_files_load_lazily(self):
+        """Test that nothing is read until a file is used"""
+        self.assertFalse(any(f.loaded for f in self.corpus.files.values()))
+        self.corpus.phrases('void_thoughts')
+        self.assertTrue(self.corpus.files['void_thoughts'].loaded)
+        self.assertFalse(self.corpus.files['hatter_phrases'].loaded)
+    
+    def test_dedup_and_interning(self):
+        """Test that lines are stripped, deduplicated and shared across files"""
+        hatter = self.corpus.phrases('hatter_phrases')
+        void = self.corpus.phrases('void_thoughts')
+        self.assertEqual(hatter, ('Why is a raven like a writing desk?', 'Tea time forever'))
+        self.assertIs(hatter[1], void[1])
+        self.assertEqual(self.corpus.phrases('empty'), ())
+        self.assertEqual(len(self.corpus), 4)
+    
+    def test_offsets_point_at_source_lines(self):
+        """Test the per-file byte offset index"""
+        phrase_file = self.corpus.files['hatter_phrases']
+        data = phrase_file.path.read_bytes()
+        for phrase, offset in zip(phrase_file.phrases, phrase_file.offsets, strict=True):
+            line = data[offset:data.index(b'\n', offset)]
+            self.assertEqual(line.decode('utf-8').strip(), phrase)
+
+
+class TestPhraseSampler(unittest.TestCase):
+    """Test uniform, weighted and batch sampling"""
+    
+    def test_uniform_covers_the_pool(self):
+        """Test uniform draws over pooled, deduplicated phrases"""
+        sampler = PhraseSampler(['a', 'b', 'c'], seed=1)
+        counts = Counter(sampler.sample_batch(30_000))
+        self.assertEqual(set(counts), {'a', 'b', 'c'})
+        for count in counts.values():
+            self.assertAlmostEqual(count / 30_000, 1 / 3, delta=0.02)
+        self.assertIn(sampler.sample(), 'abc')
+    
+    def test_weighted_draws_follow_weights(self):
+        """Test the alias table, including a zero weight"""
+        sampler = PhraseSampler(['a', 'b', 'c'], [3, 1, 0], seed=2)
+        counts = Counter(sampler.sample_batch(40_000))
+        counts.update(sampler.sample() for _ in range(10_000))
+        self.assertNotIn('c', counts)
+        self.assertAlmostEqual(counts['a'] / 50_000, 0.75, delta=0.02)
+    
+    def test_seeded_samplers_repeat(self):
+        """Test that a seed makes draws reproducible"""
+        first = PhraseSampler(['a', 'b', 'c'], [1, 2, 3], seed=9).sample_batch(50)
+        second = PhraseSampler(['a', 'b', 'c'], [1, 2, 3], seed=9).sample_batch(50)
+        self.assertEqual(first, second)
+    
+    def test_corpus_file_weights(self):
+        """Test per-file weights from a corpus"""
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ['x', 'y']:
+                Path(tmp, f'{name}.txt').write_text(f'{name}1\n{name}2\n', encoding='utf-8')
+            sampler = PhraseCorpus(tmp).sampler(weights={'x': 0}, seed=3)
+            self.assertEqual(set(sampler.sample_batch(1000)), {'y1', 'y2'})
+    
+    def test_bad_input(self):
+        """Test empty pools and invalid weights"""
+        with self.assertRaises(IndexError):
+            PhraseSampler([]).sample()
+        with self.assertRaises(ValueError):
+            PhraseSampler(['a'], [0])
+        with self.assertRaises(ValueError):
+            PhraseSampler(['a', 'b'], [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
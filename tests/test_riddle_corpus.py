@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled binary riddle corpus in riddle_corpus.py
+"""
+
+import os
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from edu_riddles import Riddle, load_document
+from riddle_corpus import (
+    CorpusFormatError,
+    CorpusLimitError,
+    RiddleCorpus,
+    compile_deck,
+    write_corpus,
+)
+
+# Keep the on-disk parse cache out of $HOME unless EDU_RIDDLES_CACHE_DIR opts in
+os.environ.setdefault('EDU_RIDDLES_CACHE_DIR', '')
+
+RIDDLES_PATH = Path(__file__).parent.parent / 'EDU-RIDDLES.md'
+
+
+class TestRiddleCorpus(unittest.TestCase):
+    """Test compiling EDU-RIDDLES.md and reading it back"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / 'riddles.ridc'
+        self.riddles = load_document(RIDDLES_PATH).riddles
+    
+    def open_corpus(self):
+        corpus = RiddleCorpus(self.path)
+        self.addCleanup(corpus.close)
+        return corpus
+    
+    def test_round_trip_matches_markdown_parse(self):
+        """Test that every riddle survives compile and load unchanged"""
+        self.assertEqual(compile_deck(RIDDLES_PATH, self.path), len(self.riddles))
+        corpus = self.open_corpus()
+        self.assertEqual(len(corpus), len(self.riddles))
+        for riddle, loaded in zip(self.riddles, corpus, strict=True):
+            with self.subTest(riddle_number=riddle.number):
+                self.assertEqual(loaded, riddle)
+                self.assertEqual(loaded.to_dict(), riddle.to_dict())
+        self.assertLess(self.path.stat().st_size, RIDDLES_PATH.stat().st_size)
+    
+    def test_fetch_by_number_and_at_random(self):
+        """Test direct and random access"""
+        compile_deck(RIDDLES_PATH, self.path)
+        corpus = self.open_corpus()
+        self.assertEqual(corpus.get(7), self.riddles[6])
+        self.assertIsNone(corpus.get(0))
+        self.assertIsNone(corpus.get(99))
+        with self.assertRaises(IndexError):
+            corpus.riddle_at(len(self.riddles))
+        # Seeded only to predict the draw
+        rng = random.Random(4)  # noqa: S311
+        expected = random.Random(4).randrange(len(self.riddles))  # noqa: S311
+        self.assertEqual(corpus.random(rng), self.riddles[expected])
+    
+    def test_missing_fields_and_unsorted_numbers(self):
+        """Test riddles with absent fields, no text and out-of-order numbers"""
+        riddles = [
+            Riddle.from_lines([], number=5, title='Bare — "x"', line_number=3),
+            Riddle.from_lines(['one', '', 'three'], number=2, title='Full — "y"',
+                              line_number=9, answer='', teacher_note='Note ✓'),
+        ]
+        write_corpus(riddles, self.path)
+        corpus = self.open_corpus()
+        self.assertEqual(list(corpus), riddles)
+        self.assertEqual(corpus.get(2).riddle_text, ['one', '', 'three'])
+        self.assertIsNone(corpus.get(5).answer)
+    
+    def test_rejects_other_files(self):
+        """Test that non-corpus files are refused"""
+        self.path.write_bytes(b'')
+        with self.assertRaises(CorpusFormatError):
+            RiddleCorpus(self.path)
+        self.path.write_bytes(RIDDLES_PATH.read_bytes())
+        with self.assertRaises(CorpusFormatError):
+            RiddleCorpus(self.path)
+    
+    def test_values_past_32_bits_are_refused(self):
+        """Test a clear error, and no file left behind, for oversized fields"""
+        huge = Riddle.from_lines(['text'], number=2 ** 32, title='Huge — "x"', line_number=1)
+        with self.assertRaises(CorpusLimitError):
+            write_corpus([huge], self.path)
+        self.assertEqual(list(Path(self.tmp.name).iterdir()), [])
+    
+    def test_failed_write_removes_temp_file(self):
+        """Test that a write that cannot be renamed into place is cleaned up"""
+        self.path.mkdir()
+        with self.assertRaises(OSError):
+            write_corpus(self.riddles, self.path)
+        self.assertEqual(list(Path(self.tmp.name).iterdir()), [self.path])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Tests for the structured diagnostics stream in riddle_diagnostics.py
+"""
+
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from edu_riddles import RiddleValidator
+from riddle_checks import all_failures
+from riddle_diagnostics import Diagnostic, diagnose_files, iter_diagnostics, write_jsonl, write_sarif
+from riddle_generator import DEFECT_IDS, deck_text
+
+RIDDLE = '''
+## 1) README Icebreaker — "The Tiny Interpreter"
+Riddle:
+"I read your file one token at a time and never skip a line. What am I?"
+
+Answer: {answer}
+
+Learning goal: Introduce the interpreter and its run flow.
+
+Where to use: README intro, workshop slides.
+
+Teacher note: {note}
+
+---
+'''
+
+
+def deck(answer='The Void-Language interpreter', note='Follow with a one-line example command.'):
+    return '# Deck\n\n---\n' + RIDDLE.format(answer=answer, note=note)
+
+
+class TestDiagnostics(unittest.TestCase):
+    """Test findings, their spans and the per-rule cap"""
+    
+    def test_clean_deck_has_no_findings(self):
+        self.assertEqual(list(iter_diagnostics(RiddleValidator(deck()))), [])
+    
+    def test_same_findings_as_the_checks(self):
+        content = deck_text(1500, seed=4, defects=DEFECT_IDS, defect_rate=0.05)
+        validator = RiddleValidator(content)
+        failures = all_failures(validator)
+        diagnostics = list(iter_diagnostics(validator, 'deck.md'))
+        self.assertEqual(sorted(f['check'] for f in failures), sorted(d.rule for d in diagnostics))
+        self.assertEqual(
+            {(f['check'], f['riddle']) for f in failures if f['riddle'] is not None},
+            {(d.rule, d.riddle) for d in diagnostics if d.riddle is not None},
+        )
+    
+    def test_field_span_points_at_value(self):
+        content = deck(answer='Zebra')
+        [diagnostic] = iter_diagnostics(RiddleValidator(content), 'deck.md')
+        self.assertEqual((diagnostic.rule, diagnostic.severity), ('self-contained', 'warning'))
+        line = content.split('\n')[diagnostic.line - 1]
+        self.assertEqual(line[diagnostic.column - 1:diagnostic.end_column - 1], 'Zebra')
+        self.assertEqual(diagnostic.riddle, 1)
+    
+    def test_missing_field_points_at_title(self):
+        content = deck().replace('Answer: The Void-Language interpreter\n', '')
+        [diagnostic] = [d for d in iter_diagnostics(RiddleValidator(content)) if d.rule == 'answer']
+        self.assertEqual(diagnostic.severity, 'error')
+        line = content.split('\n')[diagnostic.line - 1]
+        self.assertEqual(line[diagnostic.column - 1:diagnostic.end_column - 1],
+                         'README Icebreaker — "The Tiny Interpreter"')
+    
+    def test_lint_spans(self):
+        content = deck(note='Follow &nbsp;with &nbsp;care.   ')
+        lines = content.split('\n')
+        spans = {}
+        for d in iter_diagnostics(RiddleValidator(content)):
+            spans.setdefault(d.rule, []).append(lines[d.line - 1][d.column - 1:d.end_column - 1])
+        self.assertEqual(spans['trailing-whitespace'], ['   '])
+        self.assertEqual(spans['html-entities'], ['&nbsp;', '&nbsp;'])
+    
+    def test_majority_rules_report_odd_lines(self):
+        second = RIDDLE.format(answer='The Void-Language interpreter', note='Keep it short.')
+        content = deck() + second.replace('## 1)', '## 2)').replace('\n---\n', '\n***\n')
+        findings = [d for d in iter_diagnostics(RiddleValidator(content)) if d.rule == 'horizontal-rules']
+        self.assertEqual([content.split('\n')[d.line - 1] for d in findings], ['***'])
+    
+    def test_cap_per_rule(self):
+        content = deck_text(300, seed=2, defects=['self-contained'], defect_rate=0.1)
+        diagnostics = list(iter_diagnostics(RiddleValidator(content), max_per_rule=5))
+        self.assertEqual([d.severity for d in diagnostics], ['warning'] * 5 + ['note'])
+        self.assertIn('25 more findings suppressed', diagnostics[-1].message)
+
+
+class TestDiagnosticOutput(unittest.TestCase):
+    """Test the JSON lines and SARIF writers"""
+    
+    def setUp(self):
+        self.diagnostics = [
+            Diagnostic('answer', 'error', 'Riddle 1 should have an answer', 'deck.md', 4, 9, 4, 30, 1),
+            Diagnostic('ends-with-newline', 'warning', 'File should end with a newline character', 'deck.md', 9),
+            Diagnostic('read-error', 'error', 'gone', None),
+        ]
+    
+    def test_jsonl(self):
+        out = io.StringIO()
+        counts = write_jsonl(self.diagnostics, out)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(records[0], self.diagnostics[0].to_dict())
+        self.assertEqual((counts['error'], counts['warning']), (2, 1))
+    
+    def test_sarif(self):
+        out = io.StringIO()
+        write_sarif(self.diagnostics, out)
+        log = json.loads(out.getvalue())
+        self.assertEqual(log['version'], '2.1.0')
+        results = log['runs'][0]['results']
+        self.assertEqual([r['ruleId'] for r in results], ['answer', 'ends-with-newline', 'read-error'])
+        region = results[0]['locations'][0]['physicalLocation']['region']
+        self.assertEqual(region, {'startLine': 4, 'startColumn': 9, 'endLine': 4, 'endColumn': 30})
+        self.assertNotIn('startColumn', results[1]['locations'][0]['physicalLocation']['region'])
+        self.assertNotIn('locations', results[2])
+        rule_ids = {rule['id'] for rule in log['runs'][0]['tool']['driver']['rules']}
+        self.assertTrue({'answer', 'trailing-whitespace', 'read-error'} <= rule_ids)
+    
+    def test_empty_sarif_is_valid(self):
+        out = io.StringIO()
+        write_sarif([], out)
+        self.assertEqual(json.loads(out.getvalue())['runs'][0]['results'], [])
+    
+    def test_diagnose_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'deck.md'
+            path.write_text(deck(answer='Zebra'), encoding='utf-8')
+            missing = str(Path(tmp) / 'missing.md')
+            diagnostics = list(diagnose_files([str(path), missing]))
+        self.assertEqual([(d.rule, d.path) for d in diagnostics],
+                         [('self-contained', str(path)), ('read-error', missing)])
+
+
+if __name__ == '__main__':
+    unittest.main()
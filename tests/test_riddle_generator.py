@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the seeded riddle-deck generator in riddle_generator.py
+"""
+
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from edu_riddles import RiddleValidator
+from riddle_checks import all_failures
+from riddle_generator import DEFECT_IDS, deck_text, generate_file, write_deck
+
+
+class TestCleanDecks(unittest.TestCase):
+    """Test generated decks are valid and reproducible"""
+    
+    def test_clean_deck_passes_everything(self):
+        content = deck_text(600, seed=5)
+        riddles = RiddleValidator(content).get_riddles()
+        self.assertEqual([r.number for r in riddles], list(range(1, 601)))
+        self.assertEqual(all_failures(RiddleValidator(content)), [])
+    
+    def test_header_format(self):
+        riddle = RiddleValidator(deck_text(1)).get_riddles()[0]
+        self.assertRegex(riddle.title, r'^[A-Za-z ]+ — "[A-Za-z ]+"$')
+        self.assertIsNotNone(riddle.teacher_note)
+    
+    def test_same_seed_same_deck(self):
+        self.assertEqual(deck_text(200, seed=9), deck_text(200, seed=9))
+        self.assertNotEqual(deck_text(200, seed=9), deck_text(200, seed=10))
+    
+    def test_file_matches_text(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'deck.md'
+            self.assertEqual(generate_file(path, 5000, seed=2), [])
+            self.assertEqual(path.read_text(encoding='utf-8'), deck_text(5000, seed=2))
+            self.assertEqual(list(Path(tmp).iterdir()), [path])
+
+
+class TestDefectInjection(unittest.TestCase):
+    """Test each defect class is detected by the check it names"""
+    
+    def test_each_defect_alone_is_detected(self):
+        for defect in DEFECT_IDS:
+            with self.subTest(defect=defect):
+                content = deck_text(50, seed=1, defects=[defect])
+                checks = {failure['check'] for failure in all_failures(RiddleValidator(content))}
+                self.assertIn(defect, checks)
+    
+    def test_manifest_points_at_defective_riddles(self):
+        out = StringIO()
+        manifest = write_deck(out, 500, seed=4, defects=DEFECT_IDS, defect_rate=0.1)
+        lines = out.getvalue().split('\n')
+        self.assertEqual({entry['defect'] for entry in manifest}, set(DEFECT_IDS))
+        self.assertGreaterEqual(len(manifest), 50)
+        for entry in manifest:
+            if entry['line'] is not None:
+                self.assertTrue(lines[entry['line'] - 1].startswith(f"## {entry['riddle']}) "))
+    
+    def test_unknown_defect_rejected(self):
+        with self.assertRaises(ValueError):
+            deck_text(10, defects=['no-such-check'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental re-validation in riddle_incremental.py
+"""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from edu_riddles import RiddleValidator, iter_sections, load_document
+from riddle_checks import all_failures
+from riddle_incremental import IncrementalValidator
+
+# Keep the on-disk parse cache out of $HOME unless EDU_RIDDLES_CACHE_DIR opts in
+os.environ.setdefault('EDU_RIDDLES_CACHE_DIR', '')
+
+RIDDLES_PATH = Path(__file__).parent.parent / 'EDU-RIDDLES.md'
+
+
+def full_failures(content):
+    """Failures from a from-scratch run (checks only, no lint), for comparison"""
+    return all_failures(RiddleValidator(content), lint=False)
+
+
+class TestSections(unittest.TestCase):
+    """Test splitting a document at riddle headers"""
+    
+    def test_sections_start_at_riddle_headers(self):
+        """Test that each section begins with its riddle's header line"""
+        content = load_document(RIDDLES_PATH).content
+        riddles = RiddleValidator(content).get_riddles()
+        sections = list(iter_sections(content))
+        self.assertEqual(len(sections), len(riddles))
+        for (start, _, line_number), riddle in zip(sections, riddles, strict=True):
+            with self.subTest(riddle_number=riddle.number):
+                self.assertEqual(line_number, riddle.line_number)
+                self.assertTrue(content.startswith(f'## {riddle.number})', start))
+
+
+class TestIncrementalValidator(unittest.TestCase):
+    """Test that only changed sections are re-checked"""
+    
+    def setUp(self):
+        self.content = load_document(RIDDLES_PATH).content
+        self.validator = IncrementalValidator()
+        self.first = self.validator.validate(self.content)
+    
+    def test_first_run_checks_everything(self):
+        """Test that a cold run re-checks every riddle"""
+        self.assertEqual(self.first['rechecked'], list(range(1, 11)))
+        self.assertEqual(self.first['reused'], 0)
+        self.assertEqual(self.first['failures'], full_failures(self.content))
+    
+    def test_unchanged_document_reuses_all_verdicts(self):
+        """Test that re-validating the same content re-checks nothing"""
+        report = self.validator.validate(self.content)
+        self.assertEqual(report['rechecked'], [])
+        self.assertEqual(report['reused'], 10)
+        self.assertEqual(report['failures'], self.first['failures'])
+    
+    def test_editing_one_riddle_rechecks_only_it(self):
+        """Test that an edit re-checks just the touched section"""
+        edited = self.content.replace(
+            'Learning goal: Exercises in language spec writing',
+            'Learning goal: Teach language spec writing'
+        )
+        report = self.validator.validate(edited)
+        self.assertEqual(report['rechecked'], [7])
+        self.assertEqual(report['reused'], 9)
+        self.assertEqual(report['failures'], full_failures(edited))
+    
+    def test_moved_sections_report_new_lines(self):
+        """Test that reused verdicts follow sections that shifted down"""
+        edited = self.content.replace(
+            'Use these bite-sized riddles',
+            'Use these\n\nbite-sized riddles'
+        )
+        report = self.validator.validate(edited)
+        self.assertEqual(report['rechecked'], [])
+        self.assertEqual(report['failures'], full_failures(edited))
+    
+    def test_removed_riddle_is_forgotten(self):
+        """Test that numbering checks see deletions and stale verdicts go"""
+        start, end, _ = list(iter_sections(self.content))[4]
+        edited = self.content[:start] + self.content[end:]
+        report = self.validator.validate(edited)
+        self.assertEqual(report['riddles'], 9)
+        self.assertIn('sequential-numbering', {f['check'] for f in report['failures']})
+        self.assertEqual(report['failures'], full_failures(edited))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the riddle lookup indexes in riddle_index.py
+"""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from edu_riddles import Riddle, load_document
+from riddle_index import RiddleIndex, document_index, title_category
+
+# Keep the on-disk parse cache out of $HOME unless EDU_RIDDLES_CACHE_DIR opts in
+os.environ.setdefault('EDU_RIDDLES_CACHE_DIR', '')
+
+RIDDLES_PATH = Path(__file__).parent.parent / 'EDU-RIDDLES.md'
+
+
+def numbers(riddles):
+    return [riddle.number for riddle in riddles]
+
+
+class TestRiddleIndex(unittest.TestCase):
+    """Test every lookup against a linear scan of EDU-RIDDLES.md"""
+    
+    @classmethod
+    def setUpClass(cls):
+        document = load_document(RIDDLES_PATH)
+        cls.riddles = document.riddles
+        cls.index = document_index(document)
+    
+    def test_index_is_built_once_per_document(self):
+        """Test that a loaded document keeps its index"""
+        self.assertIs(document_index(load_document(RIDDLES_PATH)), self.index)
+        self.assertEqual(len(self.index), len(self.riddles))
+    
+    def test_by_number(self):
+        """Test lookup by riddle number"""
+        for riddle in self.riddles:
+            self.assertIs(self.index.by_number(riddle.number), riddle)
+        self.assertIsNone(self.index.by_number(999))
+    
+    def test_by_category_prefix(self):
+        """Test lookup by the category part of the title"""
+        self.assertEqual(title_category('Issue-starter — "A Bug as a Puzzle"'), 'Issue-starter')
+        self.assertEqual(numbers(self.index.by_category('Issue-starter')), [3])
+        self.assertEqual(numbers(self.index.by_category('pr description opener')), [6])
+        for prefix in ['', 'r', 'workshop', 'nothing-like-this']:
+            expected = [
+                r.number for r in self.riddles
+                if title_category(r.title).lower().startswith(prefix)
+            ]
+            self.assertEqual(numbers(self.index.by_category(prefix)), expected)
+    
+    def test_by_location_keyword(self):
+        """Test lookup by a word of the Where to use field"""
+        expected = {
+            'README': [1, 2, 4, 10],
+            'contributing': [2, 5, 10],
+            'issue': [3, 9],
+            'slides': [4],
+            'nowhere': [],
+        }
+        for keyword, riddle_numbers in expected.items():
+            self.assertEqual(numbers(self.index.by_location(keyword)), riddle_numbers, keyword)
+    
+    def test_search_requires_every_word(self):
+        """Test the inverted word index over riddle text and answer"""
+        hits = self.index.search('interpreter')
+        self.assertTrue(hits)
+        for riddle in hits:
+            text = ('\n'.join(riddle.riddle_text) + riddle.answer).lower()
+            self.assertIn('interpreter', text)
+        self.assertEqual(self.index.search('interpreter zzzunknown'), [])
+        self.assertEqual(self.index.search('  '), [])
+    
+    def test_repeated_numbers_keep_the_first(self):
+        """Test an index over a deck with a duplicated number"""
+        def make(title):
+            return Riddle.from_lines(['"x"'], number=1, title=title, line_number=1)
+
+        index = RiddleIndex([make('A — "one"'), make('B — "two"')])
+        self.assertEqual(index.by_number(1).title, 'A — "one"')
+        self.assertEqual(index.categories(), ['a', 'b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
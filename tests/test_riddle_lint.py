@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-sweep markdown lint engine in riddle_lint.py
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from riddle_lint import RULES, LintRule, lint_lines
+
+CLEAN = [
+    '# Title',
+    '',
+    '- one',
+    '- two',
+    '',
+    '---',
+    'Tom &amp; Jerry',
+    '',
+]
+
+DIRTY = [
+    '#Title',
+    'trailing   ',
+    '',
+    '',
+    '',
+    '---',
+    '***',
+    '---',
+    '- one',
+    '* two',
+    '&nbsp; and &amp;',
+]
+
+
+class TestLintEngine(unittest.TestCase):
+    """Test rule registration and the single sweep"""
+    
+    def test_all_formatting_rules_are_registered(self):
+        """Test that every TestMarkdownFormatting rule has a visitor"""
+        self.assertEqual(list(RULES), [
+            'trailing-whitespace', 'header-spacing', 'horizontal-rules',
+            'multiple-blank-lines', 'html-entities', 'list-bullets',
+        ])
+        for rule_class in RULES.values():
+            self.assertTrue(issubclass(rule_class, LintRule))
+            self.assertTrue(rule_class.message)
+    
+    def test_lines_are_consumed_once(self):
+        """Test that all rules are evaluated in one pass over the lines"""
+        passes = []
+        
+        def lines():
+            passes.append(1)
+            yield from DIRTY
+        
+        results = lint_lines(lines())
+        self.assertEqual(len(passes), 1)
+        self.assertEqual(len(results), len(RULES))
+    
+    def test_rule_selection(self):
+        """Test running a subset of rules"""
+        results = lint_lines(DIRTY, rule_ids=['header-spacing'])
+        self.assertEqual(list(results), ['header-spacing'])
+    
+    def test_clean_document_passes(self):
+        """Test that a clean document has no findings"""
+        for rule_id, rule in lint_lines(CLEAN).items():
+            with self.subTest(rule=rule_id):
+                self.assertTrue(rule.ok)
+                self.assertEqual(rule.findings, [])
+
+
+class TestLintRules(unittest.TestCase):
+    """Test each rule against a document with one defect of every kind"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.results = lint_lines(DIRTY)
+    
+    def test_trailing_whitespace(self):
+        self.assertEqual(self.results['trailing-whitespace'].findings, [(2, 'trailing   ')])
+    
+    def test_header_spacing(self):
+        self.assertEqual(self.results['header-spacing'].findings, [(1, '#Title')])
+    
+    def test_horizontal_rules(self):
+        self.assertEqual(self.results['horizontal-rules'].findings, [(7, '***')])
+    
+    def test_multiple_blank_lines(self):
+        self.assertEqual(self.results['multiple-blank-lines'].findings, [(5, '')])
+    
+    def test_html_entities(self):
+        rule = self.results['html-entities']
+        self.assertEqual(rule.findings, [(11, '&nbsp;')])
+        self.assertEqual(rule.checked, 2)
+    
+    def test_list_bullets_allow_some_mixing(self):
+        rule = self.results['list-bullets']
+        self.assertEqual(rule.consistency, 0.5)
+        self.assertFalse(rule.ok)
+        mostly_dashes = lint_lines(['- a'] * 9 + ['* b'])['list-bullets']
+        self.assertEqual(len(mostly_dashes.findings), 1)
+        self.assertTrue(mostly_dashes.ok)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Tests for the concurrent suite scheduler in tests/run_all_tests.py and
+the in-process runner in tests/run_python_tests.py
+"""
+
+import io
+import sys
+import tempfile
+import textwrap
+import time
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from run_all_tests import (
+    SuiteRunner,
+    load_durations,
+    print_summary,
+    save_durations,
+    schedule,
+)
+from run_python_tests import (
+    discover_modules,
+    iter_tests,
+    load_suite,
+    run_forked,
+    shard_by_class,
+)
+from run_python_tests import main as run_python_tests
+from suite_timing import profile_modes
+
+
+def python_suite(name, code):
+    return name, [sys.executable, '-c', code]
+
+
+class TestSchedule(unittest.TestCase):
+    """Test longest-first ordering"""
+    
+    def test_longest_first_and_unknown_first_of_all(self):
+        suites = [python_suite(n, 'pass') for n in ['fast', 'new', 'slow']]
+        order = schedule(suites, {'fast': 0.5, 'slow': 9.0})
+        self.assertEqual([name for name, _ in order], ['new', 'slow', 'fast'])
+    
+    def test_durations_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'durations.json'
+            self.assertEqual(load_durations(path), {})
+            save_durations({'a': 1.5}, path)
+            self.assertEqual(load_durations(path), {'a': 1.5})
+
+
+class TestSuiteRunner(unittest.TestCase):
+    """Test concurrent execution, prefixed output and the summary"""
+    
+    def run_suites(self, suites, jobs):
+        out = io.StringIO()
+        runner = SuiteRunner(suites, jobs, out=out)
+        started = time.monotonic()
+        results = runner.run({})
+        return runner, results, out.getvalue(), time.monotonic() - started
+    
+    def test_output_is_prefixed_and_results_keep_suite_order(self):
+        suites = [
+            python_suite('ok', 'print("hello")'),
+            python_suite('bad', 'import sys; print("oops"); sys.exit(3)'),
+        ]
+        _, results, output, _ = self.run_suites(suites, jobs=2)
+        self.assertEqual(list(results), ['ok', 'bad'])
+        self.assertTrue(results['ok'][0])
+        self.assertFalse(results['bad'][0])
+        self.assertRegex(output, r'\[ok \s*\].* hello')
+        self.assertRegex(output, r'\[bad\s*\].* oops')
+    
+    def test_suites_run_concurrently(self):
+        suites = [python_suite(f's{i}', 'import time; time.sleep(0.5)') for i in range(3)]
+        _, _, _, wall_time = self.run_suites(suites, jobs=3)
+        self.assertLess(wall_time, 1.2)
+    
+    def test_missing_command_fails_the_suite(self):
+        suites = [('missing', ['definitely-not-a-command-xyz'])]
+        _, results, _, _ = self.run_suites(suites, jobs=1)
+        self.assertFalse(results['missing'][0])
+    
+    def test_summary_exit_status(self):
+        suites = [python_suite('ok', 'pass')]
+        runner, results, _, _ = self.run_suites(suites, jobs=1)
+        self.assertEqual(print_summary(runner, results, 0.1), 0)
+        results['broken'] = (False, 0.1)
+        self.assertEqual(print_summary(runner, results, 0.1), 1)
+
+
+def sample_suite():
+    """Stand-in tests for the in-process runner, kept out of collection"""
+    class Sample(unittest.TestCase):
+        def test_a(self):
+            pass
+        
+        def test_b(self):
+            pass
+        
+        def test_fails(self):
+            self.fail('expected')
+    
+    class Other(unittest.TestCase):
+        def test_c(self):
+            pass
+    
+    loader = unittest.TestLoader()
+    return unittest.TestSuite([
+        loader.loadTestsFromTestCase(Sample),
+        loader.loadTestsFromTestCase(Other),
+    ])
+
+
+class TestInProcessRunner(unittest.TestCase):
+    """Test module discovery, class sharding and forked workers"""
+    
+    def test_discovers_every_test_module(self):
+        modules = discover_modules()
+        self.assertIn('test_edu_riddles', modules)
+        self.assertIn('test_run_all_tests', modules)
+        self.assertEqual(modules, sorted(modules))
+    
+    def test_tests_come_from_the_already_imported_module(self):
+        suite = load_suite(['test_run_all_tests'], name_filter='discovers_every')
+        tests = list(iter_tests(suite))
+        self.assertEqual(len(tests), 1)
+        self.assertIs(type(tests[0]), TestInProcessRunner)
+    
+    def test_broken_module_becomes_one_failing_test(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, 'test_broken_xyz.py').write_text(textwrap.dedent('''
+                import unittest
+                raise RuntimeError('not an ImportError')
+            '''), encoding='utf-8')
+            sys.path.insert(0, tmp)
+            try:
+                suite = load_suite(['test_broken_xyz'])
+            finally:
+                sys.path.remove(tmp)
+                sys.modules.pop('test_broken_xyz', None)
+        result = unittest.TestResult()
+        suite.run(result)
+        self.assertEqual((result.testsRun, len(result.errors)), (1, 1))
+        self.assertIn('not an ImportError', result.errors[0][1])
+    
+    def test_shards_keep_classes_together(self):
+        shards = shard_by_class(sample_suite(), 4)
+        self.assertEqual(len(shards), 2)
+        for shard in shards:
+            self.assertEqual(len({type(test) for test in iter_tests(shard)}), 1)
+    
+    def test_forked_workers_report_totals(self):
+        summaries = run_forked(sample_suite(), 2, verbosity=0)
+        self.assertEqual(sum(s['run'] for s in summaries), 4)
+        self.assertEqual(sum(s['failures'] for s in summaries), 1)
+        self.assertIn('expected', ''.join(s['output'] for s in summaries))
+        timed = [t['test'] for s in summaries for t in s['timings']['tests']]
+        self.assertEqual(len(timed), 4)
+    
+    @unittest.skipIf(profile_modes(), 'the enclosing run is already profiling')
+    def test_forked_workers_save_profiles(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            summaries = run_forked(sample_suite(), 2, 0, ['cprofile', 'tracemalloc'], tmp)
+            self.assertEqual(len(list(Path(tmp).glob('shard-*.prof'))), len(summaries))
+        tests = [t for s in summaries for t in s['timings']['tests']]
+        self.assertTrue(all('peak_bytes' in t for t in tests))
+    
+    def test_empty_selection_does_not_fork(self):
+        with redirect_stderr(io.StringIO()) as stderr:
+            self.assertEqual(run_python_tests(['-k', 'matches_no_test_xyz', '-j', '2']), 0)
+        self.assertIn('Ran 0 tests', stderr.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
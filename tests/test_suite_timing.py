@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the test-suite timing and profiling hooks in tests/suite_timing.py
+"""
+
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from suite_timing import SuiteTimings, TimingTestRunner, profile_modes
+
+
+def sample_suite():
+    """Stand-in tests, kept out of collection"""
+    class Sample(unittest.TestCase):
+        def test_fast(self):
+            pass
+        
+        def test_slow(self):
+            sum(range(200_000))
+        
+        def test_fails(self):
+            self.fail('expected')
+    
+    return unittest.TestLoader().loadTestsFromTestCase(Sample)
+
+
+class TestSuiteTimings(unittest.TestCase):
+    """Test phase accumulation and the slowest-N ordering"""
+    
+    def test_phases_accumulate(self):
+        timings = SuiteTimings()
+        with timings.phase('parse'):
+            pass
+        timings.add_phase('parse', 1.0)
+        self.assertGreaterEqual(timings.phases['parse'], 1.0)
+    
+    def test_slowest_first(self):
+        timings = SuiteTimings()
+        timings.tests = [{'test': t, 'seconds': s} for t, s in [('a', 1), ('b', 3), ('c', 2)]]
+        self.assertEqual([t['test'] for t in timings.slowest(2)], ['b', 'c'])
+    
+    def test_merge_adds_another_runs_timings(self):
+        timings = SuiteTimings()
+        timings.add_phase('check', 1.0)
+        other = SuiteTimings()
+        other.add_phase('check', 2.0)
+        other.tests.append({'test': 'a', 'seconds': 2.0})
+        timings.merge(other.to_dict())
+        self.assertEqual(timings.phases, {'check': 3.0})
+        self.assertEqual(timings.tests, other.tests)
+
+
+class TestTimingTestRunner(unittest.TestCase):
+    """Test per-test records, the report, JSON export and profiling"""
+    
+    def run_sample(self, **kwargs):
+        timings = SuiteTimings()
+        stream = io.StringIO()
+        runner = TimingTestRunner(stream=stream, verbosity=0, timings=timings,
+                                  slowest=2, **kwargs)
+        result = runner.run(sample_suite())
+        return timings, result, stream.getvalue()
+    
+    def test_records_every_test_with_outcome(self):
+        timings, result, output = self.run_sample(profile=[])
+        self.assertEqual(result.testsRun, 3)
+        outcomes = {t['test'].rsplit('.', 1)[1]: t['outcome'] for t in timings.tests}
+        self.assertEqual(outcomes, {'test_fast': 'passed', 'test_slow': 'passed',
+                                    'test_fails': 'failed'})
+        self.assertIn('check', timings.phases)
+        self.assertIn('Slowest 2 tests:', output)
+    
+    @unittest.skipIf(profile_modes(), 'the enclosing run is already profiling')
+    def test_json_export_and_profiles(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = Path(tmp) / 'timings.json'
+            _, _, output = self.run_sample(
+                json_path=str(json_path), profile=['cprofile', 'tracemalloc']
+            )
+            exported = json.loads(json_path.read_text(encoding='utf-8'))
+            self.assertEqual(len(exported['tests']), 3)
+            self.assertTrue(all('peak_bytes' in t for t in exported['tests']))
+            self.assertTrue(json_path.with_suffix('.prof').exists())
+            self.assertIn('cumulative', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
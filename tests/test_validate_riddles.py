@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Tests for the riddle checks and the parallel validation CLI
+
+Covers riddle_checks.py, validate_riddles.py and path_patterns.py: check
+registration, per-riddle and whole-deck failures, glob expansion, the JSON
+lines report and agreement between serial and process-pool runs.
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from edu_riddles import Riddle, load_document
+from riddle_checks import (
+    ACTIONABLE_VERBS,
+    DECK_CHECKS,
+    KEYWORD_CHECKS,
+    LOCATION_PATTERNS,
+    RIDDLE_CHECKS,
+    KeywordMatcher,
+    classify_riddles,
+    run_riddle_checks,
+)
+from path_patterns import expand_paths
+import validate_riddles
+
+# Keep the on-disk parse cache out of $HOME unless EDU_RIDDLES_CACHE_DIR opts in
+os.environ.setdefault('EDU_RIDDLES_CACHE_DIR', '')
+
+RIDDLES_PATH = Path(__file__).parent.parent / 'EDU-RIDDLES.md'
+
+BROKEN_DECK = '''# Broken deck
+
+## 1) Workshop Icebreaker — "Fine"
+Riddle:
+"I run your Void programs one line at a time. What am I?"
+
+Answer: The Void-Language interpreter
+
+Learning goal: Introduce the interpreter and explain its run flow.
+
+Where to use: README intro, workshop slides.
+
+Teacher note: Follow with a one-line example command.
+
+---
+
+## 3) No separator
+Riddle:
+"?"
+
+---'''
+
+
+class TestRiddleChecks(unittest.TestCase):
+    """Test the reusable check functions"""
+    
+    def test_checks_are_registered(self):
+        """Test that riddle and deck checks are registered by id"""
+        for check_id in ['answer', 'title-format', 'self-contained']:
+            self.assertIn(check_id, RIDDLE_CHECKS)
+        self.assertIn('sequential-numbering', DECK_CHECKS)
+    
+    def test_edu_riddles_failures_match_test_suite(self):
+        """Test that the checks flag the same riddles as the unittest suite"""
+        failures = []
+        for riddle in load_document(RIDDLES_PATH).riddles:
+            failures.extend(run_riddle_checks(riddle))
+        flagged = {(f['check'], f['riddle']) for f in failures}
+        # Known content gaps in EDU-RIDDLES.md that the suite also reports
+        self.assertEqual(flagged, {
+            ('actionable-learning-goal', 7),
+            ('concrete-location', 7),
+            ('project-reference', 10),
+        })
+    
+    def test_incomplete_riddle_fails_completeness_checks(self):
+        """Test that a riddle with no fields fails the completeness checks"""
+        riddle = Riddle(number=4, title='No separator', line_number=1)
+        checks = {f['check'] for f in run_riddle_checks(riddle)}
+        for check_id in ['riddle-text', 'answer', 'learning-goal',
+                         'where-to-use', 'teacher-note', 'title-format']:
+            self.assertIn(check_id, checks)
+    
+    def test_check_ids_filter(self):
+        """Test that run_riddle_checks can be limited to some checks"""
+        riddle = Riddle(number=4, title='No separator', line_number=1)
+        failures = run_riddle_checks(riddle, check_ids={'answer'})
+        self.assertEqual([f['check'] for f in failures], ['answer'])
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    """Test the compiled multi-term matcher behind the keyword checks"""
+    
+    SAMPLES = (
+        'Introduce what Void is',
+        'Exercises in language spec writing',
+        '',
+        'DEMONSTRATE the İnterpreter',
+        'İİİ then show',
+        'nothing here',
+        'pre-show',
+    )
+    
+    def test_matches_naive_substring_search(self):
+        """Test agreement with any(term in text) for single texts and batches"""
+        matcher = KeywordMatcher(ACTIONABLE_VERBS)
+        expected = [
+            any(verb in text.lower() for verb in ACTIONABLE_VERBS)
+            for text in self.SAMPLES
+        ]
+        self.assertEqual([matcher.search(t) for t in self.SAMPLES], expected)
+        self.assertEqual(matcher.search_batch(self.SAMPLES), expected)
+    
+    def test_regex_vocabulary(self):
+        """Test that pattern vocabularies behave like re.search per pattern"""
+        matcher = KeywordMatcher(LOCATION_PATTERNS, regex=True)
+        texts = ['Syllabus, lab handout', 'PR templates', 'GitHub Discussions']
+        self.assertEqual(matcher.search_batch(texts), [False, True, True])
+    
+    def test_terms_are_escaped(self):
+        """Test that plain terms are not treated as regular expressions"""
+        matcher = KeywordMatcher(['a.b'])
+        self.assertEqual(matcher.search_batch(['axb', 'a.b']), [False, True])
+    
+    def test_empty_batch(self):
+        self.assertEqual(KeywordMatcher(['x']).search_batch([]), [])
+    
+    def test_classify_riddles_agrees_with_checks(self):
+        """Test that batch classification matches the per-riddle checks"""
+        riddles = load_document(RIDDLES_PATH).riddles
+        for riddle, keywords in zip(riddles, classify_riddles(riddles), strict=True):
+            self.assertEqual(set(keywords), set(KEYWORD_CHECKS))
+            for check_id, passed in keywords.items():
+                with self.subTest(riddle_number=riddle.number, check=check_id):
+                    self.assertEqual(passed, RIDDLE_CHECKS[check_id](riddle) is None)
+
+
+class TestValidateRiddlesCli(unittest.TestCase):
+    """Test the validate_riddles.py command-line entry point"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = Path(self.tmp.name)
+        (root / 'decks' / 'nested').mkdir(parents=True)
+        self.good = root / 'decks' / 'good.md'
+        self.good.write_text(RIDDLES_PATH.read_text(encoding='utf-8'), encoding='utf-8')
+        self.broken = root / 'decks' / 'nested' / 'broken.md'
+        self.broken.write_text(BROKEN_DECK, encoding='utf-8')
+        self.root = root
+    
+    def run_cli(self, *args):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            status = validate_riddles.main(list(args))
+        reports = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        return status, reports
+    
+    def test_globs_are_expanded_recursively(self):
+        """Test that ** patterns reach nested decks without duplicates"""
+        pattern = str(self.root / 'decks' / '**' / '*.md')
+        paths = expand_paths([pattern, str(self.good)])
+        self.assertEqual(sorted(paths), sorted([str(self.good), str(self.broken)]))
+    
+    def test_report_lists_deck_failures(self):
+        """Test the JSON lines report for a broken deck"""
+        status, (report,) = self.run_cli(str(self.broken), '-j', '1')
+        self.assertEqual(status, 1)
+        self.assertFalse(report['ok'])
+        self.assertEqual(report['riddles'], 2)
+        checks = {f['check'] for f in report['failures']}
+        self.assertIn('sequential-numbering', checks)
+        self.assertIn('ends-with-newline', checks)
+        self.assertIn('title-format', checks)
+    
+    def test_unreadable_deck_is_reported(self):
+        """Test that a missing file becomes an error record, not a crash"""
+        status, (report,) = self.run_cli(str(self.root / 'missing.md'))
+        self.assertEqual(status, 1)
+        self.assertIsNotNone(report['error'])
+    
+    def test_process_pool_matches_serial_run(self):
+        """Test that sharding over workers gives the same ordered reports"""
+        paths = [str(self.good), str(self.broken)] * 3
+        serial = list(validate_riddles.validate_files(paths, jobs=1))
+        parallel = list(validate_riddles.validate_files(paths, jobs=2))
+        self.assertEqual(parallel, serial)
+    
+    def test_output_file(self):
+        """Test writing the report to a file"""
+        output = self.root / 'report.jsonl'
+        status, _ = self.run_cli(str(self.good), '-o', str(output))
+        self.assertEqual(status, 1)
+        lines = output.read_text(encoding='utf-8').splitlines()
+        self.assertEqual(json.loads(lines[0])['path'], str(self.good))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for the append-only voidchain segment store in voidchain_store.py
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from voidchain_store import (
+    SegmentLog,
+    chain_id_from_path,
+    find_chain_files,
+    ingest,
+    iter_records,
+    list_segments,
+    main,
+)
+
+CLICKSTREAM_PATH = Path(__file__).parent.parent / 'orbital_clickstream.json'
+
+
+class TestSegmentLog(unittest.TestCase):
+    """Test ingesting chain files into rotated, fsynced segments"""
+    
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.spool = self.root / 'spool'
+        self.spool.mkdir()
+        self.log_dir = self.root / 'log'
+        self.chain = json.loads(CLICKSTREAM_PATH.read_text(encoding='utf-8'))
+    
+    def make_chains(self, count):
+        for i in range(count):
+            shutil.copy(CLICKSTREAM_PATH, self.spool / f'voidchain_v{i:03d}.json')
+    
+    def test_chain_ids(self):
+        """Test ids taken from voidchain_<id>.json names"""
+        self.assertEqual(chain_id_from_path('/x/voidchain_k3j9a1zq.json'), 'k3j9a1zq')
+        self.assertEqual(chain_id_from_path('orbital_clickstream.json'), 'orbital_clickstream')
+    
+    def test_round_trip_in_order(self):
+        """Test that every block comes back tagged with its chain"""
+        self.make_chains(3)
+        with SegmentLog(self.log_dir) as log:
+            stats = ingest(find_chain_files([str(self.spool)]), log)
+        self.assertEqual(stats, {'files': 3, 'blocks': 9, 'errors': []})
+        records = list(iter_records(self.log_dir))
+        self.assertEqual([r['chain'] for r in records[:4]], ['v000'] * 3 + ['v001'])
+        self.assertEqual({k: v for k, v in records[0].items() if k != 'chain'}, self.chain[0])
+    
+    def test_segments_rotate_by_size(self):
+        """Test that no segment grows past the limit"""
+        self.make_chains(20)
+        with SegmentLog(self.log_dir, max_segment_bytes=1000) as log:
+            ingest(find_chain_files([str(self.spool)]), log)
+        segments = list_segments(self.log_dir)
+        self.assertGreater(len(segments), 3)
+        self.assertTrue(all(s.stat().st_size <= 1000 for s in segments))
+        self.assertEqual(len(list(iter_records(self.log_dir))), 60)
+    
+    def test_reopen_appends_and_drops_torn_line(self):
+        """Test resuming a log whose last write was cut short"""
+        with SegmentLog(self.log_dir) as log:
+            log.append_chain('a', self.chain)
+        segment = list_segments(self.log_dir)[-1]
+        with open(segment, 'ab') as f:
+            f.write(b'{"chain":"torn","blo')
+        with SegmentLog(self.log_dir) as log:
+            log.append_chain('b', self.chain[:1])
+        self.assertEqual([r['chain'] for r in iter_records(self.log_dir)], ['a'] * 3 + ['b'])
+    
+    def test_sources_removed_only_once_durable(self):
+        """Test that chain files outlive their unsynced blocks"""
+        self.make_chains(2)
+        paths = list(find_chain_files([str(self.spool)]))
+        log = SegmentLog(self.log_dir, fsync_every=1000)
+        ingest(paths, log, remove_sources=True)
+        self.assertTrue(all(path.exists() for path in paths))
+        log.close()
+        self.assertFalse(any(path.exists() for path in paths))
+    
+    def test_malformed_files_are_reported_and_kept(self):
+        """Test that bad input is skipped without stopping the ingest"""
+        self.make_chains(1)
+        bad = self.spool / 'voidchain_bad.json'
+        bad.write_text('{"block": 1}', encoding='utf-8')
+        code = main([str(self.spool), '-d', str(self.log_dir), '--remove-sources'])
+        self.assertEqual(code, 1)
+        self.assertTrue(bad.exists())
+        self.assertEqual(len(list(iter_records(self.log_dir))), 3)
+    
+    def test_blocks_cannot_override_the_chain_id(self):
+        """Test that a block's own chain field is rejected, not written"""
+        self.make_chains(1)
+        spoofed = self.spool / 'voidchain_spoof.json'
+        spoofed.write_text(json.dumps([dict(self.chain[0], chain='v000')]), encoding='utf-8')
+        with SegmentLog(self.log_dir) as log:
+            stats = ingest(find_chain_files([str(self.spool)]), log)
+            with self.assertRaises(ValueError):
+                log.append_chain('x', [self.chain[0], {'block': 2, 'chain': 'v000'}])
+        self.assertEqual([e['path'] for e in stats['errors']], [str(spoofed)])
+        self.assertEqual([r['chain'] for r in iter_records(self.log_dir)], ['v000'] * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests for the hash-linked voidchain verifier in voidchain_verify.py
+"""
+
+import contextlib
+import io
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_voidchain_verify import synthetic_chain, write_chains
+from voidchain_verify import (
+    GENESIS_HASH,
+    block_hash,
+    canonical_bytes,
+    main,
+    seal_chain,
+    verify_chain,
+    verify_file,
+    verify_files,
+)
+
+CLICKSTREAM_PATH = Path(__file__).parent.parent / 'orbital_clickstream.json'
+
+
+def checks(issues):
+    return [(issue['block'], issue['check']) for issue in issues]
+
+
+class TestHashLinking(unittest.TestCase):
+    """Test the canonical form and sealing"""
+    
+    def setUp(self):
+        self.chain = json.loads(CLICKSTREAM_PATH.read_text(encoding='utf-8'))
+        self.sealed = seal_chain(self.chain)
+    
+    def test_canonical_form_ignores_key_order_and_own_hash(self):
+        block = {'event': 'å', 'block': 1}
+        self.assertEqual(canonical_bytes(block), '{"block":1,"event":"å"}'.encode('utf-8'))
+        self.assertEqual(canonical_bytes(dict(block, hash='x')), canonical_bytes(block))
+    
+    def test_sealed_chain_links_to_genesis(self):
+        self.assertEqual(self.sealed[0]['prev_hash'], GENESIS_HASH)
+        self.assertEqual(self.sealed[1]['prev_hash'], self.sealed[0]['hash'])
+        self.assertEqual(self.sealed[2]['hash'], block_hash(self.sealed[2]))
+        self.assertNotIn('hash', self.chain[0])
+        self.assertEqual(verify_chain(self.sealed, require_hashes=True), [])
+    
+    def test_unsealed_chains_get_structural_checks(self):
+        self.assertEqual(verify_chain(self.chain), [])
+        self.assertEqual(checks(verify_chain(self.chain, require_hashes=True)), [(None, 'unsealed')])
+
+
+class TestTamperDetection(unittest.TestCase):
+    """Test each kind of damage is reported where it happened"""
+    
+    def setUp(self):
+        self.sealed = synthetic_chain(5, visitor=1)
+    
+    def test_edited_block(self):
+        self.sealed[2]['event'] = 'requested: lys'
+        self.assertEqual(checks(verify_chain(self.sealed)), [(3, 'hash')])
+    
+    def test_edited_and_rehashed_block_breaks_the_next_link(self):
+        self.sealed[2]['event'] = 'requested: lys'
+        self.sealed[2]['hash'] = block_hash(self.sealed[2])
+        self.assertEqual(checks(verify_chain(self.sealed)), [(4, 'hash-link')])
+    
+    def test_dropped_block(self):
+        del self.sealed[1]
+        self.assertIn((3, 'sequence'), checks(verify_chain(self.sealed)))
+        self.assertIn((3, 'hash-link'), checks(verify_chain(self.sealed)))
+    
+    def test_truncated_tail_against_known_head(self):
+        head = self.sealed[-1]['hash']
+        self.assertEqual(verify_chain(self.sealed, expected_head=head), [])
+        self.assertEqual(checks(verify_chain(self.sealed[:-1], expected_head=head)), [(None, 'head')])
+    
+    def test_timestamps(self):
+        chain = [
+            {'block': 1, 'timestamp': '2025-06-15T23:15:01.391Z'},
+            {'block': 2, 'timestamp': '2025-06-15T23:00:00.000Z'},
+            {'block': 3, 'timestamp': 'yesterday'},
+        ]
+        self.assertEqual(checks(verify_chain(chain)), [(2, 'timestamp-order'), (3, 'timestamp')])
+        self.assertEqual(checks(verify_chain([])), [(None, 'empty')])
+
+
+class TestVerifyFiles(unittest.TestCase):
+    """Test file verification, the process pool and sealing in place"""
+    
+    def test_pool_matches_serial_and_keeps_order(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = write_chains(Path(tmp), 12, 3)
+            Path(paths[5]).write_text('not json', encoding='utf-8')
+            serial = list(verify_files(paths, 1, require_hashes=True))
+            pooled = list(verify_files(paths, 2, require_hashes=True))
+        self.assertEqual(serial, pooled)
+        self.assertEqual([r['ok'] for r in serial].count(False), 1)
+        self.assertIsNotNone(serial[5]['error'])
+    
+    def test_seal_then_verify_cli(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'voidchain_abc.json'
+            shutil.copy(CLICKSTREAM_PATH, path)
+            self.assertEqual(main([str(path), '-j', '1', '--require-hashes']), 1)
+            self.assertEqual(main([str(path), '--seal']), 0)
+            self.assertEqual(main([str(path), '-j', '1', '--require-hashes']), 0)
+    
+    def test_expected_heads_catch_a_dropped_tail(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = write_chains(Path(tmp), 3, 4)
+            heads = {path: json.loads(Path(path).read_text(encoding='utf-8'))[-1]['hash'] for path in paths}
+            truncated = json.loads(Path(paths[1]).read_text(encoding='utf-8'))[:-1]
+            Path(paths[1]).write_text(json.dumps(truncated), encoding='utf-8')
+            self.assertTrue(verify_file(paths[1])['ok'])
+            reports = list(verify_files(paths, 2, heads=heads))
+            self.assertEqual([r['ok'] for r in reports], [True, False, True])
+            self.assertEqual(checks(reports[1]['issues']), [(None, 'head')])
+            
+            heads_path = Path(tmp) / 'heads.json'
+            heads_path.write_text(json.dumps(heads), encoding='utf-8')
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(main([*paths, '-j', '1', '--heads', str(heads_path)]), 1)
+                self.assertEqual(main([paths[0], '--expect-head', heads[paths[0]]]), 0)
+                self.assertEqual(main([paths[1], '--expect-head', heads[paths[1]]]), 1)
+    
+    def test_seal_reports_malformed_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            good, bad = write_chains(Path(tmp), 2, 2)
+            Path(bad).write_text('not json', encoding='utf-8')
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                self.assertEqual(main([good, bad, '--seal']), 1)
+            [report] = [json.loads(line) for line in out.getvalue().splitlines()]
+            self.assertEqual((report['path'], report['ok']), (bad, False))
+            self.assertEqual(Path(bad).read_text(encoding='utf-8'), 'not json')
+
+
+if __name__ == '__main__':
+    unittest.main()
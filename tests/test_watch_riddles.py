@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Tests for watch mode in watch_riddles.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from watch_riddles import (
+    InotifyWatcher,
+    PollingWatcher,
+    WatchSession,
+    format_change,
+    make_watcher,
+)
+
+RIDDLES_PATH = Path(__file__).parent.parent / 'EDU-RIDDLES.md'
+
+
+class DeckTestCase(unittest.TestCase):
+    """Copies EDU-RIDDLES.md into a scratch directory"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.content = RIDDLES_PATH.read_text(encoding='utf-8')
+        self.deck = Path(self.tmp.name).resolve() / 'deck.md'
+        self.deck.write_text(self.content, encoding='utf-8')
+    
+    def save_later(self, text, delay=0.05, rename=False):
+        """Save the deck from another thread, optionally via rename"""
+        def save():
+            time.sleep(delay)
+            if rename:
+                staging = self.deck.with_name('deck.md.swp')
+                staging.write_text(text, encoding='utf-8')
+                os.replace(staging, self.deck)
+            else:
+                self.deck.write_text(text, encoding='utf-8')
+        thread = threading.Thread(target=save)
+        thread.start()
+        self.addCleanup(thread.join)
+
+
+class TestWatchSession(DeckTestCase):
+    """Test that only changes between saves are reported"""
+    
+    def test_first_check_reports_everything(self):
+        """Test that the first check lists every current failure as new"""
+        session = WatchSession([self.deck])
+        change = session.check(self.deck)
+        self.assertEqual(len(change['new']), change['failures'])
+        self.assertEqual(change['resolved'], [])
+        self.assertEqual(len(change['rechecked']), 10)
+    
+    def test_fix_and_regression_are_reported(self):
+        """Test that an edit reports exactly what it fixed and broke"""
+        session = WatchSession([self.deck])
+        session.check(self.deck)
+        edited = self.content.replace(
+            'Learning goal: Exercises in language spec writing',
+            'Learning goal: Teach language spec writing'
+        ).replace("Answer: Void-Language's interpreter", 'Answer: ?')
+        self.deck.write_text(edited, encoding='utf-8')
+        
+        change = session.check(self.deck)
+        self.assertEqual(
+            [(f['check'], f['riddle']) for f in change['resolved']],
+            [('actionable-learning-goal', 7)]
+        )
+        self.assertIn(('answer', 1), [(f['check'], f['riddle']) for f in change['new']])
+        self.assertEqual(sorted(change['rechecked']), [1, 7])
+        self.assertTrue(any(line.startswith('  - ') for line in format_change(change)))
+    
+    def test_lint_findings_survive_moving_lines(self):
+        """Test that lines inserted above a lint finding do not re-report it"""
+        broken = self.content.replace('\nRiddle:\n', '\nRiddle:  \n', 2)
+        self.deck.write_text(broken, encoding='utf-8')
+        session = WatchSession([self.deck])
+        first = session.check(self.deck)
+        self.assertEqual([f['check'] for f in first['new']].count('trailing-whitespace'), 2)
+        self.deck.write_text('Draft notes.\n\n' + broken, encoding='utf-8')
+        change = session.check(self.deck)
+        self.assertEqual((change['new'], change['resolved']), ([], []))
+        # A third identical finding is new; the two existing ones are not
+        self.deck.write_text(broken.replace('\nRiddle:\n', '\nRiddle:  \n', 1), encoding='utf-8')
+        change = session.check(self.deck)
+        self.assertEqual([f['check'] for f in change['new']], ['trailing-whitespace'])
+        self.assertEqual(change['resolved'], [])
+    
+    def test_unchanged_save_reports_nothing_new(self):
+        """Test that re-saving identical content re-checks no riddles"""
+        session = WatchSession([self.deck])
+        session.check(self.deck)
+        change = session.check(self.deck)
+        self.assertEqual((change['new'], change['resolved'], change['rechecked']), ([], [], []))
+    
+    def test_unreadable_deck(self):
+        """Test that a deleted deck is reported instead of raising"""
+        session = WatchSession([self.deck])
+        self.deck.unlink()
+        self.assertIsNotNone(session.check(self.deck)['error'])
+
+
+class TestWatchers(DeckTestCase):
+    """Test change detection"""
+    
+    def assert_detects_save(self, watcher, rename=False):
+        self.addCleanup(watcher.close)
+        self.assertEqual(watcher.wait(timeout=0.05), set())
+        self.save_later(self.content + '\n', rename=rename)
+        self.assertEqual(watcher.wait(timeout=5), {self.deck})
+    
+    def test_polling_watcher(self):
+        """Test that polling notices a changed size"""
+        self.assert_detects_save(PollingWatcher([self.deck], interval=0.01))
+    
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'inotify is Linux-only')
+    def test_inotify_watcher(self):
+        """Test that inotify reports in-place saves"""
+        self.assert_detects_save(InotifyWatcher([self.deck]))
+    
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'inotify is Linux-only')
+    def test_inotify_watcher_sees_rename_saves(self):
+        """Test that saving via a temporary file and rename is seen"""
+        self.assert_detects_save(InotifyWatcher([self.deck]), rename=True)
+    
+    def test_make_watcher_falls_back_to_polling(self):
+        """Test that polling is used when requested"""
+        watcher = make_watcher([self.deck], poll=True)
+        self.addCleanup(watcher.close)
+        self.assertIsInstance(watcher, PollingWatcher)
+    
+    def test_make_watcher_prefers_inotify_on_linux(self):
+        """Test the default watcher choice"""
+        watcher = make_watcher([self.deck])
+        self.addCleanup(watcher.close)
+        expected = InotifyWatcher if sys.platform.startswith('linux') else PollingWatcher
+        self.assertIsInstance(watcher, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Validate many riddle decks in parallel
+
+Expands files and glob patterns, shards the decks over a process pool and
+writes one JSON object per deck (JSON lines) with the failures found by
+the checks in riddle_checks.py and the markdown rules in riddle_lint.py.
+Reports come out in input order, so runs are reproducible and easy to diff.
+
+Usage:
+    python3 validate_riddles.py EDU-RIDDLES.md 'decks/**/*.md' -j 8 -o report.jsonl
+
+Exit status is 0 when every deck passes, 1 when any deck has failures or
+could not be read, and 2 for usage errors.
+"""
+
+import argparse
+import json
+import os
+import sys
+from multiprocessing import Pool
+from typing import Any, Dict, Iterator, List
+
+from edu_riddles import RiddleValidator
+from path_patterns import expand_paths
+from riddle_checks import all_failures
+
+
+def validate_file(path: str) -> Dict[str, Any]:
+    """Validate one deck and return its report
+
+    Decks are memory-mapped, so report size, not deck size, is what
+    travels back to the parent process.
+    """
+    try:
+        with RiddleValidator.from_file(path, use_mmap=True) as validator:
+            riddles = validator.get_riddles()
+            failures = all_failures(validator, riddles)
+            riddle_count = len(riddles)
+    except (OSError, UnicodeDecodeError) as e:
+        return {'path': path, 'ok': False, 'riddles': 0, 'failures': [], 'error': str(e)}
+    return {
+        'path': path,
+        'ok': not failures,
+        'riddles': riddle_count,
+        'failures': failures,
+        'error': None,
+    }
+
+
+def validate_files(paths: List[str], jobs: int = 1) -> Iterator[Dict[str, Any]]:
+    """Yield one report per path, in order, using ``jobs`` worker processes"""
+    if jobs <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield validate_file(path)
+        return
+    # Several chunks per worker keeps every core busy when deck sizes vary
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with Pool(processes=jobs) as pool:
+        yield from pool.imap(validate_file, paths, chunksize=chunksize)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Validate riddle decks in the EDU-RIDDLES.md format.'
+    )
+    parser.add_argument('paths', nargs='+', help='deck files or glob patterns')
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=os.cpu_count() or 1,
+        help='worker processes (default: number of CPUs)'
+    )
+    parser.add_argument(
+        '-o', '--output', default='-',
+        help='where to write the JSON lines report (default: stdout)'
+    )
+    args = parser.parse_args(argv)
+
+    paths = expand_paths(args.paths)
+    if not paths:
+        parser.error('no decks matched')
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    failed = 0
+    try:
+        for report in validate_files(paths, args.jobs):
+            if not report['ok']:
+                failed += 1
+            out.write(json.dumps(report, ensure_ascii=False) + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f'{len(paths)} decks checked, {failed} failed', file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Append-only segment store for voidchain event logs
+
+voidchain-prototype.js writes each visitor's chain to its own
+``voidchain_<id>.json`` (a pretty-printed JSON array of blocks, as in
+orbital_clickstream.json). This tool ingests those files into one
+append-only log of JSON lines, one block per line tagged with its chain
+id, so millions of visitors become a few large sequential files.
+
+The log is a directory of numbered segments (``segment-000001.jsonl``,
+...). Writes are buffered and fsynced in batches (every N blocks, and on
+close), and a new segment is started once the current one reaches the
+size limit. Reopening a log appends to its last segment, dropping a torn
+final line left by a crash.
+
+Usage:
+    python3 voidchain_store.py voidchain_*.json spool/ -d chainlog --remove-sources
+
+Directories are scanned for ``voidchain_*.json``. With --remove-sources a
+chain file is deleted only after the fsync that made its blocks durable.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from path_patterns import expand_paths
+
+SEGMENT_PREFIX = 'segment-'
+SEGMENT_SUFFIX = '.jsonl'
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+DEFAULT_FSYNC_EVERY = 10_000
+
+_CHAIN_FILE_RE = re.compile(r'voidchain_(?P<id>.+)\.json$')
+
+# Log records tag each block with its chain id under this key
+CHAIN_KEY = 'chain'
+NOT_A_CHAIN = 'expected a JSON array of block objects'
+RESERVED_KEY = f'blocks may not have a {CHAIN_KEY!r} field; the log tags them with their chain id'
+
+
+def chain_id_from_path(path: Union[str, Path]) -> str:
+    """``voidchain_<id>.json`` -> ``<id>`` (other names map to their stem)"""
+    name = Path(path).name
+    match = _CHAIN_FILE_RE.match(name)
+    return match.group('id') if match else Path(name).stem
+
+
+def segment_name(number: int) -> str:
+    return f'{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}'
+
+
+def list_segments(directory: Union[str, Path]) -> List[Path]:
+    """Segments of a log, oldest first"""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    return sorted(
+        path for path in directory.iterdir()
+        if path.name.startswith(SEGMENT_PREFIX) and path.name.endswith(SEGMENT_SUFFIX)
+    )
+
+
+def _drop_torn_tail(path: Path) -> None:
+    """Truncate a segment after its last complete line"""
+    with open(path, 'rb+') as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b'\n':
+            return
+        # Walk back to the previous newline in modest chunks
+        pos = size
+        while pos > 0:
+            step = min(64 * 1024, pos)
+            f.seek(pos - step)
+            chunk = f.read(step)
+            newline = chunk.rfind(b'\n')
+            if newline != -1:
+                f.truncate(pos - step + newline + 1)
+                return
+            pos -= step
+        f.truncate(0)
+
+
+class SegmentLog:
+    """Writer for an append-only, size-rotated log of JSON-lines segments"""
+
+    def __init__(self, directory: Union[str, Path],
+                 max_segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+                 fsync_every: int = DEFAULT_FSYNC_EVERY):
+        self.directory = Path(directory)
+        self.max_segment_bytes = max_segment_bytes
+        self.fsync_every = max(1, fsync_every)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        segments = list_segments(self.directory)
+        if segments:
+            self._number = int(segments[-1].name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+            _drop_torn_tail(segments[-1])
+        else:
+            self._number = 1
+        self._file = None
+        self._size = 0
+        self._unsynced = 0
+        self._on_sync: List = []
+        self._open_segment()
+
+    def _open_segment(self) -> None:
+        path = self.directory / segment_name(self._number)
+        self._file = open(path, 'ab', buffering=1024 * 1024)
+        self._size = self._file.seek(0, os.SEEK_END)
+
+    def _rotate(self) -> None:
+        self.sync()
+        self._file.close()
+        self._number += 1
+        self._open_segment()
+
+    @property
+    def current_segment(self) -> Path:
+        return self.directory / segment_name(self._number)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+        if self._size and self._size + len(line) > self.max_segment_bytes:
+            self._rotate()
+        self._file.write(line)
+        self._size += len(line)
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self.sync()
+
+    def append_chain(self, chain_id: str, blocks: Iterable[Dict[str, Any]]) -> int:
+        """Append every block of one chain, tagged with its id; returns the count
+
+        Raises ValueError, before writing anything, if a block has its own
+        ``chain`` field.
+        """
+        blocks = list(blocks)
+        if any(CHAIN_KEY in block for block in blocks):
+            raise ValueError(RESERVED_KEY)
+        for block in blocks:
+            self.append({CHAIN_KEY: chain_id, **block})
+        return len(blocks)
+
+    def after_sync(self, callback) -> None:
+        """Run ``callback`` once everything appended so far is durable"""
+        if self._unsynced == 0:
+            callback()
+        else:
+            self._on_sync.append(callback)
+
+    def sync(self) -> None:
+        """Flush buffered blocks and fsync the current segment"""
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        callbacks, self._on_sync = self._on_sync, []
+        for callback in callbacks:
+            callback()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> 'SegmentLog':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def iter_records(directory: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Stream every record of a log in append order"""
+    for segment in list_segments(directory):
+        with open(segment, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.endswith('\n'):
+                    yield json.loads(line)
+
+
+def find_chain_files(patterns: Iterable[str]) -> Iterator[Path]:
+    """Files and globs as given; directories scanned for voidchain_*.json"""
+    for path in expand_paths(patterns):
+        if os.path.isdir(path):
+            with os.scandir(path) as entries:
+                for entry in sorted(entries, key=lambda e: e.name):
+                    if entry.is_file() and _CHAIN_FILE_RE.match(entry.name):
+                        yield Path(entry.path)
+        else:
+            yield Path(path)
+
+
+def read_chain(path: Path) -> List[Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        chain = json.load(f)
+    if not isinstance(chain, list) or not all(isinstance(block, dict) for block in chain):
+        raise ValueError(NOT_A_CHAIN)
+    if any(CHAIN_KEY in block for block in chain):
+        raise ValueError(RESERVED_KEY)
+    return chain
+
+
+def _remover(path: Path):
+    def remove():
+        try:
+            path.unlink()
+        except OSError:
+            pass
+    return remove
+
+
+def ingest(paths: Iterable[Path], log: SegmentLog,
+           remove_sources: bool = False) -> Dict[str, Any]:
+    """Append every chain file's blocks to ``log``
+
+    Unreadable or malformed files are reported and left in place.
+    """
+    stats = {'files': 0, 'blocks': 0, 'errors': []}
+    for path in paths:
+        try:
+            chain = read_chain(path)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            stats['errors'].append({'path': str(path), 'error': str(e)})
+            continue
+        stats['blocks'] += log.append_chain(chain_id_from_path(path), chain)
+        stats['files'] += 1
+        if remove_sources:
+            log.after_sync(_remover(path))
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Ingest voidchain files into a segment log.')
+    parser.add_argument('paths', nargs='+', help='chain files, globs or directories')
+    parser.add_argument('-d', '--log-dir', required=True, help='segment log directory')
+    parser.add_argument(
+        '--segment-bytes', type=int, default=DEFAULT_SEGMENT_BYTES,
+        help=f'start a new segment past this size (default: {DEFAULT_SEGMENT_BYTES})'
+    )
+    parser.add_argument(
+        '--fsync-every', type=int, default=DEFAULT_FSYNC_EVERY,
+        help=f'blocks between fsyncs (default: {DEFAULT_FSYNC_EVERY})'
+    )
+    parser.add_argument('--remove-sources', action='store_true',
+                        help='delete chain files once their blocks are durable')
+    args = parser.parse_args(argv)
+
+    with SegmentLog(args.log_dir, args.segment_bytes, args.fsync_every) as log:
+        stats = ingest(find_chain_files(args.paths), log, args.remove_sources)
+
+    for error in stats['errors']:
+        print(f"{error['path']}: {error['error']}", file=sys.stderr)
+    print(f"{stats['files']} chains, {stats['blocks']} blocks ingested, "
+          f"{len(stats['errors'])} skipped", file=sys.stderr)
+    return 1 if stats['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
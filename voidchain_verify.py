@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Integrity verifier for voidchain chains
+
+voidchain-prototype.js numbers its blocks but does not link them, so a
+chain with an edited, dropped or reordered block looks as valid as the
+original. This module defines a hash-linked form for those blocks and
+verifies chains in it:
+
+- The canonical form of a block is its JSON with sorted keys, no
+  whitespace and UTF-8 text, leaving out its own ``hash`` field.
+- Each block carries ``prev_hash`` (the previous block's hash; 64 zeros
+  for block 1) and ``hash``, the SHA-256 of the canonical form. Because
+  ``prev_hash`` is inside the canonical form, changing any block breaks
+  every link after it.
+
+``verify_chain`` also checks that block numbers run 1, 2, 3... and that
+timestamps never go backwards. Chains written before sealing (no hash
+fields) still get those checks, and are reported as unsealed only when
+hashes are required. A dropped tail can only be detected against a known
+head hash (``expected_head``): ``--expect-head`` for one file, or
+``--heads`` with a JSON object mapping chain paths to head hashes.
+
+Usage:
+    python3 voidchain_verify.py --seal voidchain_*.json      # add hash links
+    python3 voidchain_verify.py 'spool/*.json' -j 8 --require-hashes
+    python3 voidchain_verify.py voidchain_abc.json --expect-head 3f9a...
+    python3 voidchain_verify.py 'spool/*.json' --heads heads.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from multiprocessing import Pool
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from clickstream_analytics import parse_timestamp
+from path_patterns import expand_paths
+from voidchain_store import read_chain
+
+GENESIS_HASH = '0' * 64
+
+HEADS_FORMAT = 'expected a JSON object of chain path: head hash'
+
+
+def canonical_bytes(block: Dict[str, Any]) -> bytes:
+    """The bytes a block's hash covers: sorted-key compact JSON, sans ``hash``"""
+    body = {key: value for key, value in block.items() if key != 'hash'}
+    return json.dumps(body, sort_keys=True, separators=(',', ':'),
+                      ensure_ascii=False).encode('utf-8')
+
+
+def block_hash(block: Dict[str, Any]) -> str:
+    return hashlib.sha256(canonical_bytes(block)).hexdigest()
+
+
+def seal_chain(blocks: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Copies of ``blocks`` with ``prev_hash`` and ``hash`` filled in"""
+    sealed = []
+    previous = GENESIS_HASH
+    for block in blocks:
+        block = dict(block, prev_hash=previous)
+        block['hash'] = previous = block_hash(block)
+        sealed.append(block)
+    return sealed
+
+
+def _issue(block: Optional[int], check: str, message: str) -> Dict[str, Any]:
+    return {'block': block, 'check': check, 'message': message}
+
+
+def verify_chain(blocks: List[Dict[str, Any]], require_hashes: bool = False,
+                 expected_head: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Every integrity problem in a chain, in block order"""
+    issues = []
+    if not blocks:
+        return [_issue(None, 'empty', 'chain has no blocks')]
+
+    sealed = any('hash' in block or 'prev_hash' in block for block in blocks)
+    if require_hashes and not sealed:
+        issues.append(_issue(None, 'unsealed', 'chain has no hash links'))
+
+    previous_hash = GENESIS_HASH
+    previous_time = None
+    for position, block in enumerate(blocks, 1):
+        number = block.get('block')
+        if number != position:
+            issues.append(_issue(number, 'sequence', f'expected block {position}, found {number!r}'))
+
+        timestamp = block.get('timestamp')
+        try:
+            moment = parse_timestamp(timestamp)
+        except ValueError:
+            issues.append(_issue(number, 'timestamp', f'unreadable timestamp {timestamp!r}'))
+        else:
+            if previous_time is not None and moment < previous_time:
+                issues.append(_issue(number, 'timestamp-order', 'timestamp is earlier than the previous block'))
+            previous_time = moment
+
+        if sealed:
+            if block.get('prev_hash') != previous_hash:
+                issues.append(_issue(number, 'hash-link', 'prev_hash does not match the previous block'))
+            actual = block_hash(block)
+            if block.get('hash') != actual:
+                issues.append(_issue(number, 'hash', 'hash does not match the block contents'))
+            # Follow the recorded hash so one edit is reported once, not at every later link
+            previous_hash = block.get('hash', actual)
+
+    if expected_head is not None and previous_hash != expected_head:
+        issues.append(_issue(None, 'head', 'last block hash differs from the expected head (truncated?)'))
+    return issues
+
+
+def _failed_report(path: str, error: Exception) -> Dict[str, Any]:
+    return {'path': path, 'ok': False, 'blocks': 0, 'issues': [], 'error': str(error)}
+
+
+def verify_file(path: str, require_hashes: bool = False,
+                expected_head: Optional[str] = None) -> Dict[str, Any]:
+    """Verify one chain file and return its report"""
+    try:
+        chain = read_chain(path)
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        return _failed_report(path, e)
+    issues = verify_chain(chain, require_hashes, expected_head)
+    return {'path': path, 'ok': not issues, 'blocks': len(chain), 'issues': issues, 'error': None}
+
+
+def _verify_task(task: Tuple[str, bool, Optional[str]]) -> Dict[str, Any]:
+    return verify_file(*task)
+
+
+def verify_files(paths: List[str], jobs: int = 1, require_hashes: bool = False,
+                 heads: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, Any]]:
+    """Yield one report per path, in order, using ``jobs`` worker processes
+
+    ``heads`` maps paths to their expected head hash; paths it leaves out
+    are verified without one.
+    """
+    heads = heads or {}
+    tasks = [(path, require_hashes, heads.get(path)) for path in paths]
+    if jobs <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield _verify_task(task)
+        return
+    # Chains are small; big chunks keep the per-task IPC cost down
+    chunksize = max(1, len(tasks) // (jobs * 4))
+    with Pool(processes=jobs) as pool:
+        yield from pool.imap(_verify_task, tasks, chunksize=chunksize)
+
+
+def seal_file(path: str) -> None:
+    """Rewrite a chain file with hash links, keeping the prototype's layout"""
+    sealed = seal_chain(read_chain(path))
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(sealed, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+def read_heads(path: str) -> Dict[str, str]:
+    """A heads file: a JSON object mapping chain paths to head hashes"""
+    with open(path, 'r', encoding='utf-8') as f:
+        heads = json.load(f)
+    if not isinstance(heads, dict) or not all(isinstance(h, str) for h in heads.values()):
+        raise ValueError(HEADS_FORMAT)
+    return {os.path.normpath(chain): head for chain, head in heads.items()}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Verify voidchain chain files.')
+    parser.add_argument('paths', nargs='+', help='chain files or glob patterns')
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=os.cpu_count() or 1,
+        help='worker processes (default: number of CPUs)'
+    )
+    parser.add_argument('--require-hashes', action='store_true',
+                        help='report chains without hash links')
+    parser.add_argument('--seal', action='store_true',
+                        help='add hash links to the files instead of verifying them')
+    heads_group = parser.add_mutually_exclusive_group()
+    heads_group.add_argument('--expect-head', metavar='HASH',
+                             help="the chain's expected last block hash (one file only)")
+    heads_group.add_argument('--heads', metavar='FILE',
+                             help='JSON object mapping chain paths to expected head hashes')
+    args = parser.parse_args(argv)
+
+    paths = expand_paths(args.paths)
+    if not paths:
+        parser.error('no chain files matched')
+
+    if args.seal:
+        failed = 0
+        for path in paths:
+            try:
+                seal_file(path)
+            except (OSError, UnicodeDecodeError, ValueError) as e:
+                failed += 1
+                print(json.dumps(_failed_report(path, e), ensure_ascii=False))
+        print(f'{len(paths) - failed} chains sealed, {failed} failed', file=sys.stderr)
+        return 1 if failed else 0
+
+    heads = None
+    if args.expect_head is not None:
+        if len(paths) > 1:
+            parser.error('--expect-head takes one chain file; use --heads for several')
+        heads = {paths[0]: args.expect_head}
+    elif args.heads is not None:
+        try:
+            by_path = read_heads(args.heads)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            parser.error(f'cannot read heads file: {e}')
+        heads = {path: by_path[os.path.normpath(path)]
+                 for path in paths if os.path.normpath(path) in by_path}
+
+    failed = 0
+    for report in verify_files(paths, args.jobs, args.require_hashes, heads):
+        if not report['ok']:
+            failed += 1
+            print(json.dumps(report, ensure_ascii=False))
+    print(f'{len(paths)} chains verified, {failed} failed', file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
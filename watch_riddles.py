@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Watch riddle decks and re-report checks as they are edited
+
+Keeps one warm process with every deck's parse resident (through
+riddle_incremental.IncrementalValidator), waits for saves via inotify on
+Linux or by polling mtime/size elsewhere, and after each save prints only
+what changed: failures that appeared and failures that were resolved.
+
+Usage:
+    python3 watch_riddles.py EDU-RIDDLES.md [more decks...] [--poll] [--interval 0.02]
+
+Directories are watched rather than files, so editors that save by
+writing a temporary file and renaming it over the deck are picked up.
+inotify reports a save as soon as it happens; polling notices it up to
+``--interval`` seconds later, on top of the re-check itself.
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from riddle_incremental import IncrementalValidator
+from riddle_lint import lint_failures
+
+# Saves that leave a complete file behind: a writer closing the file, or
+# a temporary file being renamed over it
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+_EVENT_HEADER = struct.Struct('iIII')
+
+# Editors often touch a file several times per save; events arriving
+# within this window are reported as one change
+COALESCE_SECONDS = 0.02
+
+# Polling: one stat() per deck per interval, small enough to keep a save
+# well under 100 ms from being reported
+POLL_INTERVAL = 0.02
+
+
+class PollingWatcher:
+    """Detect changes by comparing (mtime, size) at a fixed interval"""
+
+    def __init__(self, paths: Iterable[Path], interval: float = POLL_INTERVAL):
+        self.paths = [Path(p).resolve() for p in paths]
+        self.interval = interval
+        self._stamps = {path: self._stamp(path) for path in self.paths}
+
+    @staticmethod
+    def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """Block until some paths change (or timeout) and return them"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path in self.paths:
+                stamp = self._stamp(path)
+                if stamp != self._stamps[path]:
+                    self._stamps[path] = stamp
+                    changed.add(path)
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval)
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify watcher on the decks' directories, via ctypes"""
+
+    def __init__(self, paths: Iterable[Path]):
+        self.paths = [Path(p).resolve() for p in paths]
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+
+        # Watch descriptor -> {file name: watched path}
+        self._watches: Dict[int, Dict[str, Path]] = {}
+        directories: Dict[Path, int] = {}
+        for path in self.paths:
+            directory = path.parent
+            if directory not in directories:
+                wd = libc.inotify_add_watch(
+                    self._fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO
+                )
+                if wd < 0:
+                    errno = ctypes.get_errno()
+                    os.close(self._fd)
+                    raise OSError(errno, f'cannot watch {directory}')
+                directories[directory] = wd
+                self._watches[wd] = {}
+            self._watches[directories[directory]][path.name] = path
+
+    def _read_events(self) -> Set[Path]:
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                path = self._watches.get(wd, {}).get(name)
+                if path is not None:
+                    changed.add(path)
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """Block until some paths change (or timeout) and return them"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                return set()
+            changed = self._read_events()
+            if changed:
+                # Fold the rest of this save into the same report
+                while select.select([self._fd], [], [], COALESCE_SECONDS)[0]:
+                    changed |= self._read_events()
+                return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def make_watcher(paths: Iterable[Path], poll: bool = False, interval: float = POLL_INTERVAL):
+    """inotify where available, polling otherwise (or when asked)"""
+    paths = list(paths)
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError, TypeError):
+            # No usable libc inotify (e.g. musl without symbols, or limits hit)
+            pass
+    return PollingWatcher(paths, interval)
+
+
+def _failure_keys(failures: List[Dict[str, Any]]) -> Dict[Tuple, Dict[str, Any]]:
+    """Failures by an identity that survives edits elsewhere in the deck
+
+    Riddle failures are keyed by riddle. Lint findings are keyed by rule
+    and detail, numbered when the same one occurs several times, so
+    inserting or removing lines above a finding does not report it as
+    resolved and new again.
+    """
+    keyed = {}
+    seen: Counter = Counter()
+    for failure in failures:
+        if failure['riddle'] is not None:
+            key = failure['check'], failure['riddle'], failure['message']
+        else:
+            key = failure['check'], failure['message']
+            seen[key] += 1
+            key += (seen[key],)
+        keyed[key] = failure
+    return keyed
+
+
+class WatchSession:
+    """Resident state for a set of watched decks"""
+
+    def __init__(self, paths: Iterable[Path]):
+        self.paths = [Path(p).resolve() for p in paths]
+        self._validators = {path: IncrementalValidator() for path in self.paths}
+        self._previous: Dict[Path, Dict[Tuple, Dict[str, Any]]] = {
+            path: {} for path in self.paths
+        }
+
+    def check(self, path: Path) -> Dict[str, Any]:
+        """Re-validate one deck and return what changed since last time"""
+        started = time.perf_counter()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            return {'path': str(path), 'error': str(e), 'new': [], 'resolved': [],
+                    'failures': 0, 'rechecked': [], 'elapsed_ms': 0.0}
+
+        report = self._validators[path].validate(content)
+        failures = report['failures'] + lint_failures(content.split('\n'))
+        current = _failure_keys(failures)
+        previous = self._previous[path]
+        self._previous[path] = current
+
+        return {
+            'path': str(path),
+            'error': None,
+            'new': [f for key, f in current.items() if key not in previous],
+            'resolved': [f for key, f in previous.items() if key not in current],
+            'failures': len(current),
+            'rechecked': report['rechecked'],
+            'elapsed_ms': (time.perf_counter() - started) * 1000,
+        }
+
+
+def format_change(change: Dict[str, Any]) -> List[str]:
+    """Human-readable lines for one ``WatchSession.check`` result"""
+    name = os.path.relpath(change['path'])
+    if change['error']:
+        return [f"[watch] {name}: {change['error']}"]
+    lines = [
+        f"[watch] {name}: {change['failures']} failures "
+        f"({len(change['new'])} new, {len(change['resolved'])} resolved, "
+        f"{len(change['rechecked'])} riddles re-checked) in {change['elapsed_ms']:.1f} ms"
+    ]
+    for sign, failures in (('+', change['new']), ('-', change['resolved'])):
+        for failure in failures:
+            lines.append(
+                f"  {sign} line {failure['line']} [{failure['check']}] {failure['message']}"
+            )
+    return lines
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Watch riddle decks and re-check on save.')
+    parser.add_argument('paths', nargs='+', help='deck files to watch')
+    parser.add_argument('--poll', action='store_true', help='poll instead of using inotify')
+    parser.add_argument(
+        '--interval', type=float, default=POLL_INTERVAL,
+        help=f'polling interval in seconds (default: {POLL_INTERVAL})'
+    )
+    args = parser.parse_args(argv)
+
+    session = WatchSession(args.paths)
+    for path in session.paths:
+        print('\n'.join(format_change(session.check(path))), flush=True)
+
+    watcher = make_watcher(session.paths, poll=args.poll, interval=args.interval)
+    print(f'[watch] waiting for changes ({type(watcher).__name__})', flush=True)
+    try:
+        while True:
+            for path in sorted(watcher.wait()):
+                print('\n'.join(format_change(session.check(path))), flush=True)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        watcher.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())